@@ -1,17 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Form, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Literal, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import tempfile
 import uuid
 import logging
 import json
 import io
-import io
 
-from app.schemas.sis_schema import ScriptInput, AnalysisResponse, SceneIntentSchema
+from app.schemas.sis_schema import (
+    AnalysisTier, ScriptInput, AnalysisResponse, SceneIntentSchema, BatchScriptInput, BatchAnalysisResponse,
+    ExportFormat
+)
+from app.services import data_export, result_projection
 from app.services.analysis_service import AnalysisService
-from app.services.pdf_export import get_pdf_exporter
-from app.core.database import get_db
+from app.services.job_dedup import inflight_registry, reusable_job_query, submission_hash
+from app.services.job_store import JobWriteBatcher, get_job_writer
+from app.services.pdf_cache import PDFCache, get_pdf_cache
+from app.services.render_pool import get_render_pool
+from app.core.compression import ResponseCache, get_response_cache
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.http_cache import RangeNotSatisfiable, etag_matches, parse_range
+from app.core.metrics import CACHE_REQUESTS, JOBS_TOTAL, QUEUE_DEPTH, SERIALIZATION_SECONDS
 from app.core.security import require_api_key
 from app.models.job import AnalysisJob, JobStatus
 
@@ -27,66 +47,194 @@ def get_analysis_service():
         _service_instance = AnalysisService()
     return _service_instance
 
-@router.post("/analyze", response_model=AnalysisResponse, dependencies=[Depends(require_api_key)])
-async def analyze_script(
-    input_data: ScriptInput,
-    background_tasks: BackgroundTasks,
-    service: AnalysisService = Depends(get_analysis_service),
-    db: Session = Depends(get_db)
-):
+
+def analysis_service_if_loaded() -> Optional[AnalysisService]:
+    """The shared analysis service if something has created it, without creating it"""
+    return _service_instance
+
+
+def _job_response(job: AnalysisJob, include_timings: bool = False) -> AnalysisResponse:
+    """Build the API response for a stored job."""
+    result_data = None
+    if job.result_json:
+        with SERIALIZATION_SECONDS.labels(operation="validate").time():
+            result_data = SceneIntentSchema.model_validate_json(job.result_json)
+
+    return _with_timings(AnalysisResponse(
+        job_id=job.id,
+        status=job.status.value,
+        result=result_data,
+        error=job.error_message,
+        progress=100 if job.status == JobStatus.COMPLETED else 0
+    ), include_timings)
+
+
+def _with_timings(response: AnalysisResponse, include_timings: bool) -> AnalysisResponse:
     """
-    Submit a screenplay scene for analysis (JSON format).
-    Returns immediately with a job ID (Pending status), unless configured to wait.
-    For this MVP, we execute synchronously but store result in DB.
+    Per-stage timings are stored with every result but only returned on request.
+    Copies rather than mutates: coalesced submissions share one response object.
     """
-    job_id = str(uuid.uuid4())
-    logger.info(f"Received analysis request: {job_id}")
-    
-    # Create Job Record
-    job = AnalysisJob(
-        id=job_id,
-        script_title=input_data.title,
-        status=JobStatus.PROCESSING # We are starting immediately
-    )
-    db.add(job)
-    db.commit()
-    
+    if include_timings or response.result is None or response.result.timings is None:
+        return response
+    return response.model_copy(update={"result": response.result.model_copy(update={"timings": None})})
+
+
+def _dump_result(result: SceneIntentSchema) -> str:
+    """Serialize a scene result for storage."""
+    with SERIALIZATION_SECONDS.labels(operation="dump").time():
+        return result.model_dump_json()
+
+
+def _script_options(script: ScriptInput) -> Dict[str, Any]:
+    """Analysis options that affect the result (part of the content hash)."""
+    options = {
+        "analyze_full_script": script.analyze_full_script,
+        "style_profile": script.style_profile,
+    }
+    # Only non-default tiers are hashed, so full-tier hashes match earlier jobs
+    if script.tier != "full":
+        options["tier"] = script.tier
+    return options
+
+
+async def _submit_analysis(
+    title: Optional[str],
+    script_text: str,
+    options: Dict[str, Any],
+    idempotency_key: Optional[str],
+    service: AnalysisService,
+    writer: JobWriteBatcher,
+    db: AsyncSession,
+) -> AnalysisResponse:
+    """
+    Deduplicate a submission before running it:
+    1. A repeated Idempotency-Key returns the job it created the first time.
+    2. An identical submission still running in this process is awaited, not re-run.
+    3. A completed job with the same content hash is reused, as is one another worker is
+       running if it has made progress within JOB_DEDUP_PROCESSING_STALE_SECONDS.
+    """
+    content_hash = submission_hash(script_text, options)
+
+    if idempotency_key:
+        existing = await db.scalar(select(AnalysisJob).where(AnalysisJob.idempotency_key == idempotency_key))
+        if existing is not None:
+            if existing.content_hash != content_hash:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Idempotency-Key was already used for a different submission"
+                )
+            logger.info(f"Idempotent replay of job {existing.id}")
+            return _job_response(existing)
+
+    if not settings.ENABLE_CACHING:
+        return await _run_analysis_job(
+            str(uuid.uuid4()), title, script_text, service, writer, content_hash, idempotency_key,
+            options.get("tier", "full")
+        )
+
+    is_leader, shared = inflight_registry.claim(content_hash)
+    if not is_leader:
+        logger.info("Coalescing duplicate submission onto in-flight job")
+        CACHE_REQUESTS.labels(cache="job_result", result="hit").inc()
+        return await asyncio.shield(shared)
+
     try:
-        # Parse and Analyze
-        results = service.analyze_script(input_data.script_text, job_id)
-        
+        existing = await db.scalar(reusable_job_query(content_hash))
+        if existing is not None:
+            logger.info(f"Reusing job {existing.id} for identical submission")
+            CACHE_REQUESTS.labels(cache="job_result", result="hit").inc()
+            response = _job_response(existing)
+        else:
+            CACHE_REQUESTS.labels(cache="job_result", result="miss").inc()
+            response = await _run_analysis_job(
+                str(uuid.uuid4()), title, script_text, service, writer, content_hash, idempotency_key,
+                options.get("tier", "full")
+            )
+    except BaseException as exc:
+        inflight_registry.release(content_hash, exc=exc)
+        raise
+    inflight_registry.release(content_hash, result=response)
+    return response
+
+
+async def _run_analysis_job(
+    job_id: str,
+    title: Optional[str],
+    script_text: str,
+    service: AnalysisService,
+    writer: JobWriteBatcher,
+    content_hash: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+    tier: str = "full",
+) -> AnalysisResponse:
+    """
+    Create the job record, run the pipeline off the event loop and persist the outcome.
+    Status and result are written together so each job costs two commits at most,
+    and concurrent jobs share those commits via the write batcher.
+    """
+    logger.info(f"Starting analysis job: {job_id}")
+    try:
+        await writer.write(
+            job_id,
+            create=True,
+            script_title=title,
+            status=JobStatus.PROCESSING,
+            content_hash=content_hash,
+            idempotency_key=idempotency_key,
+        )
+    except IntegrityError:
+        # Lost a race with a concurrent request carrying the same Idempotency-Key
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is already in progress")
+    JOBS_TOTAL.labels(status=JobStatus.PROCESSING.value).inc()
+
+    try:
+        # Parse and Analyze (CPU-bound; keep it off the event loop)
+        with QUEUE_DEPTH.labels(queue="analysis").track_inprogress():
+            async with writer.heartbeat([job_id]):
+                results = await run_in_threadpool(
+                    service.analyze_script, script_text, job_id, tier
+                )
+
         if not results:
-            job.status = JobStatus.FAILED
-            job.error_message = "No valid scenes found in input text"
-            db.commit()
-            
+            await writer.write(
+                job_id,
+                status=JobStatus.FAILED,
+                error_message="No valid scenes found in input text"
+            )
+            JOBS_TOTAL.labels(status=JobStatus.FAILED.value).inc()
+
             return AnalysisResponse(
                 job_id=job_id,
                 status="failed",
                 error="No valid scenes found in input text"
             )
-            
+
         # Success
         result_schema = results[0]
-        
+
         # Serialize result for DB
-        job.result_json = result_schema.model_dump_json()
-        job.status = JobStatus.COMPLETED
-        db.commit()
-        
+        result_json = _dump_result(result_schema)
+        await writer.write(
+            job_id,
+            status=JobStatus.COMPLETED,
+            result_json=result_json,
+            result_bytes=len(result_json.encode("utf-8"))
+        )
+        JOBS_TOTAL.labels(status=JobStatus.COMPLETED.value).inc()
+        _schedule_prerender(job_id, title, result_json)
+
         return AnalysisResponse(
             job_id=job_id,
             status="completed",
             result=result_schema,
             progress=100
         )
-        
+
     except Exception as e:
         logger.error(f"Analysis failed for {job_id}: {e}", exc_info=True)
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        db.commit()
-        
+        await writer.write(job_id, status=JobStatus.FAILED, error_message=str(e))
+        JOBS_TOTAL.labels(status=JobStatus.FAILED.value).inc()
+
         return AnalysisResponse(
             job_id=job_id,
             status="failed",
@@ -94,20 +242,57 @@ async def analyze_script(
         )
 
 
+def _touch_job(job: AnalysisJob, background_tasks: BackgroundTasks, writer: JobWriteBatcher) -> None:
+    """Refresh last_accessed_at (throttled) after the response is sent, for LRU retention."""
+    now = datetime.utcnow()
+    interval = timedelta(seconds=settings.JOB_ACCESS_TOUCH_INTERVAL_SECONDS)
+    if job.last_accessed_at is None or now - job.last_accessed_at >= interval:
+        background_tasks.add_task(writer.write, job.id, last_accessed_at=now)
+
+
+@router.post("/analyze", response_model=AnalysisResponse, dependencies=[Depends(require_api_key)])
+async def analyze_script(
+    input_data: ScriptInput,
+    background_tasks: BackgroundTasks,
+    include_timings: bool = False,
+    idempotency_key: Optional[str] = Header(default=None),
+    service: AnalysisService = Depends(get_analysis_service),
+    writer: JobWriteBatcher = Depends(get_job_writer),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Submit a screenplay scene for analysis (JSON format).
+    Returns immediately with a job ID (Pending status), unless configured to wait.
+    For this MVP, we execute synchronously but store result in DB.
+    Identical resubmissions return the existing job instead of re-running the pipeline.
+    Pass `include_timings=true` for the per-stage timing breakdown.
+    """
+    logger.info(f"Received analysis request: {input_data.title or 'untitled'}")
+
+    response = await _submit_analysis(
+        input_data.title, input_data.script_text, _script_options(input_data),
+        idempotency_key, service, writer, db
+    )
+    return _with_timings(response, include_timings)
+
+
 @router.post("/upload", response_model=AnalysisResponse, dependencies=[Depends(require_api_key)])
 async def upload_script_file(
     file: UploadFile = File(...),
     title: Optional[str] = Form(None),
+    tier: AnalysisTier = Form("full"),
     background_tasks: BackgroundTasks = None,
+    include_timings: bool = False,
+    idempotency_key: Optional[str] = Header(default=None),
     service: AnalysisService = Depends(get_analysis_service),
-    db: Session = Depends(get_db)
+    writer: JobWriteBatcher = Depends(get_job_writer),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload a screenplay file (PDF, Fountain, or TXT) for analysis.
     Supports PDF text extraction.
     """
-    job_id = str(uuid.uuid4())
-    logger.info(f"Received file upload: {file.filename}, job_id: {job_id}")
+    logger.info(f"Received file upload: {file.filename}")
     
     # Extract text from file
     try:
@@ -142,125 +327,525 @@ async def upload_script_file(
     # Use filename as title if not provided
     if not title:
         title = file.filename.rsplit('.', 1)[0]
-    
-    # Create Job Record
-    job = AnalysisJob(
-        id=job_id,
-        script_title=title,
-        status=JobStatus.PROCESSING
-    )
-    db.add(job)
-    db.commit()
-    
-    try:
-        # Parse and Analyze
-        # Note: This is synchronous blocking code. 
-        # For production large scripts, this should be offloaded to Celery/FastAPI BackgroundTasks
-        results = service.analyze_script(script_text, job_id)
-        
-        if not results:
-            job.status = JobStatus.FAILED
-            job.error_message = "No valid scenes found in input text"
-            db.commit()
-            
-            return AnalysisResponse(
-                job_id=job_id,
-                status="failed",
-                error="No valid scenes found in input text"
+
+    # Same options, with the same defaults, as /analyze, so identical text dedupes across endpoints
+    options = _script_options(ScriptInput(script_text=script_text, title=title, tier=tier))
+    response = await _submit_analysis(title, script_text, options, idempotency_key, service, writer, db)
+    return _with_timings(response, include_timings)
+
+async def _process_batch(
+    batch_id: str,
+    children: List[Tuple[str, ScriptInput]],
+    service: AnalysisService,
+    writer: JobWriteBatcher,
+) -> None:
+    """
+    Analyze a batch in passes of BATCH_SCRIPTS_PER_PASS scripts. Each pass sends every
+    beat of its scripts through one shared inference call; its results are committed
+    together with the next pass's PROCESSING status.
+    """
+    per_pass = max(1, settings.BATCH_SCRIPTS_PER_PASS)
+    passes = [children[i:i + per_pass] for i in range(0, len(children), per_pass)]
+    failed = 0
+    queue_depth = QUEUE_DEPTH.labels(queue="analysis")
+    queue_depth.inc(len(children))
+
+    pending_writes = [writer.write(child_id, status=JobStatus.PROCESSING) for child_id, _ in passes[0]]
+    for pass_idx, chunk in enumerate(passes):
+        await asyncio.gather(*pending_writes)
+        pending_writes = []
+
+        try:
+            async with writer.heartbeat([child_id for child_id, _ in chunk]):
+                results = await run_in_threadpool(
+                    service.analyze_scripts,
+                    [(script.script_text, child_id) for child_id, script in chunk],
+                    [script.tier for _, script in chunk]
+                )
+        except Exception as e:
+            logger.error(f"Batch {batch_id} pass {pass_idx + 1} failed: {e}", exc_info=True)
+            results = [e] * len(chunk)
+        finally:
+            queue_depth.dec(len(chunk))
+
+        for (child_id, script), scene_results in zip(chunk, results):
+            if isinstance(scene_results, Exception) or not scene_results:
+                failed += 1
+                error = str(scene_results) if isinstance(scene_results, Exception) else "No valid scenes found in input text"
+                pending_writes.append(writer.write(child_id, status=JobStatus.FAILED, error_message=error))
+                JOBS_TOTAL.labels(status=JobStatus.FAILED.value).inc()
+                continue
+            result_json = _dump_result(scene_results[0])
+            pending_writes.append(writer.write(
+                child_id,
+                status=JobStatus.COMPLETED,
+                result_json=result_json,
+                result_bytes=len(result_json.encode("utf-8"))
+            ))
+            JOBS_TOTAL.labels(status=JobStatus.COMPLETED.value).inc()
+            _schedule_prerender(child_id, script.title, result_json)
+
+        if pass_idx + 1 < len(passes):
+            pending_writes.extend(
+                writer.write(child_id, status=JobStatus.PROCESSING) for child_id, _ in passes[pass_idx + 1]
             )
-            
-        # Success
-        result_schema = results[0]
-        
-        # Serialize result for DB
-        # SceneIntentSchema.model_dump_json() if pydantic v2
-        job.result_json = result_schema.model_dump_json()
-        job.status = JobStatus.COMPLETED
-        db.commit()
-        
-        return AnalysisResponse(
-            job_id=job_id,
-            status="completed",
-            result=result_schema,
-            progress=100
-        )
-        
-    except Exception as e:
-        logger.error(f"Analysis failed for {job_id}: {e}", exc_info=True)
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        db.commit()
-        
-        return AnalysisResponse(
-            job_id=job_id,
-            status="failed",
-            error=str(e)
+
+    all_failed = failed == len(children)
+    pending_writes.append(writer.write(
+        batch_id,
+        status=JobStatus.FAILED if all_failed else JobStatus.COMPLETED,
+        error_message="All scripts in the batch failed" if all_failed else None
+    ))
+    await asyncio.gather(*pending_writes)
+    logger.info(f"Batch {batch_id} finished: {len(children) - failed} completed, {failed} failed")
+
+
+@router.post("/analyze/batch", response_model=BatchAnalysisResponse, dependencies=[Depends(require_api_key)])
+async def analyze_batch(
+    input_data: BatchScriptInput,
+    background_tasks: BackgroundTasks,
+    service: AnalysisService = Depends(get_analysis_service),
+    writer: JobWriteBatcher = Depends(get_job_writer)
+):
+    """
+    Submit many scripts or scenes in one request.
+    Creates a parent batch job with one child job per script and processes them in the
+    background; poll `/analyze/batch/{batch_id}` for aggregate progress and results.
+    """
+    total = len(input_data.scripts)
+    if total > settings.BATCH_MAX_SCRIPTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.BATCH_MAX_SCRIPTS} scripts"
         )
 
+    batch_id = str(uuid.uuid4())
+    children = [(str(uuid.uuid4()), script) for script in input_data.scripts]
+    logger.info(f"Received batch analysis request: {batch_id} ({total} scripts)")
+
+    # Parent and children land in a single commit
+    await asyncio.gather(
+        writer.write(
+            batch_id,
+            create=True,
+            script_title=input_data.title or f"Batch of {total} scripts",
+            status=JobStatus.PROCESSING
+        ),
+        *[
+            writer.write(
+                child_id,
+                create=True,
+                parent_id=batch_id,
+                batch_index=idx,
+                script_title=script.title,
+                status=JobStatus.PENDING,
+                content_hash=submission_hash(script.script_text, _script_options(script))
+            )
+            for idx, (child_id, script) in enumerate(children)
+        ]
+    )
+
+    JOBS_TOTAL.labels(status=JobStatus.PENDING.value).inc(total)
+    background_tasks.add_task(_process_batch, batch_id, children, service, writer)
+
+    return BatchAnalysisResponse(
+        batch_id=batch_id,
+        status="processing",
+        total=total,
+        jobs=[AnalysisResponse(job_id=child_id, status="pending", progress=0) for child_id, _ in children]
+    )
+
+
+@router.get("/analyze/batch/{batch_id}", response_model=BatchAnalysisResponse, dependencies=[Depends(require_api_key)])
+async def get_batch_status(
+    batch_id: str,
+    include_results: bool = True,
+    include_timings: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Aggregate status of a batch: progress across child jobs plus each child's status
+    (and result, unless `include_results=false`).
+    """
+    batch = await db.get(AnalysisJob, batch_id)
+    if not batch or batch.parent_id is not None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    children = (await db.scalars(
+        select(AnalysisJob)
+        .where(AnalysisJob.parent_id == batch_id)
+        .order_by(AnalysisJob.batch_index)
+    )).all()
+
+    completed = sum(1 for job in children if job.status == JobStatus.COMPLETED)
+    failed = sum(1 for job in children if job.status == JobStatus.FAILED)
+    jobs = []
+    for job in children:
+        if include_results:
+            jobs.append(_job_response(job, include_timings))
+        else:
+            jobs.append(AnalysisResponse(
+                job_id=job.id,
+                status=job.status.value,
+                error=job.error_message,
+                progress=100 if job.status == JobStatus.COMPLETED else 0
+            ))
+
+    return BatchAnalysisResponse(
+        batch_id=batch.id,
+        status=batch.status.value,
+        total=len(children),
+        completed=completed,
+        failed=failed,
+        progress=int(100 * (completed + failed) / len(children)) if children else 100,
+        jobs=jobs
+    )
+
+
+def _job_etag(job: AnalysisJob, include_timings: bool, projection: str = "") -> str:
+    """
+    Strong ETag of a job's status response, derived without serializing it.
+    A result is stored once, when the job completes, and only ever replaced by
+    expiry (a status change), so status, error and payload size identify the
+    body; the app version covers response format changes between deploys.
+    `projection` names the fields of a sparse result (empty for the full one).
+    """
+    parts = (
+        job.id, job.status.value, job.error_message or "", str(job.result_bytes or 0),
+        "timings" if include_timings else "", settings.APP_VERSION, projection,
+    )
+    return '"' + hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _projected_body(job: AnalysisJob, paths: List[Tuple[str, ...]]) -> bytes:
+    """AnalysisResponse JSON with only `paths` of the stored result, built without Pydantic."""
+    with SERIALIZATION_SECONDS.labels(operation="project").time():
+        result = result_projection.project(json.loads(job.result_json), paths) if job.result_json else None
+        return json.dumps({
+            "job_id": job.id,
+            "status": job.status.value,
+            "result": result,
+            "error": job.error_message,
+            "progress": 100 if job.status == JobStatus.COMPLETED else 0,
+        }, separators=(",", ":")).encode("utf-8")
+
+
 @router.get("/jobs/{job_id}", response_model=AnalysisResponse, dependencies=[Depends(require_api_key)])
-def get_job_status(
+async def get_job_status(
     job_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    include_timings: bool = False,
+    view: Optional[Literal["summary", "timeline", "full"]] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    writer: JobWriteBatcher = Depends(get_job_writer),
+    cache: ResponseCache = Depends(get_response_cache)
 ):
     """
     Retrieve status and result of an analysis job.
+    Pass `include_timings=true` for the per-stage timing breakdown.
+
+    Sparse results: `view=summary` (scene-level fields, no beats),
+    `view=timeline` (beat numbers, timestamps, primary emotion and
+    intensity) or `fields=` with comma-separated dotted paths, e.g.
+    `fields=beats.beat_number,beats.visual_signals.camera`. `fields` adds to
+    a view. Sparse results are cut from the stored JSON without validation.
+
+    Responses carry a strong ETag; polling with If-None-Match gets 304 Not
+    Modified until the job changes. Completed jobs never change, so their
+    serialized body is kept in the response cache next to its compressed forms.
     """
-    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    try:
+        paths = result_projection.parse_fields(fields, view)
+    except result_projection.UnknownField as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if paths and include_timings and ("timings",) not in paths:
+        paths.append(("timings",))
+    projection = ",".join(".".join(path) for path in paths)
+
+    job = await db.get(AnalysisJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-        
-    result_data = None
-    if job.result_json:
-        result_data = SceneIntentSchema.model_validate_json(job.result_json)
-        
-    return AnalysisResponse(
-        job_id=job.id,
-        status=job.status.value,
-        result=result_data,
-        error=job.error_message,
-        progress=100 if job.status == JobStatus.COMPLETED else 0
+    _touch_job(job, background_tasks, writer)
+
+    etag = _job_etag(job, include_timings, projection)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if job.status != JobStatus.COMPLETED:
+        response.headers.update(headers)
+        return _job_response(job, include_timings)
+
+    body = cache.get(etag, "identity")
+    if body is None:
+        if paths:
+            body = _projected_body(job, paths)
+        else:
+            body = _job_response(job, include_timings).model_dump_json().encode("utf-8")
+        cache.put(etag, "identity", body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Pre-render tasks in flight (held so they aren't garbage collected mid-run)
+_prerender_tasks: Set[asyncio.Task] = set()
+
+
+def _render_pdf(result_json: str, title: str, out) -> bool:
+    """
+    Render a completed job's report to `out`, a path or binary file (ReportLab is
+    imported on first export, not at startup). Returns whether it may be cached:
+    reports whose AI text fell back to templates for lack of time are served
+    once and rendered again next time.
+    """
+    from app.services.ai_text_service import TextBudget
+    from app.services.pdf_export import get_pdf_exporter
+    analysis_data = {
+        'status': JobStatus.COMPLETED.value,
+        'analysis_result': json.loads(result_json)
+    }
+    budget = TextBudget()
+    get_pdf_exporter().write_pdf(analysis_data, title, out, budget=budget)
+    return not budget.degraded_sections
+
+
+async def _in_render_pool(fn: Callable, *args: Any) -> Any:
+    """Run a PDF render on the render pool, off the event loop and the shared threadpool."""
+    return await asyncio.get_running_loop().run_in_executor(get_render_pool(), fn, *args)
+
+
+def _schedule_prerender(job_id: str, title: Optional[str], result_json: str) -> None:
+    """Render a just-completed job's PDF in the background so the first download is a cache hit."""
+    if not (settings.PDF_PRERENDER_ON_COMPLETE and settings.PDF_CACHE_ENABLED):
+        return
+    title = title or "Screenplay"
+    cache = get_pdf_cache()
+
+    async def prerender() -> None:
+        try:
+            path, cached = await _in_render_pool(
+                cache.get_or_render, cache.key(job_id, title), lambda out: _render_pdf(result_json, title, out)
+            )
+            if not cached:
+                path.unlink()
+        except Exception as e:
+            logger.warning(f"PDF pre-render failed for {job_id}: {e}")
+
+    task = asyncio.create_task(prerender())
+    _prerender_tasks.add(task)
+    task.add_done_callback(_prerender_tasks.discard)
+
+
+def _iter_file(fh: BinaryIO, start: int, length: int) -> Iterator[bytes]:
+    """Read `length` bytes from `start` of an open file in chunks, closing it when done."""
+    with fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(settings.PDF_STREAM_CHUNK_BYTES, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _iter_temp_file(path: Path, length: int) -> Iterator[bytes]:
+    """Stream a temp file and delete it, even when the client disconnects mid-download."""
+    try:
+        yield from _iter_file(open(path, "rb"), 0, length)
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _temp_file_response(path: Path, filename: str, media_type: str = "application/pdf") -> StreamingResponse:
+    """Stream a rendered file that isn't cached (a report or export), deleting it afterwards."""
+    size = path.stat().st_size
+    return StreamingResponse(
+        _iter_temp_file(path, size),
+        media_type=media_type,
+        headers={
+            "Cache-Control": "no-store",
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(size),
+        },
     )
 
-@router.get("/export/{job_id}/pdf", dependencies=[Depends(require_api_key)])
-async def export_pdf(
-    job_id: str,
-    db: Session = Depends(get_db)
-):
+
+def _cached_pdf_response(request: Request, report: BinaryIO, etag: str, filename: str) -> Response:
     """
-    Export analysis results as a PDF report for filmmakers.
-    Professional format with visual recommendations.
+    Serve an opened cached report with ETag, Accept-Ranges and single-range (206) support.
+    Reads go through the open file, so eviction of the report mid-download doesn't affect it.
     """
-    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    stat = os.fstat(report.fileno())
+    size = stat.st_size
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+    }
+    start, length, status_code = 0, size, 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            report.close()
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            length, status_code = end - start + 1, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _iter_file(report, start, length), status_code=status_code, media_type="application/pdf", headers=headers
+    )
+
+
+async def _exportable_job(job_id: str, db: AsyncSession) -> AnalysisJob:
+    """A completed job with a stored result, or the HTTP error saying why not."""
+    job = await db.get(AnalysisJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
+
+    if job.status == JobStatus.EXPIRED:
+        raise HTTPException(status_code=410, detail=job.error_message or "Analysis result has expired")
+
     if job.status != JobStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Analysis not completed yet")
-    
+
     if not job.result_json:
         raise HTTPException(status_code=404, detail="No analysis results found")
-    
-    # Parse the result
-    result_data = json.loads(job.result_json)
-    
-    # Generate PDF
-    pdf_exporter = get_pdf_exporter()
-    
-    analysis_data = {
-        'status': job.status.value,
-        'analysis_result': result_data
-    }
-    
+    return job
+
+
+@router.get("/export/{job_id}/pdf", dependencies=[Depends(require_api_key)])
+async def export_pdf(
+    job_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    writer: JobWriteBatcher = Depends(get_job_writer),
+    cache: PDFCache = Depends(get_pdf_cache)
+):
+    """
+    Export analysis results as a PDF report for filmmakers.
+    Professional format with visual recommendations.
+    Reports are rendered once per job and served from the PDF cache afterwards,
+    with ETag / If-None-Match and Range support.
+    """
+    job = await _exportable_job(job_id, db)
+    _touch_job(job, background_tasks, writer)
+
     script_filename = job.script_title or "Screenplay"
-    pdf_buffer = pdf_exporter.generate_pdf(analysis_data, script_filename)
-    
-    # Return as downloadable file
     filename = f"{script_filename.replace(' ', '_')}_analysis.pdf"
-    
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
-    )
\ No newline at end of file
+
+    if not settings.PDF_CACHE_ENABLED:
+        if settings.PDF_STREAMING:
+            fd, tmp = tempfile.mkstemp(suffix=".pdf")
+            os.close(fd)
+            try:
+                await _in_render_pool(_render_pdf, job.result_json, script_filename, tmp)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            return _temp_file_response(Path(tmp), filename)
+        pdf_buffer = io.BytesIO()
+        await _in_render_pool(_render_pdf, job.result_json, script_filename, pdf_buffer)
+        pdf_buffer.seek(0)
+        return StreamingResponse(
+            pdf_buffer,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
+
+    key = cache.key(job.id, script_filename)
+    etag = f'"{key}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        CACHE_REQUESTS.labels(cache="pdf", result="hit").inc()
+        return Response(status_code=304, headers={"ETag": etag})
+
+    report, cached = await _in_render_pool(
+        cache.open_or_render, key, lambda out: _render_pdf(job.result_json, script_filename, out)
+    )
+    if not cached:
+        # Degraded report: served once without a validator, then discarded
+        report.close()
+        return _temp_file_response(Path(report.name), filename)
+    return _cached_pdf_response(request, report, etag, filename)
+
+
+# Streamed beat exports: chunk generator, media type and filename suffix
+_TEXT_EXPORTS = {
+    ExportFormat.NDJSON: (data_export.ndjson_chunks, "application/x-ndjson", "beats.ndjson"),
+    ExportFormat.CSV: (data_export.csv_chunks, "text/csv; charset=utf-8", "shot_list.csv"),
+}
+# Columnar beat exports, written to a temp file: media type and filename suffix
+_COLUMNAR_EXPORTS = {
+    ExportFormat.PARQUET: ("application/vnd.apache.parquet", "beats.parquet"),
+    ExportFormat.ARROW: ("application/vnd.apache.arrow.file", "beats.arrow"),
+}
+
+
+def _write_columnar(result_json: str, out: str, fmt: str) -> int:
+    return data_export.write_columnar(data_export.load_scenes(result_json), out, fmt)
+
+
+@router.get("/export/{job_id}/{export_format}", dependencies=[Depends(require_api_key)])
+async def export_data(
+    job_id: str,
+    export_format: ExportFormat,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    writer: JobWriteBatcher = Depends(get_job_writer)
+):
+    """
+    Export analysis results for downstream tools, built from the stored result
+    without re-validating it:
+    - `json`: the stored result
+    - `ndjson`: one beat per line, streamed
+    - `csv`: shot list, one row per beat, streamed
+    - `parquet` / `arrow`: beat columns (emotion, intensity, camera, lighting,
+      palette); 501 when pyarrow is not installed
+    PDF reports are served by /export/{job_id}/pdf, registered above.
+    """
+    if export_format not in _TEXT_EXPORTS and export_format not in _COLUMNAR_EXPORTS \
+            and export_format != ExportFormat.JSON:
+        raise HTTPException(status_code=501, detail=f"{export_format.value} export is not implemented")
+    if export_format in _COLUMNAR_EXPORTS:
+        try:
+            data_export.require_pyarrow()
+        except data_export.FormatUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+
+    job = await _exportable_job(job_id, db)
+    _touch_job(job, background_tasks, writer)
+    stem = (job.script_title or "Screenplay").replace(' ', '_')
+
+    if export_format == ExportFormat.JSON:
+        return Response(
+            job.result_json,
+            media_type="application/json",
+            headers={"Content-Disposition": f"attachment; filename={stem}_analysis.json"}
+        )
+
+    if export_format in _TEXT_EXPORTS:
+        chunks, media_type, suffix = _TEXT_EXPORTS[export_format]
+        return StreamingResponse(
+            chunks(data_export.load_scenes(job.result_json)),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={stem}_{suffix}"}
+        )
+
+    media_type, suffix = _COLUMNAR_EXPORTS[export_format]
+    fd, tmp = tempfile.mkstemp(suffix=f".{export_format.value}")
+    os.close(fd)
+    try:
+        await run_in_threadpool(_write_columnar, job.result_json, tmp, export_format.value)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return _temp_file_response(Path(tmp), f"{stem}_{suffix}", media_type)
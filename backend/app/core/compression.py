@@ -0,0 +1,310 @@
+"""
+Response compression for JSON payloads.
+
+Pure ASGI, like RateLimitMiddleware: responses that aren't compressed pass
+straight through, and nothing else (PDF or columnar exports, small bodies,
+already-encoded bodies) is buffered or copied.
+
+- Brotli is used when the client accepts it and the optional `brotli`
+  package is installed, otherwise gzip.
+- JSON bodies (application/json, application/x-ndjson) of at least
+  COMPRESSION_MIN_BYTES are compressed; streamed bodies are compressed chunk
+  by chunk.
+- A strong ETag promises byte-identical bodies, so the compressed form of a
+  single-body response with a strong ETag is kept in the response cache, an
+  LRU of COMPRESSION_CACHE_MAX_BYTES keyed by (ETag, encoding). Completed
+  jobs have immutable results, so their payloads are compressed once (and
+  /jobs/{job_id} keeps their uncompressed body there too).
+- Each encoding is a different representation and gets its own ETag
+  ('"abc"' becomes '"abc-gzip"'). The suffix is stripped from If-None-Match
+  before the application sees it, so endpoints compare their own ETags.
+  A 304 carries the encoded ETag (and Vary) only when the client's validator
+  was an encoded one, i.e. the 200 it holds was compressed; 304s for bodies
+  that were sent as-is (small, binary) pass through unchanged.
+
+Bytes in and out are counted in RESPONSE_BYTES and compression time in
+COMPRESSION_SECONDS; cache lookups in CACHE_REQUESTS as cache="response".
+"""
+import gzip
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS, COMPRESSION_SECONDS, RESPONSE_BYTES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson")
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodings this process can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Tuple[str, ...]) -> Optional[str]:
+    """First of `available` the Accept-Encoding header allows (q > 0), or None for identity."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.strip().lower()] = q
+    for encoding in available:
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Whole-body compression; gzip output has a zero mtime so it is deterministic."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed bodies; each chunk is flushed so clients see it at once."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes, last: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            return out + (self._compressor.finish() if last else self._compressor.flush())
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the `encoding` representation: '"abc"' -> '"abc-gzip"'."""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def strip_encoded_etags(if_none_match: str) -> str:
+    """If-None-Match with the encoding suffixes of encoded_etag() removed."""
+    candidates = []
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        for encoding in ("br", "gzip"):
+            suffix = f'-{encoding}"'
+            if candidate.endswith(suffix):
+                candidate = candidate[:-len(suffix)] + '"'
+                break
+        candidates.append(candidate)
+    return ", ".join(candidates)
+
+
+class ResponseCache:
+    """
+    Response bodies by (strong ETag, encoding), bounded by total bytes (LRU).
+    Holds compressed bodies and, under "identity", bodies endpoints chose to keep.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = settings.COMPRESSION_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is not None:
+                self._entries.move_to_end((etag, encoding))
+        CACHE_REQUESTS.labels(cache="response", result="hit" if body is not None else "miss").inc()
+        return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((etag, encoding), None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[(etag, encoding)] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the singleton response body cache"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+class CompressionMiddleware:
+    """GZip/Brotli for JSON responses above COMPRESSION_MIN_BYTES (see module docstring)."""
+
+    def __init__(self, app: ASGIApp, cache: Optional[ResponseCache] = None, minimum_size: Optional[int] = None):
+        self.app = app
+        self.cache = get_response_cache() if cache is None else cache
+        self.minimum_size = settings.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if_none_match = headers.get("if-none-match")
+        validators: frozenset = frozenset()
+        if if_none_match:
+            validators = frozenset(candidate.strip() for candidate in if_none_match.split(","))
+            raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            raw.append((b"if-none-match", strip_encoded_etags(if_none_match).encode("latin-1")))
+            scope = {**scope, "headers": raw}
+
+        encoding = negotiate_encoding(headers.get("accept-encoding"), available_encodings())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.cache, self.minimum_size, validators))
+
+
+class _CompressingSend:
+    """send() wrapper for one response: decides on the start message, then compresses the body."""
+
+    def __init__(
+        self, send: Send, encoding: str, cache: ResponseCache, minimum_size: int, validators: frozenset = frozenset()
+    ):
+        self.send = send
+        self.encoding = encoding
+        self.cache = cache
+        self.minimum_size = minimum_size
+        # If-None-Match entries as the client sent them (encoding suffixes intact)
+        self.validators = validators
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = {**message, "headers": list(message.get("headers", []))}
+            self.passthrough = not self._eligible(message)
+            if self.passthrough:
+                if message["status"] == 304:
+                    self._not_modified_headers()
+                await self.send(self.start)
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is not None:
+            await self._send_chunk(body, more_body)
+        elif not more_body:
+            await self._send_whole(body)
+        else:
+            self.stream = _StreamCompressor(self.encoding)
+            headers = self._encoded_headers()
+            if "content-length" in headers:
+                del headers["content-length"]
+            await self.send(self.start)
+            await self._send_chunk(body, more_body)
+
+    def _eligible(self, message: Message) -> bool:
+        headers = Headers(raw=message.get("headers", []))
+        if message["status"] != 200 or "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+        length = headers.get("content-length")
+        return length is None or int(length) >= self.minimum_size
+
+    def _representation_headers(self, encoding: Optional[str] = None) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag:
+            headers["etag"] = encoded_etag(etag, encoding or self.encoding)
+        return headers
+
+    def _not_modified_headers(self) -> None:
+        """
+        Not Modified refers to the representation the client holds. The 304 has no
+        body to judge eligibility by, but the client's validator says which one: an
+        encoded ETag means the 200 was compressed; a plain one means it was sent
+        as-is (too small, not JSON), and the 304 must keep that ETag to match it.
+        """
+        etag = Headers(raw=self.start["headers"]).get("etag")
+        if not etag:
+            return
+        for encoding in ("br", "gzip"):
+            if encoded_etag(etag, encoding) in self.validators:
+                self._representation_headers(encoding)
+                return
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = self._representation_headers()
+        headers["content-encoding"] = self.encoding
+        return headers
+
+    async def _send_whole(self, body: bytes) -> None:
+        if len(body) < self.minimum_size:
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        etag = Headers(raw=self.start["headers"]).get("etag")
+        strong = etag is not None and not etag.startswith("W/")
+        encoded = self.cache.get(etag, self.encoding) if strong else None
+        if encoded is None:
+            started = time.perf_counter()
+            encoded = compress(body, self.encoding)
+            COMPRESSION_SECONDS.labels(encoding=self.encoding).observe(time.perf_counter() - started)
+            if strong:
+                self.cache.put(etag, self.encoding, encoded)
+        self._count(len(body), len(encoded))
+        headers = self._encoded_headers()
+        headers["content-length"] = str(len(encoded))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": encoded})
+
+    async def _send_chunk(self, body: bytes, more_body: bool) -> None:
+        started = time.perf_counter()
+        encoded = self.stream.chunk(body, last=not more_body)
+        COMPRESSION_SECONDS.labels(encoding=self.encoding).observe(time.perf_counter() - started)
+        self._count(len(body), len(encoded))
+        await self.send({"type": "http.response.body", "body": encoded, "more_body": more_body})
+
+    def _count(self, identity: int, encoded: int) -> None:
+        RESPONSE_BYTES.labels(encoding=self.encoding, stage="uncompressed").inc(identity)
+        RESPONSE_BYTES.labels(encoding=self.encoding, stage="sent").inc(encoded)
@@ -35,7 +35,28 @@ class Settings(BaseSettings):
     # Database Settings (SQLite for capstone)
     DATABASE_URL: str = "sqlite:///./msi_vpe.db"
     DATABASE_ECHO: bool = False
-    
+    # Async driver URL used by the job endpoints; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # SQLite tuning (PRAGMAs applied to every new connection)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_AUTO_VACUUM: str = "INCREMENTAL"
+
+    # Job status writes arriving within this window share one commit
+    JOB_WRITE_BATCH_WINDOW_MS: int = 5
+
+    # Job retention (background sweeper)
+    JOB_RETENTION_ENABLED: bool = True
+    JOB_TTL_SECONDS: int = 7 * 24 * 3600
+    JOB_RESULT_MAX_TOTAL_BYTES: int = 512 * 1024 * 1024
+    JOB_RETENTION_SWEEP_INTERVAL_SECONDS: int = 300
+    JOB_RETENTION_VACUUM_PAGES: int = 2000
+    # Reads refresh last_accessed_at at most this often per job
+    JOB_ACCESS_TOUCH_INTERVAL_SECONDS: int = 60
+
     # AI Model Settings
     EMOTION_MODEL_PRIMARY: str = "SamLowe/roberta-base-go_emotions"
     EMOTION_MODEL_SECONDARY: str = "j-hartmann/emotion-english-distilroberta-base"
@@ -46,7 +67,29 @@ class Settings(BaseSettings):
     # Inference Settings
     MAX_SEQUENCE_LENGTH: int = 512
     BATCH_SIZE: int = 8
+    # Pool beats from concurrent requests into one forward pass (EmotionDetector)
+    INFERENCE_BATCHING_ENABLED: bool = False
+    INFERENCE_BATCH_MAX_SIZE: int = 32
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 5.0
     CONFIDENCE_THRESHOLD: float = 0.3
+
+    # Torch CPU execution, applied by app.core.ml when a model loads.
+    # Threads: 0 keeps torch's default (all cores); with N workers per host use cores / N
+    TORCH_INTRA_OP_THREADS: int = 0
+    TORCH_INTER_OP_THREADS: int = 0
+    # oneDNN (mkldnn) kernels for CPU ops
+    TORCH_ONEDNN_ENABLED: bool = True
+    # torch.inference_mode instead of the pipelines' torch.no_grad
+    TORCH_INFERENCE_MODE: bool = True
+    # torch.compile the emotion classifier (first calls per input shape are slow)
+    TORCH_COMPILE_CLASSIFIER: bool = False
+    # Cast weights to bfloat16 when the CPU has native bf16 support (AVX512-BF16/AMX)
+    TORCH_BF16: bool = False
+
+    # Batch analysis (/analyze/batch)
+    BATCH_MAX_SCRIPTS: int = 200
+    # Scripts whose beats share one inference pass; results are persisted after each pass
+    BATCH_SCRIPTS_PER_PASS: int = 8
     
     # Knowledge Base Paths
     KNOWLEDGE_BASE_DIR: str = "./knowledge-base"
@@ -65,20 +108,76 @@ class Settings(BaseSettings):
     
     # Performance
     ENABLE_CACHING: bool = True
+    # A PROCESSING job from another worker is reused for identical submissions only if
+    # it was updated this recently; older ones are presumed orphaned by a crash or restart
+    JOB_DEDUP_PROCESSING_STALE_SECONDS: int = 600
     CACHE_TTL: int = 3600
+    # Rendered PDF reports, reused across downloads of the same job
+    PDF_CACHE_ENABLED: bool = True
+    PDF_CACHE_DIR: str = "./pdf_cache"
+    # Must be positive; there is no unbounded mode (turn the cache off with PDF_CACHE_ENABLED)
+    PDF_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    # Render the PDF in the background as soon as a job completes
+    PDF_PRERENDER_ON_COMPLETE: bool = False
+    # Threads rendering whole reports, off the event loop
+    PDF_RENDER_WORKERS: int = 2
+    # Processes sharing the scene sections of long reports (<= 1 renders them serially).
+    # Off by default: every web worker would start its own pool, so only enable it with
+    # spare cores, at most os.cpu_count() // (number of web workers)
+    PDF_SECTION_WORKERS: int = 1
+    PDF_PARALLEL_MIN_SCENES: int = 40
+    # Build report flowables as pages are laid out and stream reports from a temp file,
+    # instead of holding every flowable and the finished PDF in memory
+    PDF_STREAMING: bool = True
+    PDF_STREAM_CHUNK_BYTES: int = 64 * 1024
+    # Beats per chunk of NDJSON/CSV exports and per record batch of Parquet/Arrow exports
+    EXPORT_BATCH_ROWS: int = 1024
+    # Compress JSON responses of at least COMPRESSION_MIN_BYTES (Brotli needs the optional
+    # brotli package, otherwise gzip); compressed bodies with strong ETags are cached
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Scenes taking longer than this are logged with their per-stage breakdown
+    SLOW_SCENE_THRESHOLD_SECONDS: float = 2.0
 
     # Security / Auth
     API_KEY: Optional[str] = None
+    # Token bucket per client IP: refills RATE_LIMIT_PER_MINUTE per minute, holds RATE_LIMIT_BURST
     RATE_LIMIT_PER_MINUTE: int = 120
     RATE_LIMIT_BURST: int = 60
+    # "memory" (per process) or "sqlite" (shared by all workers on the host)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limit.db"
+    # How long a check waits for another worker's lock before letting the request through
+    RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS: int = 50
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000
 
     # Startup behavior
-    WARM_MODELS_ON_STARTUP: bool = False
+    # Load models in the background at startup. /ready returns 503 until the emotion model is
+    # loaded; with this off that only happens on the first analysis, so keep it on behind a
+    # load balancer that routes by readiness
+    WARM_MODELS_ON_STARTUP: bool = True
+    # Workers forked by `python -m app.server` after models load in the parent
+    SERVER_WORKERS: int = 2
 
     # AI Text Generation tuning
     AI_TEXT_MAX_SUMMARY_LEN: int = 120
     AI_TEXT_MIN_SUMMARY_LEN: int = 40
     AI_TEXT_MAX_BULLET_LEN: int = 180
+    # Prompts per summarization/generation call
+    AI_TEXT_BATCH_SIZE: int = 16
+    # Generated text by (prompt, model, generation params): memory LRU backed by SQLite ("" = memory only)
+    AI_TEXT_CACHE_ENABLED: bool = True
+    AI_TEXT_CACHE_PATH: str = "./ai_text_cache.db"
+    AI_TEXT_CACHE_MEMORY_ENTRIES: int = 4096
+    AI_TEXT_CACHE_MAX_ROWS: int = 200_000
+    # Time budgets (0 = unbounded): one model call, and all AI text of one report.
+    # Past either, or with AI_TEXT_MAX_QUEUE calls already waiting, sections use template text
+    AI_TEXT_CALL_TIMEOUT_SECONDS: float = 20.0
+    AI_TEXT_REPORT_BUDGET_SECONDS: float = 60.0
+    AI_TEXT_MAX_QUEUE: int = 8
     
     # Feature Flags
     ENABLE_ENSEMBLE_MODELS: bool = True
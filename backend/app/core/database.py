@@ -1,24 +1,140 @@
-from sqlalchemy import create_engine
+from typing import AsyncIterator, Optional
+
+import logging
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.locks import FileLock
+
+logger = logging.getLogger(__name__)
 
 # Create SQLAlchemy Engine
 # connect_args={"check_same_thread": False} is needed only for SQLite.
 # It allows more than one thread to communicate with the database.
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+connect_args = {"check_same_thread": False} if is_sqlite else {}
+
+
+def _async_url(url: str) -> str:
+    """Map a sync driver URL onto its async counterpart (sqlite -> aiosqlite)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    return url
+
+
+def sqlite_pragmas() -> list:
+    """PRAGMA statements applied to every new SQLite connection."""
+    return [
+        # Only takes effect on a fresh file; sync_schema() converts existing ones
+        f"PRAGMA auto_vacuum={settings.SQLITE_AUTO_VACUUM}",
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+    ]
+
+
+def apply_sqlite_pragmas(target: Engine) -> None:
+    """Register a connect hook that tunes each pooled SQLite connection."""
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in sqlite_pragmas():
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
 
 engine = create_engine(
-    settings.DATABASE_URL, 
+    settings.DATABASE_URL,
     connect_args=connect_args,
     echo=settings.DATABASE_ECHO
 )
 
+# Async engine for the request path; commits no longer block the event loop
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL),
+    echo=settings.DATABASE_ECHO
+)
+
+if is_sqlite:
+    apply_sqlite_pragmas(engine)
+    apply_sqlite_pragmas(async_engine.sync_engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 
 # Create Base class for models
 Base = declarative_base()
 
+def sync_schema(bind: Engine = None) -> None:
+    """
+    Create missing tables, then add columns and indexes introduced since a
+    table was first created (SQLite has no migrations set up for this project).
+    """
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=bind.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+                if column.server_default is not None:
+                    ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+                logger.info(f"Adding column {table.name}.{column.name}")
+                conn.execute(text(ddl))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    if bind.dialect.name == "sqlite" and settings.SQLITE_AUTO_VACUUM.upper() == "INCREMENTAL":
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            # 2 == INCREMENTAL; switching an existing file needs one full VACUUM
+            if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+                logger.info("Converting database to incremental auto_vacuum (one-time VACUUM)")
+                conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+                conn.execute(text("VACUUM"))
+
+
+def database_lock_path(name: str) -> Optional[str]:
+    """Path of the `name` lock file next to the SQLite database, or None if there is no database file."""
+    if not is_sqlite:
+        return None
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return f"{database}-{name}.lock"
+
+
+_schema_synced = False
+
+
+def sync_schema_once() -> None:
+    """
+    sync_schema() at most once per process tree: workers forked after the
+    prefork parent ran it inherit the flag and skip it, and workers started
+    independently take turns under a file lock instead of racing on DDL.
+    """
+    global _schema_synced
+    if _schema_synced:
+        return
+    lock_path = database_lock_path("schema")
+    if lock_path:
+        with FileLock(lock_path):
+            sync_schema()
+    else:
+        sync_schema()
+    _schema_synced = True
+
+
 def get_db():
     """Dependency for FastAPI Endpoints"""
     db = SessionLocal()
@@ -26,3 +142,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async session dependency for FastAPI endpoints"""
+    async with AsyncSessionLocal() as db:
+        yield db
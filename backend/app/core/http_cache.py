@@ -0,0 +1,57 @@
+"""
+Conditional and partial GET helpers: strong ETags, If-None-Match and
+single byte ranges (RFC 9110). Multi-range requests get the full body,
+which the RFC allows.
+"""
+from typing import Optional, Tuple
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches `etag` (weak comparison, as the RFC requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested range lies outside the representation (416)."""
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive for a single `bytes=` range, or None to send the whole body
+    (no header, another unit, several ranges, or a malformed value).
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+    first, sep, last = spec.partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start < 0:
+        raise RangeNotSatisfiable()
+    if end < start:
+        return None
+    return start, min(end, size - 1)
@@ -2,7 +2,9 @@
 Knowledge base validation utilities.
 Ensures required JSON files exist and are well-formed at startup.
 """
+import hashlib
 import json
+from functools import lru_cache
 from pathlib import Path
 import logging
 from typing import Dict
@@ -37,3 +39,15 @@ def validate_knowledge_base() -> None:
         logger.warning(f"Missing knowledge base files: {missing_list}")
     else:
         logger.info(f"Knowledge base validated ({len(REQUIRED_FILES)} files)")
+
+
+@lru_cache(maxsize=1)
+def knowledge_base_version() -> str:
+    """Short content hash of the knowledge base files; changes whenever a rule or palette changes."""
+    digest = hashlib.sha256()
+    for name, path_str in sorted(REQUIRED_FILES.items()):
+        digest.update(name.encode("utf-8"))
+        path = Path(path_str)
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,57 @@
+"""
+Advisory file locks for coordinating worker processes on one host.
+
+Several workers share one SQLite file (prefork or `uvicorn --workers`), and
+some startup work must not run in all of them at once: schema changes, and
+the retention sweeper. A lock is an flock() on a file next to the database;
+the kernel releases it when the holder exits, so a crashed worker never
+leaves it stuck. Without fcntl (Windows) locks always succeed.
+"""
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive flock() on `path`, created if missing"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; with blocking=False return False instead of waiting for another holder."""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
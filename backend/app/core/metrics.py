@@ -0,0 +1,177 @@
+"""
+Prometheus metric definitions shared across the backend.
+
+Scraped from `/metrics`. When several worker processes serve the app, set
+PROMETHEUS_MULTIPROC_DIR so every worker's samples are aggregated.
+"""
+import os
+from typing import Any, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Stage latencies span sub-millisecond mapping up to minute-long PDF reports
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+FILL_RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+# ============================================================================
+# Pipeline stages
+# ============================================================================
+
+PARSE_SECONDS = Histogram(
+    "msi_vpe_parse_seconds",
+    "Time to parse one script into scenes",
+    buckets=LATENCY_BUCKETS,
+)
+INFERENCE_BEAT_SECONDS = Histogram(
+    "msi_vpe_inference_beat_seconds",
+    "Emotion inference latency per beat (forward-pass time divided by beats in the call)",
+    ["model", "backend"],
+    buckets=LATENCY_BUCKETS,
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "msi_vpe_inference_batch_size",
+    "Beats sent to the emotion model per inference call",
+    ["model", "backend"],
+    buckets=BATCH_SIZE_BUCKETS,
+)
+INFERENCE_QUEUE_SECONDS = Histogram(
+    "msi_vpe_inference_queue_seconds",
+    "Time a request waited in the cross-request batcher before its forward pass started",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+INFERENCE_BATCH_FILL = Histogram(
+    "msi_vpe_inference_batch_fill_ratio",
+    "Texts per cross-request batch as a fraction of the maximum batch size",
+    ["model"],
+    buckets=FILL_RATIO_BUCKETS,
+)
+VISUAL_MAPPING_SECONDS = Histogram(
+    "msi_vpe_visual_mapping_seconds",
+    "VisualMapper time per mapped beat or scene summary",
+    buckets=LATENCY_BUCKETS,
+)
+SERIALIZATION_SECONDS = Histogram(
+    "msi_vpe_serialization_seconds",
+    "Time to dump a result to JSON, validate it back (Pydantic) or project stored JSON (project)",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+PDF_GENERATION_SECONDS = Histogram(
+    "msi_vpe_pdf_generation_seconds",
+    "Time to render one PDF report",
+    buckets=LATENCY_BUCKETS,
+)
+DB_WRITE_SECONDS = Histogram(
+    "msi_vpe_db_write_seconds",
+    "Time to commit one batch of job writes",
+    buckets=LATENCY_BUCKETS,
+)
+
+# ============================================================================
+# Jobs, caches and admission
+# ============================================================================
+
+JOBS_TOTAL = Counter(
+    "msi_vpe_jobs_total",
+    "Analysis jobs reaching each status",
+    ["status"],
+)
+CACHE_REQUESTS = Counter(
+    "msi_vpe_cache_requests_total",
+    "Cache lookups by cache and outcome (hit/miss)",
+    ["cache", "result"],
+)
+AI_TEXT_FALLBACKS = Counter(
+    "msi_vpe_ai_text_fallbacks_total",
+    "Report text sections that used the template fallback, by reason",
+    ["reason"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "msi_vpe_rate_limit_rejections_total",
+    "Requests rejected with 429 by the rate limiter",
+)
+QUEUE_DEPTH = Gauge(
+    "msi_vpe_queue_depth",
+    "Work waiting or running: scripts in analysis, job writes awaiting commit",
+    ["queue"],
+    multiprocess_mode="livesum",
+)
+MODELS_LOADED = Gauge(
+    "msi_vpe_models_loaded",
+    "Models loaded in this process",
+    ["model", "backend"],
+    multiprocess_mode="livesum",
+)
+
+# ============================================================================
+# Responses
+# ============================================================================
+
+RESPONSE_BYTES = Counter(
+    "msi_vpe_response_bytes_total",
+    "Compressed JSON response bytes by encoding, before compression (uncompressed) and on the wire (sent)",
+    ["encoding", "stage"],
+)
+COMPRESSION_SECONDS = Histogram(
+    "msi_vpe_compression_seconds",
+    "Time to compress one JSON response body or streamed chunk (cache hits excluded)",
+    ["encoding"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# ============================================================================
+# Retention
+# ============================================================================
+
+RETENTION_ROWS_RECLAIMED = Counter(
+    "msi_vpe_retention_rows_reclaimed_total",
+    "Job rows deleted (ttl) or result payloads evicted (budget) by the retention sweeper",
+    ["reason"],
+)
+RETENTION_BYTES_RECLAIMED = Counter(
+    "msi_vpe_retention_bytes_reclaimed_total",
+    "Bytes reclaimed by the retention sweeper (payload bytes for ttl/budget, file bytes for vacuum)",
+    ["reason"],
+)
+RETENTION_SWEEPS = Counter(
+    "msi_vpe_retention_sweeps_total",
+    "Completed retention sweeps",
+)
+JOB_RESULT_BYTES = Gauge(
+    "msi_vpe_job_result_bytes",
+    "Total bytes of stored job result payloads after the last sweep",
+    multiprocess_mode="livemax",
+)
+
+
+def model_backend(pipe: Any) -> str:
+    """Backend label for a transformers pipeline, e.g. 'pt-cpu', 'pt-cpu-bf16' or 'pt-cuda'."""
+    framework = getattr(pipe, "framework", None)
+    device = getattr(getattr(pipe, "device", None), "type", None)
+    if isinstance(framework, str) and isinstance(device, str):
+        dtype = getattr(getattr(pipe, "model", None), "dtype", None)
+        suffix = "-bf16" if str(dtype) == "torch.bfloat16" else ""
+        return f"{framework}-{device}{suffix}"
+    return "unknown"
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition payload and content type for the `/metrics` endpoint."""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
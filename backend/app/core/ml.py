@@ -0,0 +1,123 @@
+"""
+Deferred access to the ML stack.
+
+Importing transformers pulls in torch and takes seconds, so modules that
+build pipelines call `pipeline()` from here instead of importing it at
+module level. The import happens on first model load, keeping app startup
+and `/health` fast.
+
+Every pipeline built here also gets the same torch CPU configuration
+(TORCH_* settings): thread pools sized once per process, oneDNN, inference
+mode, and optionally bf16 weights and a compiled classifier.
+"""
+import functools
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tasks whose model is compiled when TORCH_COMPILE_CLASSIFIER is set
+CLASSIFIER_TASKS = ("text-classification",)
+
+_torch_configured = False
+
+
+def configure_torch() -> Optional[Dict[str, Any]]:
+    """
+    Apply the TORCH_* thread and backend settings to this process, once.
+    Returns the effective configuration, or None when torch is unavailable.
+    """
+    global _torch_configured
+    try:
+        import torch
+    except ImportError:
+        return None
+
+    if not _torch_configured:
+        _torch_configured = True
+        if settings.TORCH_INTRA_OP_THREADS > 0:
+            torch.set_num_threads(settings.TORCH_INTRA_OP_THREADS)
+        if settings.TORCH_INTER_OP_THREADS > 0:
+            try:
+                torch.set_num_interop_threads(settings.TORCH_INTER_OP_THREADS)
+            except RuntimeError as exc:
+                # Only allowed before the first inter-op parallel work in the process
+                logger.warning(f"Could not set inter-op threads: {exc}")
+        torch.backends.mkldnn.enabled = settings.TORCH_ONEDNN_ENABLED
+        logger.info(f"Torch CPU configuration: {torch_config()}")
+    return torch_config()
+
+
+def torch_config() -> Dict[str, Any]:
+    """Effective torch execution settings, for logs and benchmark reports."""
+    import torch
+
+    return {
+        "intra_op_threads": torch.get_num_threads(),
+        "inter_op_threads": torch.get_num_interop_threads(),
+        "onednn": torch.backends.mkldnn.enabled,
+        "inference_mode": settings.TORCH_INFERENCE_MODE,
+        "compile_classifier": settings.TORCH_COMPILE_CLASSIFIER,
+        "bf16": settings.TORCH_BF16 and bf16_supported(),
+    }
+
+
+def bf16_supported() -> bool:
+    """True when oneDNN has native bf16 kernels on this CPU (otherwise bf16 is emulated and slower)."""
+    try:
+        import torch
+        return bool(torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+
+def tune_pipeline(pipe: Any, task: Optional[str] = None) -> Any:
+    """Apply inference mode, bf16 and (for classifiers) torch.compile to a loaded pipeline."""
+    import torch
+
+    if settings.TORCH_INFERENCE_MODE:
+        # Pipelines wrap forward() in get_inference_context(), torch.no_grad by default
+        pipe.get_inference_context = lambda: torch.inference_mode
+
+    model = getattr(pipe, "model", None)
+    if model is None or getattr(pipe, "framework", None) != "pt" or pipe.device.type != "cpu":
+        return pipe
+
+    if settings.TORCH_BF16:
+        if bf16_supported():
+            model.to(torch.bfloat16)
+            model.forward = _float_logits(model.forward)
+        else:
+            logger.info("TORCH_BF16 ignored: no native bf16 support on this CPU")
+
+    if settings.TORCH_COMPILE_CLASSIFIER and task in CLASSIFIER_TASKS:
+        try:
+            model.forward = torch.compile(model.forward, dynamic=True)
+        except Exception as exc:
+            logger.warning(f"torch.compile unavailable, running eagerly: {exc}")
+    return pipe
+
+
+def _float_logits(forward: Callable) -> Callable:
+    """Wrap a bf16 model's forward so logits come back as float32 (pipelines call .numpy() on them)."""
+    @functools.wraps(forward)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        outputs = forward(*args, **kwargs)
+        logits = outputs.get("logits") if hasattr(outputs, "get") else None
+        if logits is not None:
+            outputs["logits"] = logits.float()
+        return outputs
+    return wrapper
+
+
+def pipeline(*args: Any, **kwargs: Any) -> Any:
+    """`transformers.pipeline`, imported on first use and tuned per the TORCH_* settings."""
+    from transformers import pipeline as hf_pipeline
+
+    torch_available = configure_torch() is not None
+    pipe = hf_pipeline(*args, **kwargs)
+    if torch_available:
+        pipe = tune_pipeline(pipe, args[0] if args else kwargs.get("task"))
+    return pipe
@@ -0,0 +1,205 @@
+"""
+Token-bucket rate limiting.
+
+Each client owns a bucket of RATE_LIMIT_BURST tokens that refills at
+RATE_LIMIT_PER_MINUTE / 60 tokens per second; a request spends one token.
+State per client is two floats (tokens, last update), so a check is O(1).
+
+Backends:
+    memory  per-process LRU map, bounded by RATE_LIMIT_MAX_CLIENTS
+    sqlite  a small SQLite file shared by every worker on the host, so N
+            uvicorn workers enforce one limit instead of N; checks block, so
+            the middleware runs them in the threadpool
+"""
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Protocol, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate-limit check, with the values reported in response headers"""
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again
+    reset_seconds: float
+    # Seconds until the next request would be allowed (0 when allowed)
+    retry_after: float
+
+
+def refill(tokens: float, updated_at: float, rate: float, capacity: float, now: float) -> float:
+    """Tokens in a bucket last seen at `updated_at` with `tokens` left."""
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+class RateLimitBackend(Protocol):
+    # True when take() does I/O and must not run on the event loop
+    blocking: bool
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> Tuple[bool, float]:
+        """Spend one token from `key`'s bucket if possible; return (allowed, tokens left)."""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process buckets in an LRU-ordered dict.
+    Buckets idle long enough to have refilled are dropped (a full bucket is the
+    same as no bucket), and the least recently seen client is evicted beyond
+    `max_clients`, so memory stays bounded under IP churn.
+    """
+
+    blocking = False
+
+    def __init__(self, max_clients: Optional[int] = None):
+        self.max_clients = settings.RATE_LIMIT_MAX_CLIENTS if max_clients is None else max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> Tuple[bool, float]:
+        bucket = self._buckets.pop(key, None)
+        tokens = capacity if bucket is None else refill(bucket[0], bucket[1], rate, capacity, now)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[key] = (tokens, now)
+        self._evict(now, capacity / rate if rate > 0 else math.inf)
+        return allowed, tokens
+
+    def _evict(self, now: float, full_after: float) -> None:
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        # Oldest entries first; stop at the first bucket that may still be draining
+        while self._buckets:
+            _, updated_at = next(iter(self._buckets.values()))
+            if now - updated_at < full_after:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Buckets in a SQLite file shared by all workers on one host.
+    Each check is one short IMMEDIATE transaction (WAL, no fsync); buckets
+    that have refilled are purged every `purge_every` checks. If the lock is
+    still held by another worker after RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS the
+    request is allowed rather than kept waiting.
+    """
+
+    blocking = True
+
+    def __init__(self, path: Optional[str] = None, purge_every: int = 1000, busy_timeout_ms: Optional[int] = None):
+        self.path = path or settings.RATE_LIMIT_SQLITE_PATH
+        self.purge_every = purge_every
+        self.busy_timeout = (
+            settings.RATE_LIMIT_SQLITE_BUSY_TIMEOUT_MS if busy_timeout_ms is None else busy_timeout_ms
+        ) / 1000
+        self._local = threading.local()
+        self._checks = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few updates on power loss only refills some buckets early
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "client TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> Tuple[bool, float]:
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as exc:
+            # Contended past the busy timeout: fail open instead of stalling the request
+            logger.warning(f"Rate limit check skipped for {key}: {exc}")
+            return True, capacity - 1.0
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE client = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else refill(row[0], row[1], rate, capacity, now)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (client, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(client) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now),
+            )
+            self._checks += 1
+            if rate > 0 and self._checks % self.purge_every == 0:
+                conn.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - capacity / rate,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, tokens
+
+
+class RateLimiter:
+    """Token-bucket limiter over a pluggable backend."""
+
+    def __init__(
+        self,
+        per_minute: Optional[int] = None,
+        burst: Optional[int] = None,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        per_minute = settings.RATE_LIMIT_PER_MINUTE if per_minute is None else per_minute
+        burst = settings.RATE_LIMIT_BURST if burst is None else burst
+        self.rate = per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self.backend = backend if backend is not None else MemoryRateLimitBackend()
+
+    @property
+    def blocking(self) -> bool:
+        """Whether check() blocks on I/O (run it off the event loop)"""
+        return getattr(self.backend, "blocking", False)
+
+    def check(self, key: str, now: Optional[float] = None) -> RateLimitDecision:
+        """Spend a token for `key` and describe the result."""
+        now = time.time() if now is None else now
+        allowed, tokens = self.backend.take(key, self.rate, self.capacity, now)
+        missing = self.capacity - tokens
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=int(self.capacity),
+            remaining=int(tokens),
+            reset_seconds=missing / self.rate if self.rate > 0 else math.inf,
+            retry_after=0.0 if allowed else ((1.0 - tokens) / self.rate if self.rate > 0 else math.inf),
+        )
+
+
+def build_rate_limiter() -> RateLimiter:
+    """Rate limiter configured from settings (RATE_LIMIT_BACKEND selects the backend)."""
+    backend_name = settings.RATE_LIMIT_BACKEND.lower()
+    if backend_name == "sqlite":
+        backend: RateLimitBackend = SQLiteRateLimitBackend()
+    elif backend_name == "memory":
+        backend = MemoryRateLimitBackend()
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{settings.RATE_LIMIT_BACKEND}' (expected memory or sqlite)")
+    logger.info(
+        f"Rate limiting: {settings.RATE_LIMIT_PER_MINUTE}/min, burst {settings.RATE_LIMIT_BURST}, "
+        f"{backend_name} backend"
+    )
+    return RateLimiter(backend=backend)
@@ -0,0 +1,38 @@
+"""
+Lightweight per-stage wall-clock timing for the analysis pipeline.
+
+A StageTimer is a dict of accumulated seconds keyed by stage name; timing a
+block costs two perf_counter() calls, so it stays on in production.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimer:
+    """Accumulates elapsed seconds per named stage"""
+
+    __slots__ = ("stages",)
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and add it to `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Attribute time measured elsewhere (e.g. a share of a batched call)"""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def get(self, name: str) -> float:
+        return self.stages.get(name, 0.0)
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
@@ -2,20 +2,27 @@
 MSI-VPE FastAPI Application Entry Point
 """
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from contextlib import asynccontextmanager
 import logging
-import time
-from typing import Dict, Deque
-from collections import defaultdict, deque
+import math
+from typing import Dict
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import async_engine, database_lock_path, sync_schema_once
 from app.core.knowledge_base import validate_knowledge_base
-from app.services.analysis_service import AnalysisService
+from app.core.metrics import RATE_LIMIT_REJECTIONS, render_metrics
+from app.core.rate_limit import RateLimitDecision, RateLimiter, build_rate_limiter
+from app.services.job_store import get_job_writer
+from app.services.render_pool import shutdown_render_pools
+from app.services.retention import RetentionSweeper
+from app.services.warmup import ModelWarmup, default_warmup_steps, emotion_model_loaded
 from app.models.job import AnalysisJob # Import models to register them
 
 # Configure logging
@@ -25,36 +32,69 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Simple in-memory rate limiter (per-process, best-effort)
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: FastAPI, max_per_minute: int, burst: int):
-        super().__init__(app)
-        self.max_per_minute = max_per_minute
-        self.burst = burst
-        self.requests: Dict[str, Deque[float]] = defaultdict(deque)
-
-    async def dispatch(self, request: Request, call_next):
-        # Skip for docs/health
-        path = request.url.path
-        if path.startswith("/docs") or path.startswith("/openapi") or path.startswith("/health"):
-            return await call_next(request)
-
-        now = time.time()
-        window_start = now - 60
-        client_ip = request.client.host if request.client else "anonymous"
-        q = self.requests[client_ip]
-        # drop old
-        while q and q[0] < window_start:
-            q.popleft()
-
-        if len(q) >= max(self.max_per_minute, self.burst):
-            return JSONResponse(
+class RateLimitMiddleware:
+    """
+    Per-client token-bucket limiting with X-RateLimit-* headers on every limited route.
+
+    Pure ASGI: headers are added to the response start message and body
+    messages pass straight through, so streamed responses (PDF exports) are
+    never buffered or copied and no extra task runs per request. Backends that
+    block (the shared SQLite file) are checked in the threadpool.
+    """
+
+    EXEMPT_PREFIXES = ("/docs", "/openapi", "/health", "/ready", "/metrics")
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip for non-HTTP traffic and docs/health/readiness/metrics
+        if scope["type"] != "http" or scope["path"].startswith(self.EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = client[0] if client else "anonymous"
+        if self.limiter.blocking:
+            decision = await run_in_threadpool(self.limiter.check, key)
+        else:
+            decision = self.limiter.check(key)
+        headers = rate_limit_headers(decision)
+
+        if not decision.allowed:
+            RATE_LIMIT_REJECTIONS.inc()
+            response = JSONResponse(
                 status_code=429,
-                content={"detail": "Rate limit exceeded. Please retry later."}
+                content={"detail": "Rate limit exceeded. Please retry later."},
+                headers=headers
             )
+            await response(scope, receive, send)
+            return
 
-        q.append(now)
-        return await call_next(request)
+        raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> Dict[str, str]:
+    """X-RateLimit-* (and Retry-After when rejected) for a limiter decision"""
+    headers = {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining),
+        "X-RateLimit-Reset": str(math.ceil(decision.reset_seconds)) if math.isfinite(decision.reset_seconds) else "0",
+    }
+    if not decision.allowed and math.isfinite(decision.retry_after):
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return headers
+
+
+warmup = ModelWarmup(models_loaded=emotion_model_loaded)
 
 
 @asynccontextmanager
@@ -63,26 +103,33 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"Knowledge base directory: {settings.KNOWLEDGE_BASE_DIR}")
 
-    # Initialize Database
+    # Initialize Database (already done by the parent under `python -m app.server`)
     logger.info("Initializing database...")
-    Base.metadata.create_all(bind=engine)
+    sync_schema_once()
     logger.info("Database initialized.")
 
+    # One sweeper per database: workers contend for its lock, the holder sweeps
+    sweeper = RetentionSweeper(lock_path=database_lock_path("retention"))
+    if settings.JOB_RETENTION_ENABLED:
+        sweeper.start()
+
     # Validate knowledge base files
     validate_knowledge_base()
 
-    # Optional: warm AI models to avoid cold start
+    # Warm AI models in the background; /ready reports 503 until they are loaded
+    # (with warm-up off, until the first analysis loads them)
     if settings.WARM_MODELS_ON_STARTUP:
-        try:
-            service = AnalysisService()
-            service.emotion_detector.analyze_text("Warm up")
-            logger.info("AI models warmed up")
-        except Exception as exc:
-            logger.warning(f"AI warm-up failed: {exc}")
+        warmup.steps = default_warmup_steps()
+        warmup.start()
 
     yield
 
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await warmup.stop()
+    await sweeper.stop()
+    await get_job_writer().flush()
+    await run_in_threadpool(shutdown_render_pools)
+    await async_engine.dispose()
     logger.info("Shutdown complete")
 
 
@@ -95,6 +142,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Compress large JSON responses (innermost, so rate-limit and CORS headers are untouched)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -102,13 +153,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After"],
 )
 
-app.add_middleware(
-    RateLimitMiddleware,
-    max_per_minute=settings.RATE_LIMIT_PER_MINUTE,
-    burst=settings.RATE_LIMIT_BURST,
-)
+app.add_middleware(RateLimitMiddleware, limiter=build_rate_limiter())
 
 
 @app.get("/")
@@ -126,13 +174,38 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness check: the process is up and serving. Touches no models or database."""
     return {
         "status": "healthy",
         "version": settings.APP_VERSION,
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: the database answers and the emotion model is loaded."""
+    checks: Dict[str, object] = {"models": warmup.describe()}
+    ready = warmup.ready
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except Exception as exc:
+        checks["database"] = f"error: {exc}"
+        ready = False
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 # API v1 routes will be registered here
 from app.api.endpoints import analysis
 app.include_router(analysis.router, prefix=settings.API_V1_PREFIX, tags=["analysis"])
@@ -0,0 +1,7 @@
+"""
+SQLAlchemy persistence models
+"""
+
+from .job import AnalysisJob, JobStatus
+
+__all__ = ["AnalysisJob", "JobStatus"]
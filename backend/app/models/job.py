@@ -0,0 +1,47 @@
+"""
+Analysis job persistence model
+"""
+import enum
+from datetime import datetime
+
+from sqlalchemy import Column, String, Text, DateTime, Enum, Integer, Index
+
+from app.core.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Lifecycle states of an analysis job"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"  # Result payload evicted by the retention policy
+
+
+class AnalysisJob(Base):
+    """A single screenplay analysis request and its serialized result"""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    script_title = Column(String, nullable=True)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING, index=True)
+    result_json = Column(Text, nullable=True)
+    # Size of result_json in bytes, kept so retention can budget storage without reading payloads
+    result_bytes = Column(Integer, nullable=False, default=0, server_default="0")
+    error_message = Column(Text, nullable=True)
+    # Batch analysis: child jobs point at their parent batch job
+    parent_id = Column(String, nullable=True, index=True)
+    batch_index = Column(Integer, nullable=True)
+    # SHA-256 of (normalized script, options, pipeline versions) for deduplication
+    content_hash = Column(String(64), nullable=True, index=True)
+    # Client-supplied Idempotency-Key header, if any
+    idempotency_key = Column(String, nullable=True, index=True, unique=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set at creation and refreshed on reads; NULL only on rows from before it was set at creation
+    last_accessed_at = Column(DateTime, nullable=True, index=True, default=datetime.utcnow)
+
+    __table_args__ = (
+        # LRU eviction scans stored payloads oldest-access first
+        Index("ix_analysis_jobs_status_last_accessed", "status", "last_accessed_at"),
+    )
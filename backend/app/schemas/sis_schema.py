@@ -390,6 +390,24 @@ class ScriptMetadata(SISBaseModel):
 # TOP-LEVEL SCENE INTENT SCHEMA
 # ============================================================================
 
+class BeatTimings(SISBaseModel):
+    """Wall time spent on one beat, per pipeline stage"""
+    beat_id: str = Field(..., description="Beat identifier")
+    inference_seconds: float = Field(0.0, ge=0.0, description="Share of the batched emotion inference")
+    mapping_seconds: float = Field(0.0, ge=0.0, description="Pacing, power and visual mapping")
+    schema_seconds: float = Field(0.0, ge=0.0, description="Beat model construction")
+
+
+class SceneTimings(SISBaseModel):
+    """Per-stage timing breakdown for one scene"""
+    parse_seconds: float = Field(0.0, ge=0.0, description="Share of the script parse")
+    inference_seconds: float = Field(0.0, ge=0.0, description="Emotion inference for the scene's beats")
+    mapping_seconds: float = Field(0.0, ge=0.0, description="Pacing, power and visual mapping")
+    schema_seconds: float = Field(0.0, ge=0.0, description="Beat and scene model construction")
+    total_seconds: float = Field(0.0, ge=0.0, description="Sum of all stages")
+    beats: List[BeatTimings] = Field(default_factory=list, description="Per-beat breakdown")
+
+
 class SceneIntentSchema(SISBaseModel):
     """
     Complete Scene Intent Schema (SIS) - Top-level output
@@ -447,6 +465,10 @@ class SceneIntentSchema(SISBaseModel):
         default_factory=dict,
         description="AI model versions used"
     )
+    timings: Optional[SceneTimings] = Field(
+        None,
+        description="Per-stage timing breakdown (included in responses on request)"
+    )
     warnings: List[str] = Field(
         default_factory=list,
         description="Analysis warnings or caveats"
@@ -517,6 +539,10 @@ class SceneIntentSchema(SISBaseModel):
 # INPUT/OUTPUT MODELS
 # ============================================================================
 
+# Emotion model tier: "fast" for interactive previews, "full" for final analysis and exports
+AnalysisTier = Literal["fast", "full"]
+
+
 class ScriptInput(SISBaseModel):
     """Input model for script upload"""
     script_text: str = Field(..., min_length=10, description="Fountain format screenplay text")
@@ -529,6 +555,10 @@ class ScriptInput(SISBaseModel):
         None,
         description="Visual style preset (e.g., 'noir', 'blockbuster')"
     )
+    tier: AnalysisTier = Field(
+        default="full",
+        description="Emotion model tier: 'fast' (small model, live previews) or 'full'"
+    )
 
 
 class AnalysisRequest(SISBaseModel):
@@ -544,7 +574,7 @@ class AnalysisRequest(SISBaseModel):
 class AnalysisResponse(SISBaseModel):
     """Response from analysis endpoint"""
     job_id: str = Field(..., description="Job identifier")
-    status: Literal["pending", "processing", "completed", "failed"] = Field(
+    status: Literal["pending", "processing", "completed", "failed", "expired"] = Field(
         ...,
         description="Analysis status"
     )
@@ -553,6 +583,26 @@ class AnalysisResponse(SISBaseModel):
     progress: Optional[int] = Field(None, ge=0, le=100, description="Progress percentage")
 
 
+class BatchScriptInput(SISBaseModel):
+    """Input model for analyzing many scripts or scenes in one request"""
+    scripts: List[ScriptInput] = Field(..., min_length=1, description="Scripts or scenes to analyze")
+    title: Optional[str] = Field(None, description="Batch title (e.g. season or episode block)")
+
+
+class BatchAnalysisResponse(SISBaseModel):
+    """Aggregate status of a batch analysis and its child jobs"""
+    batch_id: str = Field(..., description="Parent batch job identifier")
+    status: Literal["pending", "processing", "completed", "failed", "expired"] = Field(
+        ...,
+        description="Batch status"
+    )
+    total: int = Field(..., ge=0, description="Number of child jobs")
+    completed: int = Field(default=0, ge=0, description="Child jobs completed")
+    failed: int = Field(default=0, ge=0, description="Child jobs failed")
+    progress: int = Field(default=0, ge=0, le=100, description="Progress percentage across the batch")
+    jobs: List[AnalysisResponse] = Field(default_factory=list, description="Child jobs in submission order")
+
+
 class HealthCheck(SISBaseModel):
     """API health check response"""
     status: Literal["healthy", "unhealthy"] = "healthy"
@@ -571,6 +621,10 @@ class ExportFormat(str, Enum):
     XML = "xml"
     PDF = "pdf"
     USD = "usd"  # Future: Universal Scene Description
+    NDJSON = "ndjson"  # One beat per line
+    CSV = "csv"  # Shot list
+    PARQUET = "parquet"  # Beat columns (requires pyarrow)
+    ARROW = "arrow"  # Beat columns as an Arrow IPC file (requires pyarrow)
 
 
 class ExportRequest(SISBaseModel):
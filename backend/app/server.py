@@ -0,0 +1,196 @@
+"""
+Preforked Model Server
+----------------------
+`uvicorn --workers N` spawns fresh interpreters, so every worker loads its
+own copy of the emotion and AI text models. This entry point loads them once
+in a parent process, then forks the HTTP workers: model weights live in
+pages the workers only read, so the kernel shares them copy-on-write and
+total RSS grows by the per-worker Python heap rather than by the models.
+
+The parent only loads models, brings the database schema up to date, and
+supervises (restarting workers that die); it never runs inference, so no
+intra-op thread pools exist at fork time. Workers skip the schema sync, and
+only one of them runs the retention sweeper (see app.services.retention).
+Use the sqlite rate-limit backend and PROMETHEUS_MULTIPROC_DIR so limits
+and metrics span the workers.
+
+Usage (from backend/):
+    python -m app.server --workers 4 --port 8000
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Don't restart a worker more often than this when it keeps crashing
+RESTART_BACKOFF_SECONDS = 1.0
+
+
+def preload_models() -> None:
+    """
+    Load the shared model singletons in this process and move everything
+    allocated so far out of the collector's view, so forked workers don't
+    dirty those pages when the GC walks them.
+    """
+    # Fast tokenizers disable themselves noisily when parallelism was used before a fork
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    from app.api.endpoints.analysis import get_analysis_service
+    from app.services.ai_text_service import get_ai_text_service
+    from app.services.pdf_export import get_pdf_exporter
+
+    started = time.perf_counter()
+    get_analysis_service()
+    get_ai_text_service()
+    get_pdf_exporter()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Models preloaded in {time.perf_counter() - started:.1f}s (pid {os.getpid()})")
+
+
+def reset_after_fork() -> None:
+    """Drop resources inherited from the parent that must not be shared across processes."""
+    from app.core.database import async_engine, engine
+
+    # close=False: the connections belong to the parent; just forget them
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+
+class PreforkSupervisor:
+    """Forks `workers` children running `target()` and keeps that many alive until stopped."""
+
+    def __init__(self, target: Callable[[], None], workers: int):
+        self.target = target
+        self.workers = max(1, workers)
+        self.children: Dict[int, float] = {}
+        self._stopping = False
+
+    def _spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                self.target()
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+        return pid
+
+    def start(self) -> None:
+        """Fork the initial workers."""
+        while len(self.children) < self.workers:
+            self._spawn()
+
+    def stop(self, sig: int = signal.SIGTERM, timeout: float = 30.0) -> None:
+        """Signal every worker and reap them, killing any still alive after `timeout`."""
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap(block=False)
+            time.sleep(0.05)
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGKILL)
+        while self.children:
+            self._reap(block=True)
+
+    def _reap(self, block: bool) -> Optional[int]:
+        try:
+            pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            self.children.clear()
+            return None
+        if pid == 0 or pid not in self.children:
+            return None
+        started = self.children.pop(pid)
+        _mark_worker_dead(pid)
+        if not self._stopping:
+            logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            if time.monotonic() - started < RESTART_BACKOFF_SECONDS:
+                time.sleep(RESTART_BACKOFF_SECONDS)
+        return pid
+
+    def run(self) -> None:
+        """Start workers and supervise until SIGTERM/SIGINT."""
+        def _shutdown(signum, frame):
+            self._stopping = True
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+        self.start()
+        while not self._stopping:
+            self._reap(block=False)
+            if not self._stopping:
+                self.start()
+            time.sleep(0.2)
+        logger.info("Stopping workers")
+        self.stop()
+
+
+def _mark_worker_dead(pid: int) -> None:
+    """Let the Prometheus multiprocess collector drop a dead worker's live gauges."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Listening socket created before forking, so every worker accepts on it."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(host: str, port: int, workers: int) -> None:
+    """Preload models, bind, fork `workers` uvicorn servers and supervise them."""
+    import uvicorn
+    from app.core.database import sync_schema_once
+    from app.main import app
+
+    # Once, before forking, so workers don't race on ALTER TABLE / VACUUM
+    sync_schema_once()
+    preload_models()
+    sock = bind_socket(host, port)
+    logger.info(f"Listening on {host}:{port} with {workers} preforked workers")
+
+    def worker() -> None:
+        reset_after_fork()
+        config = uvicorn.Config(app, log_level=settings.LOG_LEVEL.lower(), lifespan="on")
+        uvicorn.Server(config).run(sockets=[sock])
+
+    PreforkSupervisor(worker, workers).run()
+    sock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="HTTP worker processes")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+AI Text Cache
+-------------
+Report prompts are built from analysis data (locations, emotion sets, beat
+counts), so different scenes and repeated exports keep producing the same
+prompts. Generation is greedy (do_sample=False), so a prompt's output is
+fixed for a given model and generation parameters and can be reused exactly.
+
+Two tiers:
+    memory  per-process LRU of AI_TEXT_CACHE_MEMORY_ENTRIES outputs
+    sqlite  AI_TEXT_CACHE_PATH, shared by every worker and kept across
+            restarts; the oldest rows beyond AI_TEXT_CACHE_MAX_ROWS are purged
+
+Lookups are counted in CACHE_REQUESTS as cache="ai_text_memory" and, for
+memory misses, cache="ai_text_sqlite".
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_key(prompt: str, model: str, params: Dict[str, Any]) -> str:
+    """Cache key of one generation: prompt, model and generation parameters."""
+    payload = json.dumps({"prompt": prompt, "model": model, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AITextCache:
+    """Generated text by prompt_key(), in a bounded memory LRU backed by SQLite."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_entries: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        purge_every: int = 1000,
+    ):
+        self.path = settings.AI_TEXT_CACHE_PATH if path is None else path
+        self.memory_entries = settings.AI_TEXT_CACHE_MEMORY_ENTRIES if memory_entries is None else memory_entries
+        self.max_rows = settings.AI_TEXT_CACHE_MAX_ROWS if max_rows is None else max_rows
+        self.purge_every = purge_every
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts = 0
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        conn = getattr(self._local, "conn", None)
+        # A connection inherited across fork must not be reused
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few entries on power loss only costs a regeneration
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_text_cache ("
+                "key TEXT PRIMARY KEY, output TEXT NOT NULL, created_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Cached outputs for whichever of `keys` are present."""
+        found: Dict[str, str] = {}
+        with self._lock:
+            for key in keys:
+                output = self._memory.get(key)
+                if output is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = output
+        missing = [key for key in keys if key not in found]
+        CACHE_REQUESTS.labels(cache="ai_text_memory", result="hit").inc(len(found))
+        CACHE_REQUESTS.labels(cache="ai_text_memory", result="miss").inc(len(missing))
+
+        conn = self._connection()
+        if conn is None or not missing:
+            return found
+        stored: Dict[str, str] = {}
+        try:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key, output FROM ai_text_cache WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                stored.update(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"AI text cache read failed: {e}")
+        CACHE_REQUESTS.labels(cache="ai_text_sqlite", result="hit").inc(len(stored))
+        CACHE_REQUESTS.labels(cache="ai_text_sqlite", result="miss").inc(len(missing) - len(stored))
+        self._remember(stored)
+        found.update(stored)
+        return found
+
+    def put_many(self, outputs: Dict[str, str]) -> None:
+        if not outputs:
+            return
+        self._remember(outputs)
+        conn = self._connection()
+        if conn is None:
+            return
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ai_text_cache (key, output, created_at) VALUES (?, ?, ?)",
+                    [(key, output, now) for key, output in outputs.items()],
+                )
+                self._puts += len(outputs)
+                if self.max_rows > 0 and self._puts >= self.purge_every:
+                    self._puts = 0
+                    conn.execute(
+                        "DELETE FROM ai_text_cache WHERE key IN ("
+                        "SELECT key FROM ai_text_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_rows,),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"AI text cache write failed: {e}")
+
+    def _remember(self, outputs: Dict[str, str]) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            for key, output in outputs.items():
+                self._memory[key] = output
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+_ai_text_cache: Optional[AITextCache] = None
+
+
+def get_ai_text_cache() -> AITextCache:
+    """Get the singleton AI text cache"""
+    global _ai_text_cache
+    if _ai_text_cache is None:
+        _ai_text_cache = AITextCache()
+    return _ai_text_cache
@@ -6,19 +6,67 @@ If models are unavailable, falls back to template-based text.
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Any
-
-from transformers import pipeline
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Any, Optional, Tuple
 
 from app.core.config import settings
+from app.core.ml import pipeline
+from app.core.metrics import AI_TEXT_FALLBACKS, MODELS_LOADED, model_backend
+from app.services.ai_text_cache import AITextCache, get_ai_text_cache, prompt_key
 
 logger = logging.getLogger(__name__)
 
+# Model behind summaries and shot lists (part of the PDF cache key)
+AI_TEXT_MODEL = "t5-small"
+
+# Prompts are grouped by approximate token count in steps of this size;
+# each group shares one max_length/min_length and is generated in batches
+LENGTH_BUCKET = 16
+
+
+class TextBudget:
+    """
+    Time allowed for the AI text of one report (AI_TEXT_REPORT_BUDGET_SECONDS).
+    Sections that fell back to template text are recorded with the reason.
+    """
+
+    def __init__(self, seconds: float | None = None):
+        seconds = settings.AI_TEXT_REPORT_BUDGET_SECONDS if seconds is None else seconds
+        self.deadline = time.monotonic() + seconds if seconds > 0 else None
+        self.degraded: List[Tuple[str, str]] = []
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None when unbounded."""
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def degrade(self, section: str, reason: str) -> None:
+        self.degraded.append((section, reason))
+
+    @property
+    def degraded_sections(self) -> List[str]:
+        """Sections that fell back because of time or load (not because no model is installed)."""
+        return [section for section, reason in self.degraded if reason != "unavailable"]
+
+
+class FallbackReason(Exception):
+    """A model call was skipped or abandoned; the message is the metrics reason."""
+
 
 class AITextService:
-    def __init__(self):
+    def __init__(self, cache: AITextCache | None = None):
         self._summarizer = None
         self._generator = None
+        if cache is None and settings.AI_TEXT_CACHE_ENABLED:
+            cache = get_ai_text_cache()
+        self.cache = cache
+        # Model calls with a timeout run on one worker thread (one model, one call at a time)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        self._queued = 0
+        self._queue_lock = threading.Lock()
         self._init_pipelines()
 
     def _init_pipelines(self):
@@ -26,77 +74,225 @@ class AITextService:
             # Lightweight summarizer
             self._summarizer = pipeline(
                 "summarization",
-                model="t5-small",
-                tokenizer="t5-small"
+                model=AI_TEXT_MODEL,
+                tokenizer=AI_TEXT_MODEL
             )
             # Use the same model for light generation by framing prompts
             self._generator = self._summarizer
-            logger.info("AITextService pipelines initialized (t5-small)")
+            MODELS_LOADED.labels(model=AI_TEXT_MODEL, backend=model_backend(self._summarizer)).inc()
+            logger.info(f"AITextService pipelines initialized ({AI_TEXT_MODEL})")
         except Exception as e:
             logger.warning(f"AITextService pipeline init failed: {e}. Will use fallbacks.")
             self._summarizer = None
             self._generator = None
 
-    def _safe_summarize(self, text: str, max_len: int | None = None, min_len: int | None = None) -> str:
-        text = (text or "").strip()
-        if not text:
-            return ""
+    @staticmethod
+    def _length_bucket(text: str) -> int:
+        """Approximate token count, rounded up so prompts of similar length share generation settings."""
+        approx_tokens = max(8, len(text.split()) * 2)
+        return -(-approx_tokens // LENGTH_BUCKET) * LENGTH_BUCKET
+
+    def _summary_lengths(self, text: str, max_len: int | None, min_len: int | None) -> Tuple[int, int]:
         max_len = max_len or settings.AI_TEXT_MAX_SUMMARY_LEN
         min_len = min_len or settings.AI_TEXT_MIN_SUMMARY_LEN
         # Cap lengths to avoid HF warnings for short inputs
-        approx_tokens = max(8, len(text.split()) * 2)
-        max_len = max(20, min(max_len, approx_tokens))
+        max_len = max(20, min(max_len, self._length_bucket(text)))
         min_len = max(5, min(min_len, max_len - 5))
-        if not self._summarizer:
-            return text if len(text) <= max_len else text[: max_len] + "…"
+        return max_len, min_len
+
+    def _bullet_lengths(self, input_text: str) -> Tuple[int, int]:
+        max_len = min(settings.AI_TEXT_MAX_BULLET_LEN, max(40, self._length_bucket(input_text)))
+        min_len = max(15, min(30, max_len - 10))
+        return max_len, min_len
+
+    def _call_model(self, model, inputs: List[str], budget: TextBudget | None, **kwargs) -> Any:
+        """
+        One model call within the per-call timeout and what is left of `budget`.
+        Raises FallbackReason when the budget is spent, too many calls are already
+        waiting for the model, or the call overruns (it finishes in the background).
+        """
+        timeout = settings.AI_TEXT_CALL_TIMEOUT_SECONDS or None
+        remaining = budget.remaining() if budget is not None else None
+        if remaining is not None:
+            if remaining <= 0:
+                raise FallbackReason("report_budget")
+            timeout = min(timeout, remaining) if timeout else remaining
+        if timeout is None:
+            return model(inputs, **kwargs)
+
+        with self._queue_lock:
+            if self._queued >= max(1, settings.AI_TEXT_MAX_QUEUE):
+                raise FallbackReason("queue_saturated")
+            self._queued += 1
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-text")
+                self._executor_pid = os.getpid()
+            executor = self._executor
+        future = executor.submit(model, inputs, **kwargs)
+        future.add_done_callback(self._call_done)
         try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise FallbackReason("timeout")
+
+    def _call_done(self, _future) -> None:
+        with self._queue_lock:
+            self._queued -= 1
+
+    def _run_batched(
+        self, model, prompts: List[Tuple[str, int, int]], budget: TextBudget | None = None
+    ) -> Tuple[List[str | None], List[str | None]]:
+        """
+        Run (input_text, max_len, min_len) prompts through `model`, one call per
+        batch of prompts sharing the same lengths (shortest first, to keep padding low).
+        Repeated prompts run once; prompts already in the AI text cache skip the model.
+        Returns the generated text per prompt, or None where it must fall back,
+        with the fallback reason per prompt.
+        """
+        keys = [
+            prompt_key(text, AI_TEXT_MODEL, {"max_length": max_len, "min_length": min_len, "do_sample": False})
+            for text, max_len, min_len in prompts
+        ]
+        cached = self.cache.get_many(list(set(keys))) if self.cache is not None else {}
+        # Identical prompts are generated once: one representative index per key
+        pending: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key not in cached:
+                pending.setdefault(key, i)
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i in pending.values():
+            groups.setdefault(prompts[i][1:], []).append(i)
+        generated: Dict[str, str] = dict(cached)
+        failed: Dict[str, str] = {}
+        batch_size = max(1, settings.AI_TEXT_BATCH_SIZE)
+        for (max_len, min_len), indices in groups.items():
+            indices.sort(key=lambda i: len(prompts[i][0]))
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start:start + batch_size]
+                try:
+                    out = self._call_model(
+                        model,
+                        [prompts[i][0] for i in batch],
+                        budget,
+                        max_length=max_len,
+                        min_length=min_len,
+                        do_sample=False,
+                        batch_size=len(batch)
+                    )
+                except FallbackReason as e:
+                    failed.update((keys[i], str(e)) for i in batch)
+                    continue
+                except Exception as e:
+                    logger.warning(f"AI text batch of {len(batch)} failed: {e}")
+                    failed.update((keys[i], "error") for i in batch)
+                    continue
+                for i, item in zip(batch, out):
+                    # Pipelines return one dict per input (a list of dicts when num_return_sequences > 1)
+                    item = item[0] if isinstance(item, list) else item
+                    generated[keys[i]] = (item["summary_text"] or "").strip()
+        if self.cache is not None:
+            self.cache.put_many({key: text for key, text in generated.items() if key not in cached})
+        return [generated.get(key) for key in keys], [failed.get(key) for key in keys]
+
+    @staticmethod
+    def _record_fallbacks(reasons: List[str | None], sections: List[str] | None, budget: TextBudget | None) -> None:
+        for i, reason in enumerate(reasons):
+            if reason is None:
+                continue
+            AI_TEXT_FALLBACKS.labels(reason=reason).inc()
+            if budget is not None:
+                budget.degrade(sections[i] if sections else f"text {i + 1}", reason)
+
+    def summarize_many(
+        self,
+        texts: List[str],
+        max_len: int | None = None,
+        min_len: int | None = None,
+        budget: TextBudget | None = None,
+        sections: List[str] | None = None,
+    ) -> List[str]:
+        """
+        Summaries of `texts`, batched through the model; falls back to truncation per text.
+        Fallbacks are recorded on `budget` under the matching name in `sections`.
+        """
+        texts = [(text or "").strip() for text in texts]
+        prompts = [(i, *self._summary_lengths(text, max_len, min_len)) for i, text in enumerate(texts) if text]
+        summaries = [""] * len(texts)
+        generated: List[str | None] = [None] * len(prompts)
+        reasons: List[str | None] = ["unavailable"] * len(prompts)
+        if self._summarizer and prompts:
             # t5 expects prefixed task
-            input_text = f"summarize: {text}"
-            out = self._summarizer(
-                input_text,
-                max_length=max_len,
-                min_length=min_len,
-                do_sample=False
+            generated, reasons = self._run_batched(
+                self._summarizer, [(f"summarize: {texts[i]}", mx, mn) for i, mx, mn in prompts], budget
             )
-            return (out[0]["summary_text"] or "").strip()
-        except Exception as e:
-            logger.warning(f"Summarization failed: {e}")
-            return text if len(text) <= max_len else text[: max_len] + "…"
+        for (i, max_len_i, _), summary in zip(prompts, generated):
+            text = texts[i]
+            if summary is None:
+                summary = text if len(text) <= max_len_i else text[: max_len_i] + "…"
+            summaries[i] = summary
+        self._record_fallbacks(
+            reasons, [sections[i] for i, _, _ in prompts] if sections else None, budget
+        )
+        return summaries
 
-    def _safe_generate_bullets(self, prompt: str, count: int = 5) -> List[str]:
-        prompt = (prompt or "").strip()
-        if not prompt:
-            return []
-        if not self._generator:
-            # Template fallback
-            return [f"Shot suggestion {i+1}: {prompt[:48]}…" for i in range(count)]
-        try:
-            # For t5-small, reuse summarization with a directive and split sentences
-            input_text = (
-                "generate bullets: "
-                + prompt
-                + f"\nReturn {count} concise bullet points."
+    def generate_bullets_many(
+        self,
+        prompts: List[str],
+        count: int = 5,
+        budget: TextBudget | None = None,
+        sections: List[str] | None = None,
+    ) -> List[List[str]]:
+        """
+        `count` bullets per prompt, batched through the model; falls back to template bullets.
+        Fallbacks are recorded on `budget` under the matching name in `sections`.
+        """
+        prompts = [(prompt or "").strip() for prompt in prompts]
+        # For t5-small, reuse summarization with a directive and split sentences
+        inputs = [
+            (i, "generate bullets: " + prompt + f"\nReturn {count} concise bullet points.")
+            for i, prompt in enumerate(prompts) if prompt
+        ]
+        bullets: List[List[str]] = [[] for _ in prompts]
+        generated: List[str | None] = [None] * len(inputs)
+        reasons: List[str | None] = ["unavailable"] * len(inputs)
+        if self._generator and inputs:
+            generated, reasons = self._run_batched(
+                self._generator, [(text, *self._bullet_lengths(text)) for _, text in inputs], budget
             )
-            max_len = min(settings.AI_TEXT_MAX_BULLET_LEN, max(40, len(input_text.split()) * 2))
-            min_len = max(15, min(30, max_len - 10))
-            out = self._generator(input_text, max_length=max_len, min_length=min_len, do_sample=False)
-            text = (out[0]["summary_text"] or "").strip()
-            # Split heuristically into bullets
-            bullets = [b.strip("- •\n ") for b in text.replace("\r", "").split("\n") if b.strip()]
-            if len(bullets) < count:
-                # Try periods as separators
-                more = [s.strip() for s in text.split(".") if s.strip()]
-                for s in more:
-                    if s not in bullets:
-                        bullets.append(s)
-                    if len(bullets) >= count:
-                        break
-            return bullets[:count]
-        except Exception as e:
-            logger.warning(f"Bullet generation failed: {e}")
-            return [f"Shot suggestion {i+1}: {prompt[:48]}…" for i in range(count)]
+        for (i, _), text in zip(inputs, generated):
+            if text is None:
+                # Template fallback
+                bullets[i] = [f"Shot suggestion {n+1}: {prompts[i][:48]}…" for n in range(count)]
+            else:
+                bullets[i] = self._split_bullets(text, count)
+        self._record_fallbacks(
+            reasons, [sections[i] for i, _ in inputs] if sections else None, budget
+        )
+        return bullets
+
+    @staticmethod
+    def _split_bullets(text: str, count: int) -> List[str]:
+        # Split heuristically into bullets
+        bullets = [b.strip("- •\n ") for b in text.replace("\r", "").split("\n") if b.strip()]
+        if len(bullets) < count:
+            # Try periods as separators
+            more = [s.strip() for s in text.split(".") if s.strip()]
+            for s in more:
+                if s not in bullets:
+                    bullets.append(s)
+                if len(bullets) >= count:
+                    break
+        return bullets[:count]
 
-    def generate_executive_summary(self, analysis: Dict[str, Any], script_title: str) -> str:
+    def _safe_summarize(self, text: str, max_len: int | None = None, min_len: int | None = None) -> str:
+        return self.summarize_many([text], max_len, min_len)[0]
+
+    def _safe_generate_bullets(self, prompt: str, count: int = 5) -> List[str]:
+        return self.generate_bullets_many([prompt], count)[0]
+
+    def generate_executive_summary(
+        self, analysis: Dict[str, Any], script_title: str, budget: TextBudget | None = None
+    ) -> str:
         scenes = analysis.get("scenes") or []
         if not scenes and analysis:
             # single-scene shape
@@ -119,9 +315,9 @@ class AITextService:
             "This report translates emotional arcs into actionable cinematography, lighting, and color guidance "
             "to support creative intent and on-set decision-making."
         )
-        return self._safe_summarize(base, max_len=120, min_len=40)
+        return self.summarize_many([base], 120, 40, budget, ["executive summary"])[0]
 
-    def generate_scene_overview(self, scene: Dict[str, Any], idx: int) -> str:
+    def _scene_overview_prompt(self, scene: Dict[str, Any], idx: int) -> str:
         loc = scene.get("scene_location") or "Unknown location"
         beats = scene.get("beats", [])
         emotions = []
@@ -133,13 +329,12 @@ class AITextService:
             elif isinstance(pe, str):
                 emotions.append(pe)
         emo_text = ", ".join(sorted({e for e in emotions if e})) or "mixed"
-        raw = (
+        return (
             f"Scene {idx} at {loc} comprises {len(beats)} beats with a tonal palette of {emo_text}. "
             "The pacing and emotional intensity evolve to guide coverage and lighting motifs."
         )
-        return self._safe_summarize(raw, max_len=110, min_len=30)
 
-    def generate_shot_list(self, scene: Dict[str, Any], count: int = 5) -> List[str]:
+    def _shot_list_prompt(self, scene: Dict[str, Any]) -> str:
         # Build a compact prompt from beats' visual recommendations
         details = []
         for b in scene.get("beats", [])[:6]:  # cap context size
@@ -154,11 +349,31 @@ class AITextService:
             details.append(
                 f"{pe_name} — shots: {shots}; moves: {moves}; angles: {angs}"
             )
-        prompt = (
+        return (
             "Design a concise, practical shot list for a scene based on emotional beats and suggested coverage.\n"
             + "\n".join(details)
         )
-        return self._safe_generate_bullets(prompt, count=count)
+
+    def generate_scene_overview(self, scene: Dict[str, Any], idx: int) -> str:
+        return self._safe_summarize(self._scene_overview_prompt(scene, idx), max_len=110, min_len=30)
+
+    def generate_shot_list(self, scene: Dict[str, Any], count: int = 5) -> List[str]:
+        return self._safe_generate_bullets(self._shot_list_prompt(scene), count=count)
+
+    def generate_scene_overviews(self, scenes: List[Dict[str, Any]], budget: TextBudget | None = None) -> List[str]:
+        """Overview for every scene (numbered from 1), in one pass ahead of report layout."""
+        prompts = [self._scene_overview_prompt(scene, idx) for idx, scene in enumerate(scenes, 1)]
+        sections = [f"scene {idx} overview" for idx in range(1, len(scenes) + 1)]
+        return self.summarize_many(prompts, max_len=110, min_len=30, budget=budget, sections=sections)
+
+    def generate_shot_lists(
+        self, scenes: List[Dict[str, Any]], count: int = 5, budget: TextBudget | None = None
+    ) -> List[List[str]]:
+        """Shot list for every scene, in one pass ahead of report layout."""
+        sections = [f"scene {idx} shot list" for idx in range(1, len(scenes) + 1)]
+        return self.generate_bullets_many(
+            [self._shot_list_prompt(scene) for scene in scenes], count=count, budget=budget, sections=sections
+        )
 
 
 # Singleton access
@@ -1,9 +1,16 @@
 import logging
+import threading
+import time
 import uuid
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from app import __version__
 from app.core.config import settings
+from app.core.knowledge_base import knowledge_base_version
+from app.core.metrics import PARSE_SECONDS, VISUAL_MAPPING_SECONDS
+from app.core.timing import StageTimer
 from app.parsers.fountain_parser import FountainParser, Scene, ElementType
 from app.services.emotion_detector import EmotionDetector
 from app.services.visual_mapper import VisualMapper
@@ -17,122 +24,297 @@ from app.schemas.sis_schema import (
     PowerDynamics,
     PacingMetadata,
     EmotionalArc,
-    EmotionDetection
+    EmotionDetection,
+    EmotionCategory,
+    BeatTimings,
+    SceneTimings
 )
 
 logger = logging.getLogger(__name__)
 
+
+# "fast": small model for interactive previews; "full": primary model for final analysis and exports
+DETECTOR_TIERS = ("fast", "full")
+
+
+def tier_model(tier: str = "full") -> str:
+    """Emotion model behind a detector tier."""
+    return settings.EMOTION_MODEL_TERTIARY if tier == "fast" else settings.EMOTION_MODEL_PRIMARY
+
+
+def pipeline_versions(tier: str = "full") -> Dict[str, str]:
+    """Versions of every component that influences an analysis result."""
+    return {
+        "analysis_service": __version__,
+        "emotion_model": tier_model(tier),
+        "knowledge_base": knowledge_base_version(),
+    }
+
+
+@dataclass
+class BeatPlan:
+    """A beat cut from the script, awaiting emotion inference"""
+    uid: str
+    text: str
+    element_type: ElementType
+    character: Optional[str]
+    start: float
+    end: float
+    duration: float
+
+
 class AnalysisService:
     """
     Orchestrator service that combines parsing, emotion detection, 
     and visual mapping into a complete analysis pipeline.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        emotion_detector: Optional[EmotionDetector] = None,
+        fast_detector: Optional[EmotionDetector] = None,
+    ):
         self.parser = FountainParser()
-        self.emotion_detector = EmotionDetector()
+        # Allow callers (benchmarks, tools) to inject a detector instead of loading the model
+        self.emotion_detector = emotion_detector or EmotionDetector()
+        # The fast tier loads on its first request
+        self._fast_detector = fast_detector
+        self._fast_lock = threading.Lock()
         self.visual_mapper = VisualMapper()
 
-    def analyze_script(self, text: str, job_id: str) -> List[SceneIntentSchema]:
+    def detector_for(self, tier: str) -> Tuple[EmotionDetector, str]:
+        """
+        Detector for a tier, and the tier actually served: if the fast model
+        can't load, requests fall back to the full detector.
+        """
+        if tier != "fast":
+            return self.emotion_detector, "full"
+        if self._fast_detector is None:
+            with self._fast_lock:
+                if self._fast_detector is None:
+                    self._fast_detector = EmotionDetector.for_tier("fast")
+        if not self._fast_detector.available:
+            logger.warning("Fast emotion model unavailable; using the full model")
+            return self.emotion_detector, "full"
+        return self._fast_detector, "fast"
+
+    def analyze_script(self, text: str, job_id: str, tier: str = "full") -> List[SceneIntentSchema]:
         """
         Full pipeline: Parse -> Detect Emotion -> Map Visuals -> Construct Schema
         """
-        logger.info(f"Starting analysis for job {job_id}")
-        
-        # 1. Parse Script
-        scenes = self.parser.parse_string(text)
-        logger.info(f"Parsed {len(scenes)} scenes")
-        
-        results = []
-        
-        for scene in scenes:
-            scene_analysis = self._analyze_single_scene(scene, job_id)
-            if scene_analysis:
-                results.append(scene_analysis)
-                
-        return results
+        return self.analyze_scripts([(text, job_id)], tiers=[tier])[0]
 
-    def _analyze_single_scene(self, scene: Scene, job_id: str) -> Optional[SceneIntentSchema]:
-        """Analyze a single parsed scene"""
-        beats: List[Beat] = []
-        scene_emotions: List[EmotionDetection] = []
-        
+    def analyze_scripts(
+        self,
+        submissions: List[Tuple[str, str]],
+        tiers: Optional[List[str]] = None,
+    ) -> List[List[SceneIntentSchema]]:
+        """
+        Analyze several (text, job_id) submissions with one shared inference pass
+        per detector tier (`tiers` is per submission; default "full").
+        Beat texts from every scene of every script go to the detector together,
+        so short scripts still fill inference batches.
+        """
+        tiers = tiers or ["full"] * len(submissions)
+        planned = []
+        for (text, job_id), tier in zip(submissions, tiers):
+            logger.info(f"Starting analysis for job {job_id}")
+
+            # 1. Parse Script (fresh parser: it is stateful and the service is shared across threads)
+            started = time.perf_counter()
+            with PARSE_SECONDS.time():
+                scenes = FountainParser().parse_string(text)
+            parse_share = (time.perf_counter() - started) / len(scenes) if scenes else 0.0
+            logger.info(f"Parsed {len(scenes)} scenes")
+            planned.append((job_id, tier, parse_share, [(scene, self._plan_beats(scene)) for scene in scenes]))
+
+        # 2. Emotion Detection for every beat of every script, one pass per tier
+        inference = {}
+        for tier in dict.fromkeys(tier for _, tier, _, _ in planned):
+            texts = [
+                plan.text
+                for _, script_tier, _, scenes in planned if script_tier == tier
+                for _, plans in scenes for plan in plans
+            ]
+            detector, served = self.detector_for(tier)
+            started = time.perf_counter()
+            arcs = iter(self._detect_emotions(texts, detector))
+            # The pass is shared, so each beat is charged an equal share of it
+            beat_inference = (time.perf_counter() - started) / len(texts) if texts else 0.0
+            inference[tier] = (arcs, served, beat_inference)
+
+        all_results = []
+        for job_id, tier, parse_share, scenes in planned:
+            arcs, served, beat_inference = inference[tier]
+            results = []
+            for scene, plans in scenes:
+                scene_arcs = [next(arcs) for _ in plans]
+                timer = StageTimer()
+                timer.add("parse", parse_share)
+                timer.add("inference", beat_inference * len(plans))
+                scene_analysis = self._analyze_single_scene(
+                    scene, job_id, plans, scene_arcs, timer=timer, beat_inference_seconds=beat_inference,
+                    tier=served
+                )
+                if scene_analysis:
+                    results.append(scene_analysis)
+            all_results.append(results)
+
+        return all_results
+
+    def _plan_beats(self, scene: Scene) -> List[BeatPlan]:
+        """Split a scene into beats with timing and speaker, ready for inference"""
+        plans: List[BeatPlan] = []
         current_character = None
         global_time_cursor = 0.0
-        
+
         # Filter elements to only analyze narrative content
-        processable_types = {ElementType.ACTION, ElementType.DIALOGUE, ElementType.CHARACTER}
-        
-        # We need to look ahead/behind sometimes, but linear pass is easier
         # Grouping logic: Character -> Parenthetical -> Dialogue
-        
-        buffer_elements = []
-        
         for idx, element in enumerate(scene.elements):
-            
+
             if element.element_type == ElementType.CHARACTER:
                 current_character = element.content
                 continue
-                
+
             if element.element_type not in [ElementType.ACTION, ElementType.DIALOGUE]:
                 continue
-                
+
             # Content Processing
             content_text = element.content
-            
-            # 1. Estimate Timing
+
+            # Estimate Timing
             # Rule of thumb: speaking rate ~150 wpm (2.5 words/sec), action reading rate similar
             word_count = len(content_text.split())
-            duration = max(1.0, word_count / 2.5) 
+            duration = max(1.0, word_count / 2.5)
             start_time = global_time_cursor
             end_time = global_time_cursor + duration
             global_time_cursor = end_time
-            
-            # 2. Emotion Detection
-            # We use scene number and element index as IDs
-            beat_uid = f"{scene.scene_number}-{idx}"
-            
+
+            plans.append(BeatPlan(
+                # We use scene number and element index as IDs
+                uid=f"{scene.scene_number}-{idx}",
+                text=content_text,
+                element_type=element.element_type,
+                character=current_character,
+                start=start_time,
+                end=end_time,
+                duration=duration
+            ))
+
+            # Reset character if action
+            if element.element_type == ElementType.ACTION:
+                current_character = None
+
+        return plans
+
+    def _detect_emotions(
+        self,
+        texts: List[str],
+        detector: Optional[EmotionDetector] = None,
+    ) -> List[Optional[EmotionalArc]]:
+        """Run one batched inference pass; fall back to per-beat calls if batching fails"""
+        if not texts:
+            return []
+        detector = detector or self.emotion_detector
+        try:
+            arcs = list(detector.analyze_batch(texts))
+            if len(arcs) != len(texts):
+                raise ValueError(f"expected {len(texts)} results, got {len(arcs)}")
+            return arcs
+        except Exception as e:
+            logger.warning(f"Batched emotion detection failed ({e}); falling back to per-beat inference")
+
+        arcs: List[Optional[EmotionalArc]] = []
+        for text in texts:
             try:
-                arc = self.emotion_detector.analyze_text(content_text)
-                scene_emotions.append(arc.primary_emotion)
+                arcs.append(detector.analyze_text(text))
             except Exception as e:
-                logger.error(f"Emotion detection failed for beat {beat_uid}: {e}")
+                logger.error(f"Emotion detection failed: {e}")
+                arcs.append(None)
+        return arcs
+
+    def _analyze_single_scene(
+        self,
+        scene: Scene,
+        job_id: str,
+        plans: Optional[List[BeatPlan]] = None,
+        arcs: Optional[List[Optional[EmotionalArc]]] = None,
+        timer: Optional[StageTimer] = None,
+        beat_inference_seconds: float = 0.0,
+        tier: str = "full"
+    ) -> Optional[SceneIntentSchema]:
+        """
+        Analyze a single parsed scene, optionally with emotions already inferred.
+        `timer` carries time already spent on the scene (parse, shared inference);
+        mapping and schema construction are added here. `tier` is the detector
+        tier that produced (or will produce) the emotions.
+        """
+        timer = timer or StageTimer()
+        if plans is None:
+            plans = self._plan_beats(scene)
+        if arcs is None:
+            with timer.stage("inference"):
+                detector, tier = self.detector_for(tier)
+                arcs = self._detect_emotions([plan.text for plan in plans], detector)
+            beat_inference_seconds = timer.get("inference") / len(plans) if plans else 0.0
+
+        beats: List[Beat] = []
+        beat_timings: List[BeatTimings] = []
+        scene_emotions: List[EmotionDetection] = []
+
+        for plan, arc in zip(plans, arcs):
+            content_text = plan.text
+            beat_uid = plan.uid
+            current_character = plan.character
+            duration = plan.duration
+
+            if arc is None:
+                logger.error(f"Emotion detection failed for beat {beat_uid}")
                 # Fallback to neutral
                 # (Ideally we'd construct a NEUTRAL arc here, skipping for brevity)
                 continue
+            scene_emotions.append(arc.primary_emotion)
+            beat_timer = StageTimer()
+
+            with beat_timer.stage("mapping"):
+                # 3. Pacing (Heuristic)
+                pacing = self._calculate_pacing(content_text, duration)
+
+                # 4. Power Dynamics (Placeholder / Simple Heuristic)
+                power = self._estimate_power(current_character, arc.primary_emotion)
+
+                # 5. Visual Mapping
+                with VISUAL_MAPPING_SECONDS.time():
+                    visuals = self.visual_mapper.map_to_visuals(
+                        emotional_arc=arc,
+                        power_dynamics=power,
+                        pacing=pacing
+                    )
 
-            # 3. Pacing (Heuristic)
-            pacing = self._calculate_pacing(content_text, duration)
-            
-            # 4. Power Dynamics (Placeholder / Simple Heuristic)
-            power = self._estimate_power(current_character, arc.primary_emotion)
-            
-            # 5. Visual Mapping
-            visuals = self.visual_mapper.map_to_visuals(
-                emotional_arc=arc, 
-                power_dynamics=power,
-                pacing=pacing
-            )
-            
             # 6. Construct Beat
-            beat = Beat(
-                beat_id=f"{job_id}-{beat_uid}",
-                beat_number=len(beats) + 1,
-                timestamp_start=round(start_time, 2),
-                timestamp_end=round(end_time, 2),
-                dialogue=[content_text] if element.element_type == ElementType.DIALOGUE else [],
-                action=[content_text] if element.element_type == ElementType.ACTION else [],
-                characters=[current_character] if (current_character and element.element_type == ElementType.DIALOGUE) else [],
-                emotional_arc=arc,
-                power_dynamics=power,
-                pacing=pacing,
-                visual_signals=visuals
-            )
+            with beat_timer.stage("schema"):
+                beat = Beat(
+                    beat_id=f"{job_id}-{beat_uid}",
+                    beat_number=len(beats) + 1,
+                    timestamp_start=round(plan.start, 2),
+                    timestamp_end=round(plan.end, 2),
+                    dialogue=[content_text] if plan.element_type == ElementType.DIALOGUE else [],
+                    action=[content_text] if plan.element_type == ElementType.ACTION else [],
+                    characters=[current_character] if (current_character and plan.element_type == ElementType.DIALOGUE) else [],
+                    emotional_arc=arc,
+                    power_dynamics=power,
+                    pacing=pacing,
+                    visual_signals=visuals
+                )
             beats.append(beat)
-            
-            # Reset character if action
-            if element.element_type == ElementType.ACTION:
-                current_character = None
+            timer.add("mapping", beat_timer.get("mapping"))
+            timer.add("schema", beat_timer.get("schema"))
+            beat_timings.append(BeatTimings(
+                beat_id=beat.beat_id,
+                inference_seconds=round(beat_inference_seconds, 6),
+                mapping_seconds=round(beat_timer.get("mapping"), 6),
+                schema_seconds=round(beat_timer.get("schema"), 6)
+            ))
 
         if not beats:
             return None
@@ -159,22 +341,43 @@ class AnalysisService:
             secondary_emotions=[],
             overall_intensity=avg_intensity
         )
-        visual_summary = self.visual_mapper.map_to_visuals(summary_arc)
-
-        return SceneIntentSchema(
-            analysis_id=job_id,
-            script_metadata=ScriptMetadata(
-                scene_number=str(scene.scene_number) if scene.scene_number else "0",
-                location=scene.location,
-                time_of_day=scene.time_of_day,
-                characters_present=list(set([c for b in beats for c in b.characters]))
-            ),
-            beats=beats,
-            scene_dominant_emotion=dominant_emotion_type,
-            scene_emotional_range=unique_emotions,
-            scene_intensity_average=avg_intensity,
-            scene_visual_summary=visual_summary
+        with timer.stage("mapping"), VISUAL_MAPPING_SECONDS.time():
+            visual_summary = self.visual_mapper.map_to_visuals(summary_arc)
+
+        with timer.stage("schema"):
+            result = SceneIntentSchema(
+                analysis_id=job_id,
+                script_metadata=ScriptMetadata(
+                    scene_number=str(scene.scene_number) if scene.scene_number else "0",
+                    location=scene.location,
+                    time_of_day=scene.time_of_day,
+                    characters_present=list(set([c for b in beats for c in b.characters]))
+                ),
+                beats=beats,
+                scene_dominant_emotion=dominant_emotion_type,
+                scene_emotional_range=unique_emotions,
+                scene_intensity_average=avg_intensity,
+                scene_visual_summary=visual_summary,
+                model_versions=pipeline_versions(tier)
+            )
+
+        total = timer.total
+        result.processing_time_seconds = round(total, 6)
+        result.timings = SceneTimings(
+            parse_seconds=round(timer.get("parse"), 6),
+            inference_seconds=round(timer.get("inference"), 6),
+            mapping_seconds=round(timer.get("mapping"), 6),
+            schema_seconds=round(timer.get("schema"), 6),
+            total_seconds=round(total, 6),
+            beats=beat_timings
         )
+        if total > settings.SLOW_SCENE_THRESHOLD_SECONDS:
+            logger.warning(
+                f"Slow scene {result.script_metadata.scene_number} in job {job_id}: {total:.3f}s "
+                f"(parse {timer.get('parse'):.3f}s, inference {timer.get('inference'):.3f}s, "
+                f"mapping {timer.get('mapping'):.3f}s, schema {timer.get('schema'):.3f}s, {len(beats)} beats)"
+            )
+        return result
 
     def _calculate_pacing(self, text: str, duration: float) -> PacingMetadata:
         """Estimate pacing metrics from text"""
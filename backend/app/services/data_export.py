@@ -0,0 +1,206 @@
+"""
+Data Export Service
+-------------------
+Beat-level exports of a completed analysis for scheduling and previz tools:
+
+    ndjson   one JSON object per beat, with its scene number and location
+    csv      shot list: one row per beat (camera, lighting, emotion)
+    parquet  beat columns (emotion, intensity, camera, lighting, palette)
+    arrow    the same columns as an Arrow IPC file
+
+Everything is produced from the stored result JSON as plain dicts, beat by
+beat, without validating it back into SceneIntentSchema. Text formats are
+yielded in chunks of EXPORT_BATCH_ROWS beats; columnar files are written one
+record batch of EXPORT_BATCH_ROWS beats at a time. pyarrow is optional and
+only needed for the columnar formats.
+"""
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# (column, type, root, path): type is string | int | float | list (of strings),
+# root is the scene or the beat the path is looked up in
+BEAT_COLUMNS: Sequence[Tuple[str, str, str, Tuple[str, ...]]] = (
+    ("scene_number", "string", "scene", ("script_metadata", "scene_number")),
+    ("location", "string", "scene", ("script_metadata", "location")),
+    ("time_of_day", "string", "scene", ("script_metadata", "time_of_day")),
+    ("beat_id", "string", "beat", ("beat_id",)),
+    ("beat_number", "int", "beat", ("beat_number",)),
+    ("timestamp_start", "float", "beat", ("timestamp_start",)),
+    ("timestamp_end", "float", "beat", ("timestamp_end",)),
+    ("characters", "list", "beat", ("characters",)),
+    ("emotion", "string", "beat", ("emotional_arc", "primary_emotion", "emotion")),
+    ("emotion_category", "string", "beat", ("emotional_arc", "primary_emotion", "category")),
+    ("emotion_confidence", "float", "beat", ("emotional_arc", "primary_emotion", "confidence")),
+    ("emotion_intensity", "int", "beat", ("emotional_arc", "primary_emotion", "intensity")),
+    ("overall_intensity", "int", "beat", ("emotional_arc", "overall_intensity")),
+    ("shot_size", "string", "beat", ("visual_signals", "camera", "shot_size")),
+    ("camera_movement", "string", "beat", ("visual_signals", "camera", "movement")),
+    ("vertical_angle", "string", "beat", ("visual_signals", "camera", "vertical_angle")),
+    ("horizontal_angle", "string", "beat", ("visual_signals", "camera", "horizontal_angle")),
+    ("focal_length_mm", "int", "beat", ("visual_signals", "camera", "focal_length_mm")),
+    ("depth_of_field", "string", "beat", ("visual_signals", "camera", "depth_of_field")),
+    ("lighting_quality", "int", "beat", ("visual_signals", "lighting", "quality")),
+    ("lighting_direction", "string", "beat", ("visual_signals", "lighting", "direction")),
+    ("lighting_temperature_kelvin", "int", "beat", ("visual_signals", "lighting", "temperature_kelvin")),
+    ("lighting_intensity", "string", "beat", ("visual_signals", "lighting", "intensity")),
+    ("contrast_ratio", "string", "beat", ("visual_signals", "lighting", "contrast_ratio")),
+    ("shadow_type", "string", "beat", ("visual_signals", "lighting", "shadow_type")),
+    ("lighting_technique", "string", "beat", ("visual_signals", "lighting", "technique")),
+    ("primary_colors", "list", "beat", ("visual_signals", "colors", "primary_colors")),
+    ("secondary_colors", "list", "beat", ("visual_signals", "colors", "secondary_colors")),
+    ("accent_colors", "list", "beat", ("visual_signals", "colors", "accent_colors")),
+    ("saturation", "int", "beat", ("visual_signals", "colors", "saturation")),
+    ("brightness", "int", "beat", ("visual_signals", "colors", "brightness")),
+    ("harmony_type", "string", "beat", ("visual_signals", "colors", "harmony_type")),
+)
+
+SHOT_LIST_COLUMNS = (
+    "scene_number", "location", "beat_number", "beat_id", "timestamp_start", "timestamp_end",
+    "characters", "emotion", "overall_intensity", "shot_size", "camera_movement", "vertical_angle",
+    "horizontal_angle", "focal_length_mm", "depth_of_field", "lighting_technique", "lighting_direction",
+    "lighting_temperature_kelvin", "primary_colors", "reasoning",
+)
+
+
+class FormatUnavailable(Exception):
+    """Export format whose optional dependency is not installed"""
+
+
+def load_scenes(result_json: str) -> List[Dict[str, Any]]:
+    """Scenes of a stored result: a single scene or {"scenes": [...]}."""
+    result = json.loads(result_json) if result_json else None
+    if not result:
+        return []
+    if isinstance(result, dict) and "scenes" in result:
+        return result.get("scenes") or []
+    return [result]
+
+
+def iter_beats(scenes: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """(scene, beat) pairs in script order."""
+    for scene in scenes:
+        for beat in scene.get("beats") or []:
+            yield scene, beat
+
+
+def _lookup(root: Any, path: Tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(root, dict):
+            return None
+        root = root.get(key)
+    return root
+
+
+def beat_record(scene: Dict[str, Any], beat: Dict[str, Any]) -> Dict[str, Any]:
+    """Flat BEAT_COLUMNS values of one beat; missing fields are None."""
+    roots = {"scene": scene, "beat": beat}
+    return {name: _lookup(roots[root], path) for name, _, root, path in BEAT_COLUMNS}
+
+
+def _batches(scenes: List[Dict[str, Any]], batch_rows: Optional[int]) -> Iterator[List[Tuple[Dict, Dict]]]:
+    size = max(1, batch_rows or settings.EXPORT_BATCH_ROWS)
+    batch: List[Tuple[Dict, Dict]] = []
+    for pair in iter_beats(scenes):
+        batch.append(pair)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_chunks(scenes: List[Dict[str, Any]], batch_rows: Optional[int] = None) -> Iterator[bytes]:
+    """One line per beat: the stored beat with its scene number and location first."""
+    for batch in _batches(scenes, batch_rows):
+        lines = []
+        for scene, beat in batch:
+            meta = scene.get("script_metadata") or {}
+            line = {"scene_number": meta.get("scene_number"), "location": meta.get("location"), **beat}
+            lines.append(json.dumps(line, separators=(",", ":")))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, list):
+        return "; ".join(str(v) for v in value)
+    return "" if value is None else value
+
+
+def csv_chunks(scenes: List[Dict[str, Any]], batch_rows: Optional[int] = None) -> Iterator[bytes]:
+    """Shot list CSV (SHOT_LIST_COLUMNS), header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SHOT_LIST_COLUMNS)
+    for batch in _batches(scenes, batch_rows):
+        for scene, beat in batch:
+            record = beat_record(scene, beat)
+            record["reasoning"] = _lookup(beat, ("visual_signals", "reasoning"))
+            writer.writerow([_csv_cell(record[name]) for name in SHOT_LIST_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def require_pyarrow():
+    """The pyarrow module, or FormatUnavailable when it is not installed."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise FormatUnavailable("Columnar exports require pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def beat_schema():
+    pa = require_pyarrow()
+    types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "list": pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind, _, _ in BEAT_COLUMNS])
+
+
+def _column_value(kind: str, value: Any) -> Any:
+    """Coerce a stored value to its column type (legacy results may hold other shapes)."""
+    if value is None:
+        return None
+    try:
+        if kind == "string":
+            return str(value)
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+        return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+    except (TypeError, ValueError):
+        return None
+
+
+def write_columnar(scenes: List[Dict[str, Any]], out: str, fmt: str, batch_rows: Optional[int] = None) -> int:
+    """
+    Write the beat columns to `out` as Parquet or an Arrow IPC file, one record
+    batch at a time. Returns the number of beats written.
+    """
+    pa = require_pyarrow()
+    schema = beat_schema()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(out, schema)
+    elif fmt == "arrow":
+        writer = pa.ipc.new_file(out, schema)
+    else:
+        raise ValueError(f"Not a columnar export format: {fmt}")
+
+    rows = 0
+    with writer:
+        for batch in _batches(scenes, batch_rows):
+            columns: Dict[str, List[Any]] = {name: [] for name, _, _, _ in BEAT_COLUMNS}
+            for scene, beat in batch:
+                roots = {"scene": scene, "beat": beat}
+                for name, kind, root, path in BEAT_COLUMNS:
+                    columns[name].append(_column_value(kind, _lookup(roots[root], path)))
+            writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+            rows += len(batch)
+    return rows
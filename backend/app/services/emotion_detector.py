@@ -5,10 +5,13 @@ Uses Hugging Face Transformers to detect emotions in text and map them to the
 MSI-VPE Scene Intent Schema (SIS) taxonomy.
 """
 
-from transformers import pipeline
 from typing import List, Dict, Optional, Tuple
 import logging
+import time
 from app.core.config import settings
+from app.core.ml import pipeline
+from app.core.metrics import INFERENCE_BATCH_SIZE, INFERENCE_BEAT_SECONDS, MODELS_LOADED, model_backend
+from app.services.inference_batcher import InferenceBatcher
 from app.schemas.sis_schema import (
     EmotionType, 
     EmotionCategory, 
@@ -56,6 +59,16 @@ class EmotionDetector:
         "neutral": None
     }
 
+    # Six-label emotion model used by the fast tier (EMOTION_MODEL_TERTIARY)
+    EMOTION6_MAP = {
+        "sadness": EmotionType.SADNESS,
+        "joy": EmotionType.JOY,
+        "love": EmotionType.PASSION,
+        "anger": EmotionType.ANGER,
+        "fear": EmotionType.FEAR,
+        "surprise": EmotionType.SURPRISE,
+    }
+
     # Taxonomy definitions for categorization
     PRIMARY_EMOTIONS = {
         EmotionType.JOY, EmotionType.SADNESS, EmotionType.ANGER, 
@@ -73,24 +86,48 @@ class EmotionDetector:
         EmotionType.DREAD, EmotionType.PASSION
     }
 
-    def __init__(self):
-        """Initialize the emotion detection pipeline"""
+    def __init__(self, model_name: Optional[str] = None, label_map: Optional[Dict[str, Optional[EmotionType]]] = None):
+        """Initialize the emotion detection pipeline (defaults: primary GoEmotions model)"""
         self.pipeline = None
+        self.model_name = model_name or settings.EMOTION_MODEL_PRIMARY
+        # Model label -> SIS emotion; labels mapped to None (e.g. neutral) are ignored
+        self.label_map = self.GOEMOTIONS_MAP if label_map is None else label_map
+        self.backend = "unknown"
+        self.batcher: Optional[InferenceBatcher] = None
         self._load_model()
+        if self.pipeline is not None and settings.INFERENCE_BATCHING_ENABLED:
+            self.batcher = InferenceBatcher(self._forward, model=self.model_name)
         
+    @classmethod
+    def for_tier(cls, tier: str) -> "EmotionDetector":
+        """
+        Detector for an analysis tier: "full" is the primary GoEmotions model,
+        "fast" the small six-label model for interactive previews.
+        """
+        if tier == "fast":
+            return cls(model_name=settings.EMOTION_MODEL_TERTIARY, label_map=cls.EMOTION6_MAP)
+        return cls()
+
+    @property
+    def available(self) -> bool:
+        """True when the model loaded (otherwise every text gets a neutral arc)"""
+        return self.pipeline is not None
+
     def _load_model(self):
-        """Load the primary emotion detection model"""
+        """Load the emotion detection model"""
         try:
-            logger.info(f"Loading emotion model: {settings.EMOTION_MODEL_PRIMARY}")
+            logger.info(f"Loading emotion model: {self.model_name}")
             # Use 'text-classification' pipeline with specific model
             # top_k=None ensures we get scores for all labels
             self.pipeline = pipeline(
                 "text-classification",
-                model=settings.EMOTION_MODEL_PRIMARY,
+                model=self.model_name,
                 top_k=None,
                 truncation=True,
                 max_length=settings.MAX_SEQUENCE_LENGTH
             )
+            self.backend = model_backend(self.pipeline)
+            MODELS_LOADED.labels(model=self.model_name, backend=self.backend).inc()
             logger.info("Emotion model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load emotion model: {str(e)}")
@@ -115,85 +152,137 @@ class EmotionDetector:
             return self._create_empty_arc()
 
         try:
-            # Run inference
-            results = self.pipeline(text)
+            # Run inference (pooled with concurrent requests when batching is enabled)
+            if self.batcher is not None:
+                results = self.batcher.infer([text])
+            else:
+                started = time.perf_counter()
+                results = self.pipeline(text)
+                self._record_inference(time.perf_counter() - started, 1)
             # Results is list of lists (one per input text), take first
-            model_outputs = results[0]
-            
-            # Map and aggregate scores
-            emotion_scores = {}
+            return self._build_arc(results[0])
+        except Exception as e:
+            logger.error(f"Error analyzing text: {str(e)}")
+            return self._create_empty_arc()
+
+    def analyze_batch(self, texts: List[str]) -> List[EmotionalArc]:
+        """
+        Analyze many texts with batched inference; results keep input order.
+        Texts are sorted by length before batching so each batch pads to similar lengths.
+        """
+        arcs: List[Optional[EmotionalArc]] = [None] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+
+        if self.pipeline and pending:
+            pending.sort(key=lambda i: len(texts[i]))
+            pending_texts = [texts[i] for i in pending]
+            try:
+                # A script's worth of beats already fills a batch; only small calls are pooled
+                if self.batcher is not None and len(pending) < self.batcher.max_batch_size:
+                    results = self.batcher.infer(pending_texts)
+                else:
+                    results = self._forward(pending_texts, settings.BATCH_SIZE)
+            except Exception as e:
+                logger.error(f"Error analyzing batch of {len(pending)} texts: {str(e)}")
+                results = []
+            for i, model_outputs in zip(pending, results):
+                try:
+                    arcs[i] = self._build_arc(model_outputs)
+                except Exception as e:
+                    logger.error(f"Error analyzing text: {str(e)}")
+
+        return [arc if arc is not None else self._create_empty_arc() for arc in arcs]
+
+    def _forward(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[Dict]]:
+        """
+        One pipeline call over `texts` (a single forward pass unless `batch_size`
+        splits it), recorded in the inference metrics.
+        """
+        started = time.perf_counter()
+        results = self.pipeline(texts, batch_size=batch_size or len(texts))
+        self._record_inference(time.perf_counter() - started, len(texts))
+        return results
+
+    def _record_inference(self, elapsed: float, beats: int) -> None:
+        """Export per-beat latency and call size, labelled by model and backend"""
+        labels = {"model": self.model_name, "backend": self.backend}
+        INFERENCE_BATCH_SIZE.labels(**labels).observe(beats)
+        per_beat = INFERENCE_BEAT_SECONDS.labels(**labels)
+        for _ in range(beats):
+            per_beat.observe(elapsed / beats)
+
+    def _build_arc(self, model_outputs: List[Dict]) -> EmotionalArc:
+        """Map raw classifier scores for one text onto an EmotionalArc"""
+        # Map and aggregate scores
+        emotion_scores = {}
+        
+        for output in model_outputs:
+            label = output['label']
+            score = output['score']
             
-            for output in model_outputs:
-                label = output['label']
-                score = output['score']
+            mapped_emotion = self.label_map.get(label)
+            if mapped_emotion:
+                # Sum scores if multiple labels map to same emotion
+                if mapped_emotion in emotion_scores:
+                    emotion_scores[mapped_emotion] += score
+                else:
+                    emotion_scores[mapped_emotion] = score
+
+        # Normalize scores if they summed > 1 (simple clamping or softmax if needed)
+        # For this purpose, just keeping them is fine as rough 'confidence'
+        
+        # Filter by threshold and create detections
+        detections = []
+        for emotion, score in emotion_scores.items():
+            if score >= settings.CONFIDENCE_THRESHOLD:
+                # Calculate intensity (0-100) based on score
+                # Score 0.3 -> 30 intensity? Or maybe non-linear scaling?
+                # Let's simple linear: score * 100, clamped at 100
+                intensity = int(min(score * 100, 100))
                 
-                mapped_emotion = self.GOEMOTIONS_MAP.get(label)
-                if mapped_emotion:
-                    # Sum scores if multiple labels map to same emotion
-                    if mapped_emotion in emotion_scores:
-                        emotion_scores[mapped_emotion] += score
-                    else:
-                        emotion_scores[mapped_emotion] = score
-
-            # Normalize scores if they summed > 1 (simple clamping or softmax if needed)
-            # For this purpose, just keeping them is fine as rough 'confidence'
-            
-            # Filter by threshold and create detections
-            detections = []
-            for emotion, score in emotion_scores.items():
-                if score >= settings.CONFIDENCE_THRESHOLD:
-                    # Calculate intensity (0-100) based on score
-                    # Score 0.3 -> 30 intensity? Or maybe non-linear scaling?
-                    # Let's simple linear: score * 100, clamped at 100
-                    intensity = int(min(score * 100, 100))
-                    
-                    # Clamp confidence to valid range [0.0, 1.0]
+                # Clamp confidence to valid range [0.0, 1.0]
+                clamped_confidence = min(score, 1.0)
+                
+                detections.append(EmotionDetection(
+                    emotion=emotion,
+                    category=self.get_emotion_category(emotion),
+                    confidence=clamped_confidence,
+                    intensity=intensity
+                ))
+        
+        # Sort by confidence
+        detections.sort(key=lambda x: x.confidence, reverse=True)
+        
+        if not detections:
+            # If nothing passed threshold, take top emotion anyway if it exists
+            if emotion_scores:
+                top_emotion = max(emotion_scores.items(), key=lambda x: x[1])
+                if top_emotion[0]: # If not mapped to None
+                    emotion, score = top_emotion
                     clamped_confidence = min(score, 1.0)
-                    
                     detections.append(EmotionDetection(
                         emotion=emotion,
                         category=self.get_emotion_category(emotion),
                         confidence=clamped_confidence,
-                        intensity=intensity
+                        intensity=int(min(score * 100, 100))
                     ))
-            
-            # Sort by confidence
-            detections.sort(key=lambda x: x.confidence, reverse=True)
-            
-            if not detections:
-                # If nothing passed threshold, take top emotion anyway if it exists
-                if emotion_scores:
-                    top_emotion = max(emotion_scores.items(), key=lambda x: x[1])
-                    if top_emotion[0]: # If not mapped to None
-                        emotion, score = top_emotion
-                        clamped_confidence = min(score, 1.0)
-                        detections.append(EmotionDetection(
-                            emotion=emotion,
-                            category=self.get_emotion_category(emotion),
-                            confidence=clamped_confidence,
-                            intensity=int(min(score * 100, 100))
-                        ))
-            
-            if not detections:
-                 return self._create_empty_arc()
-
-            # Construct EmotionalArc
-            primary = detections[0]
-            secondary = detections[1:]
-            
-            weighted_avg_intensity = sum(d.intensity * d.confidence for d in detections) / sum(d.confidence for d in detections)
-            
-            return EmotionalArc(
-                primary_emotion=primary,
-                secondary_emotions=secondary,
-                mixed_emotions=len(secondary) > 0,
-                emotional_shift=False, # Would need segment analysis to determine shift
-                overall_intensity=int(weighted_avg_intensity)
-            )
+        
+        if not detections:
+             return self._create_empty_arc()
 
-        except Exception as e:
-            logger.error(f"Error analyzing text: {str(e)}")
-            return self._create_empty_arc()
+        # Construct EmotionalArc
+        primary = detections[0]
+        secondary = detections[1:]
+        
+        weighted_avg_intensity = sum(d.intensity * d.confidence for d in detections) / sum(d.confidence for d in detections)
+        
+        return EmotionalArc(
+            primary_emotion=primary,
+            secondary_emotions=secondary,
+            mixed_emotions=len(secondary) > 0,
+            emotional_shift=False, # Would need segment analysis to determine shift
+            overall_intensity=int(weighted_avg_intensity)
+        )
 
     def _create_empty_arc(self) -> EmotionalArc:
         """Create a default neutral/empty emotional arc"""
@@ -0,0 +1,138 @@
+"""
+Cross-request Inference Batching
+--------------------------------
+Interactive `/analyze` calls arrive with a few beats each, and every model
+call pays a fixed cost (tokenizer setup, kernel launches, Python overhead)
+regardless of size. InferenceBatcher pools texts from concurrent callers:
+the first request opens a batch, which runs when it holds `max_batch_size`
+texts or `max_wait_ms` after that first request, whichever comes first. One
+forward pass serves the whole batch and each caller's future is resolved
+with its own slice of the outputs.
+
+Callers block in `infer()` from threadpool threads, so batching happens on a
+dedicated dispatcher thread; it is started lazily (and again after a fork,
+since threads don't survive one).
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import INFERENCE_BATCH_FILL, INFERENCE_QUEUE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class InferenceBatcher:
+    """Coalesces concurrent `infer()` calls into single `forward()` calls."""
+
+    def __init__(
+        self,
+        forward: Callable[[List[str]], List[Any]],
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        model: str = "emotion",
+    ):
+        self.forward = forward
+        self.max_batch_size = max(1, settings.INFERENCE_BATCH_MAX_SIZE if max_batch_size is None else max_batch_size)
+        self.max_wait_s = (settings.INFERENCE_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.model = model
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def infer(self, texts: List[str]) -> List[Any]:
+        """Model outputs for `texts`, in order; blocks until their batch has run."""
+        if not texts:
+            return []
+        return self.submit(texts).result()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue `texts` for the next batch; the future resolves to their outputs."""
+        self._ensure_started()
+        request = _Request(list(texts))
+        self._queue.put(request)
+        return request.future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Run what is already queued, then stop the dispatcher thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                # A queue inherited across fork may hold a lock taken by a thread that no longer exists
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._dispatch, name=f"inference-batcher-{self.model}", daemon=True
+                )
+                self._thread.start()
+
+    def _dispatch(self) -> None:
+        carry: Optional[_Request] = None
+        while True:
+            first = carry if carry is not None else self._queue.get()
+            carry = None
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.texts)
+            deadline = first.enqueued_at + self.max_wait_s
+            while size < self.max_batch_size:
+                try:
+                    remaining = deadline - time.monotonic()
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    # Stop after this batch; re-queue the marker for the outer loop
+                    self._queue.put(None)
+                    break
+                if size + len(request.texts) > self.max_batch_size:
+                    # Would overflow this batch; it opens the next one instead
+                    carry = request
+                    break
+                batch.append(request)
+                size += len(request.texts)
+            self._run(batch, size)
+
+    def _run(self, batch: List[_Request], size: int) -> None:
+        started = time.monotonic()
+        queue_wait = INFERENCE_QUEUE_SECONDS.labels(model=self.model)
+        for request in batch:
+            queue_wait.observe(started - request.enqueued_at)
+        INFERENCE_BATCH_FILL.labels(model=self.model).observe(min(1.0, size / self.max_batch_size))
+
+        texts = [text for request in batch for text in request.texts]
+        try:
+            outputs = self.forward(texts)
+        except Exception as exc:
+            logger.error(f"Batched inference of {len(texts)} texts failed: {exc}")
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        offset = 0
+        for request in batch:
+            request.future.set_result(outputs[offset:offset + len(request.texts)])
+            offset += len(request.texts)
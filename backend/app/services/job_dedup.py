@@ -0,0 +1,102 @@
+"""
+Submission Deduplication
+------------------------
+Identical submissions (same normalized script, options and pipeline versions)
+map to the same content hash. A completed job with that hash is reused, and a
+submission identical to one still running in this process waits on it instead
+of running the pipeline a second time. A job another worker is still running
+is reused only while it shows recent progress (JOB_DEDUP_PROCESSING_STALE_SECONDS):
+running jobs refresh updated_at on a heartbeat (JobWriteBatcher.heartbeat), so
+only a job orphaned by a crash or restart goes stale and stops capturing its
+resubmissions.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_, select
+
+from app.core.config import settings
+from app.models.job import AnalysisJob, JobStatus
+from app.services.analysis_service import pipeline_versions
+
+_TRAILING_WS = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def normalize_script_text(text: str) -> str:
+    """Canonical form of a script: NFC, LF line endings, no trailing whitespace or blank edges."""
+    text = unicodedata.normalize("NFC", text or "")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _TRAILING_WS.sub("", text)
+    return text.strip("\n")
+
+
+def submission_hash(script_text: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """SHA-256 over (normalized text, analysis options, model and knowledge base versions)."""
+    payload = json.dumps(
+        {
+            "script": normalize_script_text(script_text),
+            "options": options or {},
+            "versions": pipeline_versions(),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def reusable_job_query(content_hash: str, now: Optional[datetime] = None) -> Select:
+    """Newest job with this hash that a submission may reuse: completed, or processing and not stale."""
+    stale_before = (now or datetime.utcnow()) - timedelta(seconds=settings.JOB_DEDUP_PROCESSING_STALE_SECONDS)
+    return (
+        select(AnalysisJob)
+        .where(
+            AnalysisJob.content_hash == content_hash,
+            or_(
+                AnalysisJob.status == JobStatus.COMPLETED,
+                and_(AnalysisJob.status == JobStatus.PROCESSING, AnalysisJob.updated_at >= stale_before),
+            ),
+        )
+        .order_by(AnalysisJob.created_at.desc())
+    )
+
+
+class InFlightRegistry:
+    """
+    Tracks submissions currently being analyzed in this process, keyed by content hash.
+    Followers await the leader's future and receive the same response.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+    def claim(self, content_hash: str) -> Tuple[bool, "asyncio.Future[Any]"]:
+        """Return (is_leader, future). The leader must call `release()` when done."""
+        future = self._inflight.get(content_hash)
+        if future is not None and not future.done():
+            return False, future
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[content_hash] = future
+        return True, future
+
+    def release(self, content_hash: str, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        """Publish the leader's outcome to any followers and forget the hash."""
+        future = self._inflight.pop(content_hash, None)
+        if future is None or future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+            # Followers re-raise; don't warn if nobody was waiting
+            future.exception()
+        else:
+            future.set_result(result)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+inflight_registry = InFlightRegistry()
@@ -0,0 +1,192 @@
+"""
+Job Store
+---------
+Group-commit writer for `AnalysisJob` status and result updates.
+
+Writes that arrive within a short window (JOB_WRITE_BATCH_WINDOW_MS) are
+coalesced per job and applied in a single transaction, so concurrent
+requests share one commit instead of paying for one each.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import DB_WRITE_SECONDS, QUEUE_DEPTH
+from app.models.job import AnalysisJob
+
+logger = logging.getLogger(__name__)
+
+# (job_id, create, fields, future)
+_PendingWrite = Tuple[str, bool, Dict[str, Any], "asyncio.Future[None]"]
+
+
+class JobWriteBatcher:
+    """
+    Coalesces job writes and flushes them with one commit per batch.
+
+    `write()` resolves only once the commit carrying the change has landed,
+    so callers keep read-your-writes semantics. Batches are committed by a
+    task the batcher owns; callers await their own write through a shield,
+    so cancelling one caller neither stops the flush nor strands the rest.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        window_ms: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.window = (settings.JOB_WRITE_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000.0
+        self._pending: List[_PendingWrite] = []
+        self._committing: List[_PendingWrite] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self.commits = 0
+        self.writes = 0
+
+    async def write(self, job_id: str, create: bool = False, **fields: Any) -> None:
+        """Queue an insert (create=True) or update for a job and wait for its commit."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((job_id, create, fields, future))
+        QUEUE_DEPTH.labels(queue="job_writes").inc()
+
+        # The flush runs in a task of its own, so a cancelled caller can't strand the others
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._run_flush())
+
+        await asyncio.shield(future)
+
+    async def flush(self) -> None:
+        """Commit anything still queued (used at shutdown)."""
+        task = self._flush_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            await task
+        while self._pending:
+            batch, self._pending = self._pending, []
+            await self._commit(batch)
+
+    @asynccontextmanager
+    async def heartbeat(self, job_ids: Sequence[str], interval: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Refresh the jobs' updated_at every `interval` seconds while the block runs, so a
+        long job still counts as live for deduplication in other workers (a job whose
+        worker died stops beating and goes stale). Defaults to a third of
+        JOB_DEDUP_PROCESSING_STALE_SECONDS.
+        """
+        if interval is None:
+            interval = settings.JOB_DEDUP_PROCESSING_STALE_SECONDS / 3
+
+        async def beat() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                now = datetime.utcnow()
+                try:
+                    await asyncio.gather(*(self.write(job_id, updated_at=now) for job_id in job_ids))
+                except Exception as exc:
+                    logger.warning(f"Job heartbeat failed: {exc}")
+
+        task = asyncio.get_running_loop().create_task(beat())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    async def _run_flush(self) -> None:
+        try:
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while self._pending:
+                batch, self._pending = self._pending, []
+                await self._commit(batch)
+        finally:
+            # Cancelled or crashed mid-flush: fail every write still waiting on it
+            stranded, self._committing = self._committing, []
+            if self._pending:
+                QUEUE_DEPTH.labels(queue="job_writes").dec(len(self._pending))
+                stranded, self._pending = stranded + self._pending, []
+            self._resolve(stranded, RuntimeError("Job write flush was interrupted"))
+            for _, _, _, future in stranded:
+                if not future.cancelled():
+                    future.exception()  # callers may have gone; don't warn about it
+
+    async def _commit(self, batch: List[_PendingWrite]) -> None:
+        QUEUE_DEPTH.labels(queue="job_writes").dec(len(batch))
+        self._committing = batch
+        merged = self._merge(batch)
+        try:
+            await self._execute(merged)
+        except Exception as exc:
+            if len(merged) == 1:
+                self._resolve(batch, exc)
+                return
+            # One bad row must not fail unrelated jobs: retry individually
+            logger.warning(f"Batched job write failed ({exc}); retrying {len(merged)} jobs individually")
+            failed: Dict[str, Exception] = {}
+            for job_id, entry in merged.items():
+                try:
+                    await self._execute({job_id: entry})
+                except Exception as item_exc:
+                    failed[job_id] = item_exc
+            for job_id, _, _, future in batch:
+                if not future.done():
+                    if job_id in failed:
+                        future.set_exception(failed[job_id])
+                    else:
+                        future.set_result(None)
+            return
+        self._resolve(batch, None)
+
+    @staticmethod
+    def _merge(batch: List[_PendingWrite]) -> Dict[str, Dict[str, Any]]:
+        """Collapse several writes to the same job into a single statement."""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for job_id, create, fields, _ in batch:
+            entry = merged.setdefault(job_id, {"create": False, "fields": {}})
+            entry["create"] = entry["create"] or create
+            entry["fields"].update(fields)
+        return merged
+
+    async def _execute(self, merged: Dict[str, Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        async with self.session_factory() as session:
+            for job_id, entry in merged.items():
+                if entry["create"]:
+                    await session.execute(insert(AnalysisJob).values(id=job_id, **entry["fields"]))
+                elif entry["fields"]:
+                    await session.execute(
+                        update(AnalysisJob).where(AnalysisJob.id == job_id).values(**entry["fields"])
+                    )
+            await session.commit()
+        DB_WRITE_SECONDS.observe(time.perf_counter() - started)
+        self.commits += 1
+        self.writes += len(merged)
+
+    @staticmethod
+    def _resolve(batch: List[_PendingWrite], exc: Optional[Exception]) -> None:
+        for _, _, _, future in batch:
+            if future.done():
+                continue
+            if exc is None:
+                future.set_result(None)
+            else:
+                future.set_exception(exc)
+
+
+# Singleton access
+_job_writer: Optional[JobWriteBatcher] = None
+
+
+def get_job_writer() -> JobWriteBatcher:
+    """Get the process-wide job write batcher"""
+    global _job_writer
+    if _job_writer is None:
+        _job_writer = JobWriteBatcher()
+    return _job_writer
@@ -0,0 +1,175 @@
+"""
+PDF Report Cache
+----------------
+A completed job's result never changes, so its PDF only needs rendering
+once per (job, title, exporter, knowledge base, AI text model) combination.
+Rendered reports are stored as files named by a hash of that key; the key
+doubles as the report's strong ETag. Total size is bounded by
+PDF_CACHE_MAX_BYTES, evicting the least recently served reports first.
+Reports are served from files opened before they are returned, so evicting
+a report another request is downloading never cuts the download short.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+from app import __version__
+from app.core.config import settings
+from app.core.knowledge_base import knowledge_base_version
+from app.core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def report_versions() -> Dict[str, str]:
+    """Versions of everything besides the job result that shapes a PDF report."""
+    from app.services.ai_text_service import AI_TEXT_MODEL
+    from app.services.pdf_export import REPORT_VERSION
+
+    return {
+        "app": __version__,
+        "pdf_exporter": REPORT_VERSION,
+        "knowledge_base": knowledge_base_version(),
+        "ai_text_model": AI_TEXT_MODEL,
+    }
+
+
+class PDFCache:
+    """Rendered reports on disk, keyed by job and report versions."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory or settings.PDF_CACHE_DIR)
+        self.max_bytes = settings.PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        if self.max_bytes <= 0:
+            raise ValueError("PDF_CACHE_MAX_BYTES must be positive (set PDF_CACHE_ENABLED=false to disable the cache)")
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def key(self, job_id: str, title: str) -> str:
+        payload = json.dumps({"job": job_id, "title": title, "versions": report_versions()}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Path of a cached report, or None. Hits refresh the report's LRU position."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            CACHE_REQUESTS.labels(cache="pdf", result="miss").inc()
+            return None
+        CACHE_REQUESTS.labels(cache="pdf", result="hit").inc()
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Store a report atomically (readers never see a partial file)."""
+        tmp = self.temp_path()
+        try:
+            tmp.write_bytes(data)
+        except BaseException:
+            tmp.unlink()
+            raise
+        return self._commit(key, tmp)
+
+    def temp_path(self) -> Path:
+        """A new empty file in the cache directory to render into."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        return Path(tmp)
+
+    def _commit(self, key: str, tmp: Path) -> Path:
+        path = self.path(key)
+        os.replace(tmp, path)
+        self._evict(keep=path)
+        return path
+
+    def get_or_render(self, key: str, render: Callable[[str], bool]) -> Tuple[Path, bool]:
+        """
+        Cached report for `key`, rendering it at most once even under concurrent requests.
+        `render(path)` writes the report to `path` and returns whether it may be cached.
+        Returns (path, True) for a cached report, or (path, False) for a temporary file
+        holding a report that must not be cached; the caller deletes it once served.
+        """
+        path = self.get(key)
+        if path is not None:
+            return path, True
+        with self._lock_for(key):
+            if self.path(key).exists():
+                return self.path(key), True
+            tmp = self.temp_path()
+            try:
+                cacheable = render(str(tmp))
+            except BaseException:
+                tmp.unlink()
+                raise
+            if not cacheable:
+                return tmp, False
+            return self._commit(key, tmp), True
+
+    def open_or_render(self, key: str, render: Callable[[str], bool]) -> Tuple[BinaryIO, bool]:
+        """
+        get_or_render() with the report opened for reading. The open file stays readable
+        if a concurrent render evicts the report; one evicted between lookup and open is
+        rendered again. For an uncacheable report the caller deletes `file.name` once served.
+        """
+        for attempt in range(2):
+            path, cached = self.get_or_render(key, render)
+            try:
+                return open(path, "rb"), cached
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                logger.info(f"Cached report {path.name} was evicted before it could be opened; rendering again")
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            if len(self._locks) > 1024:
+                # Drop idle locks; one held elsewhere stays reachable through its holder
+                self._locks = {k: lock for k, lock in self._locks.items() if lock.locked()}
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _evict(self, keep: Optional[Path] = None) -> None:
+        """Drop the least recently served reports until within max_bytes, never `keep` (just stored)."""
+        entries = []
+        for path in self.directory.glob("*.pdf"):
+            if path == keep:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        if keep is not None:
+            try:
+                total += keep.stat().st_size
+            except FileNotFoundError:
+                pass
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+            logger.info(f"Evicted cached report {path.name}")
+
+
+_pdf_cache: Optional[PDFCache] = None
+
+
+def get_pdf_cache() -> PDFCache:
+    """Get the singleton PDF cache"""
+    global _pdf_cache
+    if _pdf_cache is None:
+        _pdf_cache = PDFCache()
+    return _pdf_cache
@@ -14,13 +14,22 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.pdfgen import canvas
 from datetime import datetime
 from io import BytesIO
+from itertools import chain
+from typing import Iterable, Iterator
 import logging
 
+from app.core.config import settings
+from app.core.metrics import PDF_GENERATION_SECONDS
+from app.services import report_rows
+
 logger = logging.getLogger(__name__)
 
+# Bump when report layout or content changes, so cached PDFs are re-rendered
+REPORT_VERSION = "3"
+
 try:
     # Lazy import to avoid circular deps if any
-    from app.services.ai_text_service import get_ai_text_service
+    from app.services.ai_text_service import TextBudget, get_ai_text_service
 except Exception as _e:
     get_ai_text_service = None
 
@@ -31,6 +40,57 @@ class PDFExporter:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self._setup_table_styles()
+        self._heading_frags = {}
+
+    def _setup_table_styles(self):
+        """Table styles and column widths, built once and shared by every table of a kind"""
+        self._table_styles = {
+            'summary': TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+            ]),
+            'shots': TableStyle([
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4)
+            ]),
+            'emotion': TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP')
+            ]),
+            'camera': TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f8f8')),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('GRID', (0, 0), (-1, -1), 0.25, colors.lightgrey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP')
+            ]),
+            'lighting': TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f8f8')),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+                ('GRID', (0, 0), (-1, -1), 0.25, colors.lightgrey)
+            ]),
+        }
+        self._col_widths = {
+            'summary': [2.5*inch, 3*inch],
+            'shots': [5.5*inch],
+            'emotion': [2*inch, 3.5*inch],
+            'camera': [1.5*inch, 4*inch],
+            'lighting': [1.5*inch, 4*inch],
+        }
 
     def _setup_custom_styles(self):
         """Create custom styles for the PDF"""
@@ -74,30 +134,121 @@ class PDFExporter:
         # Single scene shape
         return [analysis_result]
 
-    def generate_pdf(self, analysis_data: dict, script_filename: str) -> BytesIO:
+    def generate_pdf(self, analysis_data: dict, script_filename: str, budget=None) -> BytesIO:
         """
         Generate a PDF report from analysis data
         
         Args:
             analysis_data: The analysis result dictionary
             script_filename: Original screenplay filename
+            budget: TextBudget for the AI text; sections that fell back to
+                templates are recorded on it (a fresh one is used if omitted)
             
         Returns:
             BytesIO: PDF file in memory
         """
-        logger.info(f"Generating PDF for {script_filename}")
-        
         buffer = BytesIO()
+        self.write_pdf(analysis_data, script_filename, buffer, budget)
+        buffer.seek(0)
+        return buffer
+
+    @PDF_GENERATION_SECONDS.time()
+    def write_pdf(self, analysis_data: dict, script_filename: str, out, budget=None) -> None:
+        """
+        Write the PDF report to `out` (a path or a binary file object).
+        Rendering to a file keeps large reports out of memory: with PDF_STREAMING
+        the flowables are created as ReportLab lays out pages and dropped once drawn.
+        """
+        logger.info(f"Generating PDF for {script_filename}")
+
+        analysis_result = analysis_data.get('analysis_result', {})
+        scenes = self._normalize_scenes(analysis_result)
+        # All AI text is generated before layout starts
+        if budget is None and get_ai_text_service:
+            budget = TextBudget()
+        exec_text, scene_texts = self._ai_texts(scenes, script_filename, budget)
+        story = self._front_matter(analysis_data, scenes, script_filename, exec_text)
+        degraded = budget.degraded_sections if budget is not None else []
+        if degraded:
+            logger.warning(f"PDF for {script_filename} used template text for: {', '.join(degraded)}")
+            story.append(Spacer(1, 0.1*inch))
+            story.append(Paragraph(
+                f"<i>AI text was unavailable in time for {len(degraded)} section(s); "
+                f"template text is shown for: {self._section_list(degraded)}.</i>",
+                self.styles['Normal']
+            ))
+
+        min_scenes = settings.PDF_PARALLEL_MIN_SCENES
+        if settings.PDF_SECTION_WORKERS > 1 and min_scenes and len(scenes) >= min_scenes:
+            self._build_parallel(story, scenes, scene_texts, out)
+        else:
+            story.append(PageBreak())
+            self._build(chain(story, self._scenes_story(1, scenes, scene_texts)), out)
+
+        logger.info(f"PDF generated successfully for {script_filename}")
+
+    def _build(self, story: Iterable, out) -> None:
         doc = SimpleDocTemplate(
-            buffer,
+            out,
             pagesize=letter,
             rightMargin=0.75*inch,
             leftMargin=0.75*inch,
             topMargin=1*inch,
             bottomMargin=0.75*inch
         )
+        doc.build(_StreamedStory(story) if settings.PDF_STREAMING else list(story))
+
+    def _build_bytes(self, story: Iterable) -> bytes:
+        buffer = BytesIO()
+        self._build(story, buffer)
+        return buffer.getvalue()
+
+    def _build_parallel(self, front: list, scenes: list, scene_texts: list, out) -> None:
+        """Render runs of scenes as separate documents on the section pool and concatenate them."""
+        from app.services.render_pool import get_section_pool
+
+        size = -(-len(scenes) // settings.PDF_SECTION_WORKERS)
+        pool = get_section_pool()
+        futures = [
+            pool.submit(render_scene_section, start + 1, scenes[start:start + size], scene_texts[start:start + size])
+            for start in range(0, len(scenes), size)
+        ]
+        # The title page renders here while the sections render in the pool
+        parts = [self._build_bytes(front)] + [future.result() for future in futures]
+        merge_pdfs(parts, out)
+
+    @staticmethod
+    def _section_list(sections: list, limit: int = 8) -> str:
+        shown = ", ".join(sections[:limit])
+        return shown + (f" and {len(sections) - limit} more" if len(sections) > limit else "")
 
-        # Build PDF content
+    def _ai_texts(self, scenes: list, script_filename: str, budget=None) -> tuple:
+        """Executive summary and (overview, shot list) for every scene, within `budget`."""
+        exec_text = ""
+        scene_texts = [("", [])] * len(scenes)
+        if not get_ai_text_service:
+            return exec_text, scene_texts
+        try:
+            ai = get_ai_text_service()
+        except Exception as e:
+            logger.warning(f"AI text service unavailable: {e}")
+            return exec_text, scene_texts
+        try:
+            exec_text = ai.generate_executive_summary(
+                {"scenes": scenes}, script_filename, budget=budget
+            )
+        except Exception as e:
+            logger.warning(f"AI executive summary failed: {e}")
+        try:
+            overviews = ai.generate_scene_overviews(scenes, budget=budget)
+            shot_lists = ai.generate_shot_lists(scenes, count=5, budget=budget)
+            scene_texts = list(zip(overviews, shot_lists))
+        except Exception as e:
+            logger.warning(f"AI scene text failed: {e}")
+        return exec_text, scene_texts
+
+    def _front_matter(self, analysis_data: dict, scenes: list, script_filename: str, exec_text: str) -> list:
+        """Title page and executive summary."""
         story = []
         
         # Title page
@@ -120,8 +271,6 @@ class PDFExporter:
         story.append(Paragraph("<b>EXECUTIVE SUMMARY</b>", self.styles['Heading2']))
         story.append(Spacer(1, 0.1*inch))
         
-        analysis_result = analysis_data.get('analysis_result', {})
-        scenes = self._normalize_scenes(analysis_result)
         total_beats = sum(len(scene.get('beats', [])) for scene in scenes)
         
         summary_data = [
@@ -130,297 +279,149 @@ class PDFExporter:
             ['Analysis Status', analysis_data.get('status', 'completed').upper()]
         ]
         
-        summary_table = Table(summary_data, colWidths=[2.5*inch, 3*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-        ]))
+        summary_table = self._table(summary_data, 'summary')
         story.append(summary_table)
         # Optional: AI-generated executive narrative
-        if get_ai_text_service:
-            try:
-                ai = get_ai_text_service()
-                exec_text = ai.generate_executive_summary(
-                    {"scenes": scenes}, script_filename
-                )
-                if exec_text:
-                    story.append(Spacer(1, 0.2*inch))
-                    story.append(Paragraph("Director's Overview", self.styles['Heading3']))
-                    story.append(Paragraph(exec_text, self.styles['Normal']))
-            except Exception as e:
-                logger.warning(f"AI executive summary failed: {e}")
-
-        story.append(PageBreak())
-
-        # Scene-by-scene breakdown
-        for scene_idx, scene in enumerate(scenes, 1):
-            story.append(Paragraph(
-                f"SCENE {scene_idx}",
-                self.styles['SceneHeader']
-            ))
-            
-            scene_loc = scene.get('scene_location', 'UNKNOWN')
-            story.append(Paragraph(
-                f"<b>Location:</b> {scene_loc}",
-                self.styles['Normal']
-            ))
-            story.append(Spacer(1, 0.1*inch))
+        if exec_text:
+            story.append(Spacer(1, 0.2*inch))
+            story.append(Paragraph("Director's Overview", self.styles['Heading3']))
+            story.append(Paragraph(exec_text, self.styles['Normal']))
+        return story
 
-            # AI scene overview and shot list
-            if get_ai_text_service:
-                try:
-                    ai = get_ai_text_service()
-                    overview = ai.generate_scene_overview(scene, scene_idx)
-                    if overview:
-                        story.append(Paragraph("Scene Overview", self.styles['Heading3']))
-                        story.append(Paragraph(overview, self.styles['Normal']))
-                        story.append(Spacer(1, 0.1*inch))
-                    shots = ai.generate_shot_list(scene, count=5)
-                    if shots:
-                        story.append(Paragraph("Suggested Shot List", self.styles['Heading4']))
-                        # Render as a simple two-column table if long
-                        shot_rows = [[f"• {s}"] for s in shots]
-                        shot_table = Table(shot_rows, colWidths=[5.5*inch])
-                        shot_table.setStyle(TableStyle([
-                            ('FONTSIZE', (0, 0), (-1, -1), 9),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 4)
-                        ]))
-                        story.append(shot_table)
-                        story.append(Spacer(1, 0.1*inch))
-                except Exception as e:
-                    logger.warning(f"AI scene text failed: {e}")
-
-            # Process each beat
-            beats = scene.get('beats', [])
-            for beat_idx, beat in enumerate(beats, 1):
-                beat_elements = []
-                
-                # Get characters and emotional info for header
-                characters = beat.get('characters', [])
-                emotional_arc = beat.get('emotional_arc', {})
-                primary_raw = emotional_arc.get('primary_emotion', {})
-                if isinstance(primary_raw, dict):
-                    beat_emotion = primary_raw.get('emotion', 'neutral')
-                else:
-                    beat_emotion = str(primary_raw)
-                
-                # Beat header with character/emotion context
-                header_text = f"Beat {beat_idx}"
-                if characters:
-                    header_text += f" - {', '.join(characters)}"
-                header_text += f" ({beat_emotion.replace('_', ' ').title()})"
-                
-                beat_elements.append(Paragraph(
-                    header_text,
-                    self.styles['BeatHeader']
-                ))
-                
-                # Dialogue/Action content
-                dialogue_lines = beat.get('dialogue', [])
-                action_lines = beat.get('action', [])
-                characters = beat.get('characters', [])
-                
-                # Build content preview
-                content_parts = []
-                if action_lines:
-                    content_parts.extend([f"[{line}]" for line in action_lines])
-                if dialogue_lines:
-                    char_name = characters[0] if characters else "CHARACTER"
-                    content_parts.extend([f"{char_name}: {line}" for line in dialogue_lines])
-                
-                if content_parts:
-                    content = " ".join(content_parts)
-                    snippet = content[:200]
-                    if len(content) > 200:
-                        snippet += '...'
-                    beat_elements.append(Paragraph(
-                        f"<i>{snippet}</i>",
-                        self.styles['Normal']
-                    ))
-                    beat_elements.append(Spacer(1, 0.1*inch))
-
-                # Emotional analysis
-                emotional_arc = beat.get('emotional_arc', {})
-                if emotional_arc:
-                    primary_raw = emotional_arc.get('primary_emotion') or emotional_arc.get('emotion') or 'neutral'
-                    if isinstance(primary_raw, dict):
-                        primary_emotion = primary_raw.get('emotion', 'neutral')
-                        intensity_val = primary_raw.get('intensity', emotional_arc.get('overall_intensity', 0))
-                    else:
-                        primary_emotion = str(primary_raw)
-                        intensity_val = emotional_arc.get('overall_intensity', emotional_arc.get('intensity', 0))
-                    try:
-                        intensity = float(intensity_val)
-                    except Exception:
-                        intensity = 0.0
-                    
-                    emotion_data = [
-                        ['<b>Primary Emotion</b>', primary_emotion.title()],
-                        ['<b>Intensity</b>', f"{intensity:.2f}"]
-                    ]
-                    
-                    emotion_table = Table(emotion_data, colWidths=[2*inch, 3.5*inch])
-                    emotion_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
-                        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 9),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP')
-                    ]))
-                    beat_elements.append(emotion_table)
-                    beat_elements.append(Spacer(1, 0.1*inch))
-
-                # Visual recommendations (support both legacy visual_recommendations and visual_signals)
-                visual_recs = beat.get('visual_recommendations') or beat.get('visual_signals', {})
-                if visual_recs:
-                    beat_elements.append(Paragraph(
-                        "<b>CINEMATOGRAPHY RECOMMENDATIONS</b>",
-                        self.styles['Heading4']
-                    ))
-                    
-                    # Add reasoning first if available
-                    reasoning = visual_recs.get('reasoning', '')
-                    if reasoning:
-                        beat_elements.append(Paragraph(
-                            f"<i>{reasoning}</i>",
-                            self.styles['Normal']
-                        ))
-                        beat_elements.append(Spacer(1, 0.1*inch))
-                    
-                    # Camera work
-                    camera = visual_recs.get('camera', {})
-                    if camera:
-                        def _format_value(val):
-                            if isinstance(val, list):
-                                return ', '.join([str(v).replace('_', ' ').title() for v in val])
-                            if val is None or val == '':
-                                return 'N/A'
-                            return str(val).replace('_', ' ').title()
-                        
-                        shot_size = _format_value(camera.get('shot_size'))
-                        movement = _format_value(camera.get('movement'))
-                        vertical_angle = _format_value(camera.get('vertical_angle'))
-                        horizontal_angle = _format_value(camera.get('horizontal_angle'))
-                        focal_length = camera.get('focal_length_mm', '')
-                        depth = _format_value(camera.get('depth_of_field'))
-                        
-                        camera_data = [
-                            ['Shot Size', shot_size],
-                            ['Camera Movement', movement],
-                            ['Vertical Angle', vertical_angle],
-                            ['Horizontal Angle', horizontal_angle]
-                        ]
-                        if focal_length:
-                            camera_data.append(['Focal Length', f"{focal_length}mm"])
-                        if depth and depth != 'N/A':
-                            camera_data.append(['Depth of Field', depth])
-                        
-                        if camera_data:
-                            camera_table = Table(camera_data, colWidths=[1.5*inch, 4*inch])
-                            camera_table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f8f8')),
-                                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                                ('GRID', (0, 0), (-1, -1), 0.25, colors.lightgrey),
-                                ('VALIGN', (0, 0), (-1, -1), 'TOP')
-                            ]))
-                            beat_elements.append(camera_table)
-                            beat_elements.append(Spacer(1, 0.05*inch))
-                    
-                    # Lighting
-                    lighting = visual_recs.get('lighting', {})
-                    if lighting:
-                        def _format_light_val(val):
-                            if val is None or val == '':
-                                return 'N/A'
-                            return str(val).replace('_', ' ').title()
-                        
-                        quality = lighting.get('quality', 'N/A')
-                        if isinstance(quality, (int, float)):
-                            quality = f"{quality}% Hard" if quality > 50 else f"{100-quality}% Soft"
-                        direction = _format_light_val(lighting.get('direction'))
-                        temperature = lighting.get('temperature_kelvin', '')
-                        if temperature:
-                            temperature = f"{temperature}K"
-                        else:
-                            temperature = 'N/A'
-                        intensity = _format_light_val(lighting.get('intensity'))
-                        contrast = lighting.get('contrast_ratio', 'N/A')
-                        shadow_type = _format_light_val(lighting.get('shadow_type'))
-                        technique = _format_light_val(lighting.get('technique'))
-                        
-                        lighting_data = [
-                            ['Setup', quality],
-                            ['Direction', direction],
-                            ['Temperature', temperature],
-                            ['Intensity', intensity],
-                            ['Contrast Ratio', contrast],
-                            ['Shadow Type', shadow_type]
-                        ]
-                        if technique and technique != 'N/A':
-                            lighting_data.append(['Technique', technique])
-                        
-                        lighting_table = Table(lighting_data, colWidths=[1.5*inch, 4*inch])
-                        lighting_table.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f8f8')),
-                            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, -1), 8),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                            ('GRID', (0, 0), (-1, -1), 0.25, colors.lightgrey)
-                        ]))
-                        beat_elements.append(lighting_table)
-                        beat_elements.append(Spacer(1, 0.05*inch))
-                    
-                    # Color palette
-                    colors_obj = visual_recs.get('colors', {})
-                    if colors_obj:
-                        primary_colors = colors_obj.get('primary_colors', [])
-                        secondary_colors = colors_obj.get('secondary_colors', [])
-                        accent_colors = colors_obj.get('accent_colors', [])
-                        saturation = colors_obj.get('saturation', '')
-                        brightness = colors_obj.get('brightness', '')
-                        harmony = colors_obj.get('harmony_type', '')
-                        
-                        if primary_colors or secondary_colors or accent_colors:
-                            color_text = []
-                            if primary_colors:
-                                color_text.append(f"<b>Primary:</b> {', '.join(primary_colors)}")
-                            if secondary_colors:
-                                color_text.append(f"<b>Secondary:</b> {', '.join(secondary_colors)}")
-                            if accent_colors:
-                                color_text.append(f"<b>Accent:</b> {', '.join(accent_colors)}")
-                            if harmony:
-                                color_text.append(f"<b>Harmony:</b> {str(harmony).replace('_', ' ').title()}")
-                            if saturation or brightness:
-                                color_text.append(f"<b>Properties:</b> Saturation {saturation}%, Brightness {brightness}%")
-                            beat_elements.append(Paragraph(
-                                '<br/>'.join(color_text),
-                                self.styles['Normal']
-                            ))
-                
-                beat_elements.append(Spacer(1, 0.2*inch))
-                
-                # Keep beat elements together
-                story.append(KeepTogether(beat_elements))
-            
-            # Add page break between scenes
-            if scene_idx < len(scenes):
-                story.append(PageBreak())
+    def _scenes_story(self, first_idx: int, scenes: list, scene_texts: list) -> Iterator:
+        """Scene-by-scene breakdown, numbered from `first_idx`, with page breaks between scenes."""
+        for offset, (scene, (overview, shots)) in enumerate(zip(scenes, scene_texts)):
+            if offset:
+                yield PageBreak()
+            yield from self._scene_story(first_idx + offset, scene, overview, shots)
 
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
+    def _scene_story(self, scene_idx: int, scene: dict, overview: str, shots: list) -> list:
+        story = []
+        story.append(Paragraph(
+            f"SCENE {scene_idx}",
+            self.styles['SceneHeader']
+        ))
         
-        logger.info(f"PDF generated successfully for {script_filename}")
-        return buffer
+        scene_loc = scene.get('scene_location', 'UNKNOWN')
+        story.append(Paragraph(
+            f"<b>Location:</b> {scene_loc}",
+            self.styles['Normal']
+        ))
+        story.append(Spacer(1, 0.1*inch))
+
+        # AI scene overview and shot list
+        if overview:
+            story.append(self._heading("Scene Overview", 'Heading3'))
+            story.append(Paragraph(overview, self.styles['Normal']))
+            story.append(Spacer(1, 0.1*inch))
+        if shots:
+            story.append(self._heading("Suggested Shot List", 'Heading4'))
+            # Render as a simple two-column table if long
+            shot_rows = [[f"• {s}"] for s in shots]
+            shot_table = self._table(shot_rows, 'shots')
+            story.append(shot_table)
+            story.append(Spacer(1, 0.1*inch))
+
+        # Process each beat
+        for beat_idx, beat in enumerate(scene.get('beats', []), 1):
+            # Keep beat elements together
+            story.append(KeepTogether(self._beat_flowables(beat_idx, beat)))
+        return story
+
+    def _beat_flowables(self, beat_idx: int, beat: dict) -> list:
+        """One beat: header, content preview, emotion table and cinematography tables."""
+        beat_elements = [Paragraph(report_rows.beat_header(beat_idx, beat), self.styles['BeatHeader'])]
+
+        snippet = report_rows.beat_snippet(beat)
+        if snippet:
+            beat_elements.append(Paragraph(f"<i>{snippet}</i>", self.styles['Normal']))
+            beat_elements.append(Spacer(1, 0.1*inch))
+
+        emotional_arc = beat.get('emotional_arc', {})
+        if emotional_arc:
+            beat_elements.append(self._table(report_rows.emotion_rows(emotional_arc), 'emotion'))
+            beat_elements.append(Spacer(1, 0.1*inch))
+
+        # Visual recommendations (support both legacy visual_recommendations and visual_signals)
+        visual_recs = beat.get('visual_recommendations') or beat.get('visual_signals', {})
+        if visual_recs:
+            beat_elements.append(self._heading("<b>CINEMATOGRAPHY RECOMMENDATIONS</b>", 'Heading4'))
+
+            reasoning = visual_recs.get('reasoning', '')
+            if reasoning:
+                beat_elements.append(Paragraph(f"<i>{reasoning}</i>", self.styles['Normal']))
+                beat_elements.append(Spacer(1, 0.1*inch))
+
+            camera = visual_recs.get('camera', {})
+            if camera:
+                beat_elements.append(self._table(report_rows.camera_rows(camera), 'camera'))
+                beat_elements.append(Spacer(1, 0.05*inch))
+
+            lighting = visual_recs.get('lighting', {})
+            if lighting:
+                beat_elements.append(self._table(report_rows.lighting_rows(lighting), 'lighting'))
+                beat_elements.append(Spacer(1, 0.05*inch))
+
+            color_lines = report_rows.color_lines(visual_recs.get('colors') or {})
+            if color_lines:
+                beat_elements.append(Paragraph('<br/>'.join(color_lines), self.styles['Normal']))
+
+        beat_elements.append(Spacer(1, 0.2*inch))
+        return beat_elements
+
+    def _heading(self, text: str, style_name: str) -> Paragraph:
+        """Paragraph for fixed heading text, parsing its markup only on first use"""
+        frags = self._heading_frags.get((text, style_name))
+        if frags is None:
+            frags = self._heading_frags[(text, style_name)] = Paragraph(text, self.styles[style_name]).frags
+        # Layout may annotate fragments, so each paragraph gets its own copies
+        return Paragraph(text, self.styles[style_name], frags=[frag.clone() for frag in frags])
+
+    def _table(self, rows: list, kind: str) -> Table:
+        """Table of `rows` with the shared style and column widths of its kind."""
+        return Table(rows, colWidths=self._col_widths[kind], style=self._table_styles[kind])
+
+
+def render_scene_section(first_idx: int, scenes: list, scene_texts: list) -> bytes:
+    """Render a run of scenes as a standalone PDF (runs in a section pool worker)."""
+    exporter = get_pdf_exporter()
+    return exporter._build_bytes(exporter._scenes_story(first_idx, scenes, scene_texts))
+
+
+def merge_pdfs(parts: list, out) -> None:
+    """Concatenate PDF documents page by page into `out` (a path or a binary file object)."""
+    from PyPDF2 import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        for page in PdfReader(BytesIO(part)).pages:
+            writer.add_page(page)
+    writer.write(out)
+
+
+class _StreamedStory(list):
+    """
+    Flowable list for doc.build that pulls from an iterator as ReportLab consumes it.
+    build() loops on len(flowables) and deletes each flowable once drawn, so only a
+    window of upcoming flowables exists at a time instead of the whole report.
+    """
+
+    def __init__(self, flowables: Iterable, window: int = 64):
+        super().__init__()
+        self._source = iter(flowables)
+        self._window = window
+        self._refill()
+
+    def _refill(self) -> None:
+        while list.__len__(self) < self._window:
+            item = next(self._source, None)
+            if item is None:
+                break
+            self.append(item)
+
+    def __len__(self) -> int:
+        self._refill()
+        return list.__len__(self)
 
 
 # Singleton instance
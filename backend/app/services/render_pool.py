@@ -0,0 +1,59 @@
+"""
+Worker pools for PDF rendering.
+
+Reports render on their own bounded thread pool, so slow exports neither
+block the event loop nor take every thread of the shared request
+threadpool. Long scripts additionally split their scene sections across a
+process pool (ReportLab layout is pure Python and holds the GIL); workers
+are spawned rather than forked, so they start clean of the server's threads
+and model weights and only import the exporter.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_render_pool: Optional[ThreadPoolExecutor] = None
+_section_pool: Optional[ProcessPoolExecutor] = None
+_pools_lock = threading.Lock()
+
+
+def get_render_pool() -> ThreadPoolExecutor:
+    """Thread pool that whole reports render on (PDF_RENDER_WORKERS threads)."""
+    global _render_pool
+    with _pools_lock:
+        if _render_pool is None:
+            _render_pool = ThreadPoolExecutor(
+                max_workers=max(1, settings.PDF_RENDER_WORKERS), thread_name_prefix="pdf-render"
+            )
+        return _render_pool
+
+
+def get_section_pool() -> ProcessPoolExecutor:
+    """Process pool that scene sections of long reports render on (PDF_SECTION_WORKERS processes)."""
+    global _section_pool
+    with _pools_lock:
+        if _section_pool is None:
+            _section_pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.PDF_SECTION_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started {settings.PDF_SECTION_WORKERS} PDF section workers")
+        return _section_pool
+
+
+def shutdown_render_pools() -> None:
+    """Stop both pools (waiting for reports in progress); they restart on next use."""
+    global _render_pool, _section_pool
+    with _pools_lock:
+        render_pool, section_pool = _render_pool, _section_pool
+        _render_pool = _section_pool = None
+    if render_pool is not None:
+        render_pool.shutdown(wait=True)
+    if section_pool is not None:
+        section_pool.shutdown(wait=True)
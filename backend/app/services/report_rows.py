@@ -0,0 +1,132 @@
+"""
+Report row transforms: beat data to the text rows of the PDF report's tables.
+
+Pure functions over the stored analysis JSON (both the current
+visual_signals shape and legacy visual_recommendations), with no ReportLab
+objects, so the per-beat work in PDFExporter is plain data shaping and the
+table styling is shared.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+Rows = List[List[str]]
+
+
+def title_case(val: Any) -> str:
+    """Enum-ish value for display: 'close_up' -> 'Close Up'; empty -> 'N/A'."""
+    if val is None or val == '':
+        return 'N/A'
+    return str(val).replace('_', ' ').title()
+
+
+def format_value(val: Any) -> str:
+    """title_case, joining lists with commas."""
+    if isinstance(val, list):
+        return ', '.join([str(v).replace('_', ' ').title() for v in val])
+    return title_case(val)
+
+
+def _primary(arc: Dict[str, Any]) -> Tuple[str, Any]:
+    """Primary emotion name and raw intensity of an emotional arc."""
+    primary_raw = arc.get('primary_emotion') or arc.get('emotion') or 'neutral'
+    if isinstance(primary_raw, dict):
+        return primary_raw.get('emotion', 'neutral'), primary_raw.get('intensity', arc.get('overall_intensity', 0))
+    return str(primary_raw), arc.get('overall_intensity', arc.get('intensity', 0))
+
+
+def beat_header(beat_idx: int, beat: Dict[str, Any]) -> str:
+    """'Beat 3 - ANNA, JOHN (Quiet Despair)'"""
+    characters = beat.get('characters', [])
+    primary_raw = (beat.get('emotional_arc') or {}).get('primary_emotion', {})
+    if isinstance(primary_raw, dict):
+        beat_emotion = primary_raw.get('emotion', 'neutral')
+    else:
+        beat_emotion = str(primary_raw)
+    header_text = f"Beat {beat_idx}"
+    if characters:
+        header_text += f" - {', '.join(characters)}"
+    return header_text + f" ({beat_emotion.replace('_', ' ').title()})"
+
+
+def beat_snippet(beat: Dict[str, Any], limit: int = 200) -> Optional[str]:
+    """Action and dialogue preview, truncated to `limit` characters."""
+    content_parts = [f"[{line}]" for line in beat.get('action', []) or []]
+    dialogue_lines = beat.get('dialogue', [])
+    if dialogue_lines:
+        characters = beat.get('characters', [])
+        char_name = characters[0] if characters else "CHARACTER"
+        content_parts.extend([f"{char_name}: {line}" for line in dialogue_lines])
+    if not content_parts:
+        return None
+    content = " ".join(content_parts)
+    return content[:limit] + ('...' if len(content) > limit else '')
+
+
+def emotion_rows(arc: Dict[str, Any]) -> Rows:
+    primary_emotion, intensity_val = _primary(arc)
+    try:
+        intensity = float(intensity_val)
+    except Exception:
+        intensity = 0.0
+    return [
+        ['<b>Primary Emotion</b>', primary_emotion.title()],
+        ['<b>Intensity</b>', f"{intensity:.2f}"]
+    ]
+
+
+def camera_rows(camera: Dict[str, Any]) -> Rows:
+    rows = [
+        ['Shot Size', format_value(camera.get('shot_size'))],
+        ['Camera Movement', format_value(camera.get('movement'))],
+        ['Vertical Angle', format_value(camera.get('vertical_angle'))],
+        ['Horizontal Angle', format_value(camera.get('horizontal_angle'))]
+    ]
+    focal_length = camera.get('focal_length_mm', '')
+    if focal_length:
+        rows.append(['Focal Length', f"{focal_length}mm"])
+    depth = format_value(camera.get('depth_of_field'))
+    if depth and depth != 'N/A':
+        rows.append(['Depth of Field', depth])
+    return rows
+
+
+def lighting_rows(lighting: Dict[str, Any]) -> Rows:
+    quality = lighting.get('quality', 'N/A')
+    if isinstance(quality, (int, float)):
+        quality = f"{quality}% Hard" if quality > 50 else f"{100-quality}% Soft"
+    temperature = lighting.get('temperature_kelvin', '')
+    rows = [
+        ['Setup', quality],
+        ['Direction', title_case(lighting.get('direction'))],
+        ['Temperature', f"{temperature}K" if temperature else 'N/A'],
+        ['Intensity', title_case(lighting.get('intensity'))],
+        ['Contrast Ratio', lighting.get('contrast_ratio', 'N/A')],
+        ['Shadow Type', title_case(lighting.get('shadow_type'))]
+    ]
+    technique = title_case(lighting.get('technique'))
+    if technique and technique != 'N/A':
+        rows.append(['Technique', technique])
+    return rows
+
+
+def color_lines(colors_obj: Dict[str, Any]) -> List[str]:
+    """Palette lines (paragraph markup), or none when the beat has no palette."""
+    primary_colors = colors_obj.get('primary_colors', [])
+    secondary_colors = colors_obj.get('secondary_colors', [])
+    accent_colors = colors_obj.get('accent_colors', [])
+    if not (primary_colors or secondary_colors or accent_colors):
+        return []
+    saturation = colors_obj.get('saturation', '')
+    brightness = colors_obj.get('brightness', '')
+    harmony = colors_obj.get('harmony_type', '')
+    lines = []
+    if primary_colors:
+        lines.append(f"<b>Primary:</b> {', '.join(primary_colors)}")
+    if secondary_colors:
+        lines.append(f"<b>Secondary:</b> {', '.join(secondary_colors)}")
+    if accent_colors:
+        lines.append(f"<b>Accent:</b> {', '.join(accent_colors)}")
+    if harmony:
+        lines.append(f"<b>Harmony:</b> {str(harmony).replace('_', ' ').title()}")
+    if saturation or brightness:
+        lines.append(f"<b>Properties:</b> Saturation {saturation}%, Brightness {brightness}%")
+    return lines
@@ -0,0 +1,116 @@
+"""
+Result Projection
+-----------------
+Sparse job results: a subset of a stored SceneIntentSchema, selected by
+dotted field paths and cut out of the stored JSON as plain dicts, so the
+result is never validated back into Pydantic models.
+
+Paths descend through lists, so "beats.emotional_arc.overall_intensity"
+keeps that field of every beat. A path naming an object keeps all of it.
+Paths are checked against the schema classes (not instances), so a typo is
+an error rather than an empty result.
+
+Views are named field sets:
+    summary   scene metadata, dominant emotion, intensity and visual summary; no beats
+    timeline  per beat: number, timestamps, primary emotion and intensity
+    full      everything (the default)
+"""
+import typing
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.schemas.sis_schema import SceneIntentSchema
+
+Path = Tuple[str, ...]
+
+VIEWS: Dict[str, Tuple[str, ...]] = {
+    "summary": (
+        "analysis_id", "schema_version", "generated_at", "script_metadata", "scene_dominant_emotion",
+        "scene_emotional_range", "scene_intensity_average", "scene_visual_summary", "processing_time_seconds",
+        "warnings",
+    ),
+    "timeline": (
+        "analysis_id", "script_metadata.scene_number",
+        "beats.beat_id", "beats.beat_number", "beats.timestamp_start", "beats.timestamp_end",
+        "beats.emotional_arc.primary_emotion.emotion", "beats.emotional_arc.primary_emotion.intensity",
+        "beats.emotional_arc.overall_intensity",
+    ),
+    "full": (),
+}
+
+
+class UnknownField(ValueError):
+    """A requested field path that SceneIntentSchema does not have"""
+
+
+def _model_in(annotation: Any) -> Optional[type]:
+    """The Pydantic model inside Optional[...] / List[...] annotations, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        model = _model_in(arg)
+        if model is not None:
+            return model
+    return None
+
+
+@lru_cache(maxsize=512)
+def _check_path(path: Path) -> None:
+    model: Optional[type] = SceneIntentSchema
+    for depth, name in enumerate(path):
+        if model is None:
+            # Below a free-form value (e.g. Dict[str, Any]): nothing to check against
+            return
+        field = model.model_fields.get(name)
+        if field is None:
+            raise UnknownField(f"Unknown field: {'.'.join(path[:depth + 1])}")
+        model = _model_in(field.annotation)
+
+
+def parse_fields(fields: Optional[str], view: Optional[str] = None) -> List[Path]:
+    """
+    Field paths for a `fields=` list and/or a view; an empty list means the
+    full result. Raises UnknownField for paths the schema does not have.
+    """
+    names = list(VIEWS.get(view or "full", ()))
+    if fields:
+        names.extend(name.strip() for name in fields.split(",") if name.strip())
+    paths: List[Path] = []
+    for name in names:
+        path = tuple(part for part in name.split(".") if part)
+        if path and path not in paths:
+            _check_path(path)
+            paths.append(path)
+    return paths
+
+
+def _tree(paths: Iterable[Path]) -> Dict[str, Any]:
+    """{"beats": {"beat_number": {}}} for ["beats.beat_number"]; an empty subtree keeps the whole value."""
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        for depth, name in enumerate(path):
+            if name in node and not node[name]:
+                break  # an ancestor is already kept whole
+            if depth == len(path) - 1:
+                node[name] = {}
+            else:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def _apply(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_apply(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {name: _apply(value[name], subtree) for name, subtree in tree.items() if name in value}
+    return value
+
+
+def project(result: Dict[str, Any], paths: List[Path]) -> Dict[str, Any]:
+    """The parts of a stored result named by `paths` (all of it when `paths` is empty)."""
+    return _apply(result, _tree(paths)) if paths else result
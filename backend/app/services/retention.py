@@ -0,0 +1,216 @@
+"""
+Job Retention
+-------------
+Background sweeper that keeps the job table bounded:
+
+1. TTL: finished jobs (completed, failed or expired) older than
+   JOB_TTL_SECONDS are deleted outright. Pending and running jobs are never
+   deleted under their worker, however long they take.
+2. Budget: when stored result payloads exceed JOB_RESULT_MAX_TOTAL_BYTES the
+   least recently accessed payloads are dropped and their jobs marked EXPIRED.
+   Candidates are read in (status, last_accessed_at) index order, a bounded
+   batch at a time, so a sweep never sorts the whole table.
+3. Incremental VACUUM returns freed pages to the filesystem.
+
+With several workers on one database, only the one holding the sweeper's
+file lock sweeps; the others retry the lock every interval, so another
+worker takes over if it exits.
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func, select, text, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.locks import FileLock
+from app.core.metrics import (
+    JOB_RESULT_BYTES,
+    JOBS_TOTAL,
+    RETENTION_BYTES_RECLAIMED,
+    RETENTION_ROWS_RECLAIMED,
+    RETENTION_SWEEPS,
+)
+from app.models.job import AnalysisJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+EVICTED_MESSAGE = "Result evicted by the storage retention policy; resubmit the script to regenerate it"
+
+# Statuses a job never leaves; only these are subject to the TTL
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.EXPIRED)
+
+# Evict down to this fraction of the budget so sweeps don't thrash at the limit
+BUDGET_LOW_WATER = 0.9
+# Eviction candidates fetched per query
+EVICTION_BATCH_ROWS = 500
+
+
+@dataclass
+class SweepResult:
+    """What a single sweep reclaimed"""
+    rows_deleted: int = 0
+    bytes_deleted: int = 0
+    payloads_evicted: int = 0
+    bytes_evicted: int = 0
+    bytes_vacuumed: int = 0
+    stored_bytes: int = 0
+
+
+class RetentionSweeper:
+    """Periodically expires old jobs and enforces the result storage budget."""
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        ttl_seconds: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        interval_seconds: Optional[int] = None,
+        vacuum_pages: Optional[int] = None,
+        lock_path: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.ttl_seconds = settings.JOB_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_total_bytes = settings.JOB_RESULT_MAX_TOTAL_BYTES if max_total_bytes is None else max_total_bytes
+        self.interval_seconds = (
+            settings.JOB_RETENTION_SWEEP_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        )
+        self.vacuum_pages = settings.JOB_RETENTION_VACUUM_PAGES if vacuum_pages is None else vacuum_pages
+        # Shared with the other workers' sweepers; None sweeps unconditionally
+        self.lock = FileLock(lock_path) if lock_path else None
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep_once(self, now: Optional[datetime] = None) -> SweepResult:
+        """Run one TTL + budget + vacuum pass."""
+        now = now or datetime.utcnow()
+        result = SweepResult()
+
+        async with self.session_factory() as session:
+            # 1. TTL expiry
+            cutoff = now - timedelta(seconds=self.ttl_seconds)
+            expired = (AnalysisJob.created_at < cutoff) & AnalysisJob.status.in_(TERMINAL_STATUSES)
+            count, size = (await session.execute(
+                select(func.count(), func.coalesce(func.sum(AnalysisJob.result_bytes), 0)).where(expired)
+            )).one()
+            if count:
+                await session.execute(delete(AnalysisJob).where(expired))
+                result.rows_deleted, result.bytes_deleted = count, size
+
+            # 2. Storage budget, least recently accessed first
+            stored = (await session.execute(
+                select(func.coalesce(func.sum(AnalysisJob.result_bytes), 0))
+            )).scalar()
+            if self.max_total_bytes and stored > self.max_total_bytes:
+                # Rows from before last_accessed_at was set at creation count as accessed when created
+                await session.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.last_accessed_at.is_(None))
+                    .values(last_accessed_at=AnalysisJob.created_at)
+                )
+                target = int(self.max_total_bytes * BUDGET_LOW_WATER)
+                while stored > target:
+                    # Evicted rows leave the COMPLETED range, so each batch starts at the new oldest
+                    candidates = (await session.execute(
+                        select(AnalysisJob.id, AnalysisJob.result_bytes)
+                        .where(AnalysisJob.status == JobStatus.COMPLETED, AnalysisJob.result_json.is_not(None))
+                        .order_by(AnalysisJob.last_accessed_at)
+                        .limit(EVICTION_BATCH_ROWS)
+                    )).all()
+                    victims = []
+                    for job_id, size in candidates:
+                        if stored <= target:
+                            break
+                        victims.append(job_id)
+                        stored -= size
+                        result.bytes_evicted += size
+                    if not victims:
+                        break
+                    await session.execute(
+                        update(AnalysisJob)
+                        .where(AnalysisJob.id.in_(victims))
+                        .values(
+                            result_json=None,
+                            result_bytes=0,
+                            status=JobStatus.EXPIRED,
+                            error_message=EVICTED_MESSAGE,
+                        )
+                    )
+                    result.payloads_evicted += len(victims)
+                    if len(candidates) < EVICTION_BATCH_ROWS:
+                        break
+            result.stored_bytes = stored
+            await session.commit()
+
+            # 3. Incremental vacuum (SQLite only; no-op when the freelist is empty)
+            if self.vacuum_pages and session.get_bind().dialect.name == "sqlite":
+                result.bytes_vacuumed = await self._incremental_vacuum(session)
+
+        self._record(result)
+        return result
+
+    async def _incremental_vacuum(self, session) -> int:
+        page_size = (await session.execute(text("PRAGMA page_size"))).scalar() or 0
+        before = (await session.execute(text("PRAGMA freelist_count"))).scalar() or 0
+        if not before:
+            return 0
+        # sqlite3 steps this pragma only once per execute() (one page); executescript runs it to completion
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});")
+        after = (await session.execute(text("PRAGMA freelist_count"))).scalar() or 0
+        return max(0, before - after) * page_size
+
+    def _record(self, result: SweepResult) -> None:
+        RETENTION_SWEEPS.inc()
+        JOBS_TOTAL.labels(status=JobStatus.EXPIRED.value).inc(result.payloads_evicted)
+        RETENTION_ROWS_RECLAIMED.labels(reason="ttl").inc(result.rows_deleted)
+        RETENTION_ROWS_RECLAIMED.labels(reason="budget").inc(result.payloads_evicted)
+        RETENTION_BYTES_RECLAIMED.labels(reason="ttl").inc(result.bytes_deleted)
+        RETENTION_BYTES_RECLAIMED.labels(reason="budget").inc(result.bytes_evicted)
+        RETENTION_BYTES_RECLAIMED.labels(reason="vacuum").inc(result.bytes_vacuumed)
+        JOB_RESULT_BYTES.set(result.stored_bytes)
+        if result.rows_deleted or result.payloads_evicted or result.bytes_vacuumed:
+            logger.info(
+                f"Retention sweep: deleted {result.rows_deleted} jobs ({result.bytes_deleted} bytes), "
+                f"evicted {result.payloads_evicted} payloads ({result.bytes_evicted} bytes), "
+                f"vacuumed {result.bytes_vacuumed} bytes; {result.stored_bytes} bytes stored"
+            )
+
+    def _should_sweep(self) -> bool:
+        """True in the one worker holding the sweeper lock (taking it if free)."""
+        if self.lock is None or self.lock.held:
+            return True
+        if self.lock.acquire(blocking=False):
+            logger.info(f"Retention sweeper active in this worker (pid {os.getpid()})")
+            return True
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._should_sweep():
+                    await self.sweep_once()
+            except Exception as exc:
+                logger.warning(f"Retention sweep failed: {exc}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the periodic sweep on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic sweep."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.lock is not None:
+            self.lock.release()
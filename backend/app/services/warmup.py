@@ -0,0 +1,113 @@
+"""
+Model Warm-up
+-------------
+Loads models in the background after startup so the server starts answering
+(liveness) immediately while readiness waits for the models. Each step runs
+in the threadpool, since loading a model and running a first forward pass
+block for seconds.
+
+Readiness always means the models are loaded: with warm-up disabled,
+/ready reports 503 until something else (the first analysis) loads them.
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Tuple[str, Callable[[], object]]
+
+
+class ModelWarmup:
+    """
+    Runs warm-up steps once, in order, and reports progress for /ready.
+
+    status: "disabled" (never started), "warming", "ready" or "failed"
+    """
+
+    def __init__(
+        self,
+        steps: Optional[List[WarmupStep]] = None,
+        models_loaded: Optional[Callable[[], bool]] = None,
+    ):
+        self.steps = steps or []
+        # Whether the models are loaded without warm-up; consulted while it is disabled
+        self.models_loaded = models_loaded
+        self.status = "disabled"
+        self.error: Optional[str] = None
+        self.seconds: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished or, with warm-up disabled, once the models have loaded"""
+        if self.status == "disabled":
+            return self.models_loaded is not None and self.models_loaded()
+        return self.status == "ready"
+
+    async def run(self) -> None:
+        """Run every step; stop at the first failure."""
+        self.status = "warming"
+        self.error = None
+        for name, step in self.steps:
+            started = time.perf_counter()
+            try:
+                await run_in_threadpool(step)
+            except Exception as exc:
+                self.status = "failed"
+                self.error = f"{name}: {exc}"
+                logger.warning(f"AI warm-up failed at {name}: {exc}")
+                return
+            self.seconds[name] = round(time.perf_counter() - started, 3)
+            logger.info(f"Warmed {name} in {self.seconds[name]:.2f}s")
+        self.status = "ready"
+
+    def start(self) -> None:
+        """Start warm-up on the running event loop without waiting for it."""
+        if self._task is None:
+            self.status = "warming"
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel warm-up if it is still running (the current step finishes in its thread)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def describe(self) -> Dict[str, object]:
+        return {"status": self.status, "ready": self.ready, "error": self.error, "seconds": dict(self.seconds)}
+
+
+def _warm_emotion_detector() -> None:
+    from app.api.endpoints.analysis import get_analysis_service
+
+    detector = get_analysis_service().emotion_detector
+    if not detector.available:
+        # The detector falls back to neutral arcs; that is not a loaded model
+        raise RuntimeError(f"emotion model {detector.model_name} did not load")
+    detector.analyze_text("Warm up")
+
+
+def default_warmup_steps() -> List[WarmupStep]:
+    """Load the shared emotion detector (with one inference) and the AI text models."""
+    from app.services.ai_text_service import get_ai_text_service
+
+    return [
+        ("emotion_detector", _warm_emotion_detector),
+        ("ai_text", get_ai_text_service),
+    ]
+
+
+def emotion_model_loaded() -> bool:
+    """True when the shared emotion detector exists and its model loaded (never loads it)."""
+    from app.api.endpoints.analysis import analysis_service_if_loaded
+
+    service = analysis_service_if_loaded()
+    return service is not None and service.emotion_detector.available
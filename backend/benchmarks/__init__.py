@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the MSI-VPE backend.
+
+Run from the backend directory, e.g. `python -m benchmarks.bench_db_concurrency`.
+Benchmarks use fake models so they run offline.
+"""
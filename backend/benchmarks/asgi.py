@@ -0,0 +1,62 @@
+"""
+Drive an ASGI app directly, without an HTTP client, to measure per-request
+framework and middleware overhead with as little harness noise as possible.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+async def call(
+    app, path: str, method: str = "GET", client: str = "127.0.0.1", headers: Optional[Dict[str, str]] = None
+) -> Tuple[int, Dict[str, str], int]:
+    """Send one request; return (status, headers, body bytes received)."""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench")] + [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (headers or {}).items()
+        ],
+        "client": (client, 50000),
+        "server": ("bench", 80),
+    }
+    state = {"status": 0, "headers": {}, "bytes": 0}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a real server: the client stays connected until the response is done
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+            state["headers"] = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            state["bytes"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return state["status"], state["headers"], state["bytes"]
+
+
+async def time_requests(app, path: str, count: int, warmup: int = 50) -> List[float]:
+    """Latency (seconds) of `count` sequential requests to `path`."""
+    for _ in range(warmup):
+        await call(app, path)
+    samples: List[float] = []
+    for _ in range(count):
+        started = time.perf_counter()
+        await call(app, path)
+        samples.append(time.perf_counter() - started)
+    return samples
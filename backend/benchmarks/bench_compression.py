@@ -0,0 +1,116 @@
+"""
+Response compression benchmark: bytes on the wire and server CPU per request.
+
+Polls GET /jobs/{job_id} for one completed job with a large result (a scene
+of --beats beats from the fake analysis pipeline), driven over ASGI through
+the application's full middleware stack with the database stubbed out.
+
+Cases (*_cold bypass the response cache, so every request validates and
+serializes the result, as before the cache existed, and compresses it):
+    identity_cold / identity_cached   no Accept-Encoding, uncompressed body
+    gzip_cold / gzip_cached           gzip
+    br_cold / br_cached               Brotli, when the brotli package is installed
+    not_modified                      If-None-Match with the job's ETag: 304, no body
+
+cpu_ms is process CPU time per request (time.process_time).
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression --beats 150 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+def _completed_job(beats: int):
+    from app.models.job import AnalysisJob, JobStatus
+    from app.services.analysis_service import AnalysisService
+    from benchmarks.corpus import CorpusSpec, generate_script
+    from benchmarks.fakes import fake_pipeline_detector
+
+    text = generate_script(CorpusSpec(scenes=1, beats_per_scene=beats, seed=49))
+    result = AnalysisService(emotion_detector=fake_pipeline_detector()).analyze_script(text, "bench")[0]
+    result_json = result.model_dump_json()
+    return AnalysisJob(
+        id="bench_job", status=JobStatus.COMPLETED, script_title="Bench", result_json=result_json,
+        result_bytes=len(result_json.encode("utf-8")),
+    )
+
+
+async def _measure(app, path: str, headers: Dict[str, str], count: int) -> Dict:
+    from benchmarks.asgi import call
+
+    cpu: List[float] = []
+    wall: List[float] = []
+    for _ in range(count):
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        status, response_headers, received = await call(app, path, headers=headers)
+        cpu.append(time.process_time() - cpu_started)
+        wall.append(time.perf_counter() - wall_started)
+    wall.sort()
+    return {
+        "status": status,
+        "content_encoding": response_headers.get("content-encoding", "identity"),
+        "bytes_on_wire": received,
+        "cpu_ms": round(1000 * sum(cpu) / len(cpu), 3),
+        "p50_ms": round(1000 * wall[len(wall) // 2], 3),
+    }
+
+
+async def run(beats: int, requests: int) -> Dict:
+    from app.core import compression
+    from app.core.compression import ResponseCache
+    from app.core.database import get_async_db
+    from app.main import app
+    from app.services.job_store import JobWriteBatcher, get_job_writer
+
+    job = _completed_job(beats)
+    db = MagicMock()
+    db.get = AsyncMock(return_value=job)
+    app.dependency_overrides[get_async_db] = lambda: db
+    app.dependency_overrides[get_job_writer] = lambda: AsyncMock(spec=JobWriteBatcher)
+    path = f"/api/v1/jobs/{job.id}"
+
+    results = {}
+    for encoding in ("identity",) + compression.available_encodings():
+        accept = {"Accept-Encoding": encoding}
+        with patch.object(ResponseCache, "get", return_value=None):
+            results[f"{encoding}_cold"] = await _measure(app, path, accept, requests)
+        await _measure(app, path, accept, 1)  # fill the cache
+        results[f"{encoding}_cached"] = await _measure(app, path, accept, requests)
+
+    from benchmarks.asgi import call
+    _, headers, _ = await call(app, path, headers={"Accept-Encoding": "gzip"})
+    results["not_modified"] = await _measure(
+        app, path, {"Accept-Encoding": "gzip", "If-None-Match": headers["etag"]}, requests
+    )
+    app.dependency_overrides.clear()
+    return {
+        "benchmark": "compression",
+        "beats": beats,
+        "result_bytes": job.result_bytes,
+        "brotli_available": compression.brotli is not None,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--beats", type=int, default=150, help="Beats in the job's result")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per case")
+    args = parser.parse_args(argv)
+
+    # Keep the limiter in the path but never rejecting
+    os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "1000000000")
+    os.environ.setdefault("RATE_LIMIT_BURST", "1000000000")
+    logging.disable(logging.WARNING)
+    print(json.dumps(asyncio.run(run(args.beats, args.requests)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Job endpoint concurrency benchmark.
+
+N simulated clients each submit a scene to /analyze and then poll
+/jobs/{job_id}; the app runs in-process against a throwaway SQLite file
+with a fake emotion detector. Reports p50/p95/p99 latency per operation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db_concurrency --clients 50 --polls 10
+
+Compare against untuned SQLite by overriding the PRAGMAs:
+    SQLITE_JOURNAL_MODE=DELETE SQLITE_SYNCHRONOUS=FULL python -m benchmarks.bench_db_concurrency
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+SCENE = """INT. KITCHEN - NIGHT
+
+SARAH stares at the letter, hands trembling.
+
+SARAH
+You lied to me. All of it.
+
+JOHN
+I did it to protect you.
+"""
+
+
+async def _client(client, polls: int, latencies: Dict[str, List[float]], errors: List[str]) -> None:
+    started = time.perf_counter()
+    resp = await client.post("/api/v1/analyze", json={"script_text": SCENE, "title": "Bench"})
+    latencies["submit"].append(time.perf_counter() - started)
+    if resp.status_code != 200:
+        errors.append(f"submit {resp.status_code}")
+        return
+    job_id = resp.json()["job_id"]
+
+    for _ in range(polls):
+        started = time.perf_counter()
+        resp = await client.get(f"/api/v1/jobs/{job_id}")
+        latencies["poll"].append(time.perf_counter() - started)
+        if resp.status_code != 200:
+            errors.append(f"poll {resp.status_code}")
+
+
+async def run(clients: int, polls: int, detector_latency: float) -> Dict:
+    import httpx
+    from app.main import app
+    from app.core.config import settings
+    from app.core.database import Base, engine, async_engine
+    from app.api.endpoints.analysis import get_analysis_service
+    from app.services.analysis_service import AnalysisService
+    from app.services.job_store import get_job_writer
+    from benchmarks.fakes import FakeEmotionDetector
+    from benchmarks.stats import summarize
+
+    Base.metadata.create_all(bind=engine)
+    service = AnalysisService(emotion_detector=FakeEmotionDetector(latency_s=detector_latency))
+    app.dependency_overrides[get_analysis_service] = lambda: service
+
+    latencies: Dict[str, List[float]] = {"submit": [], "poll": []}
+    errors: List[str] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[_client(client, polls, latencies, errors) for _ in range(clients)])
+        wall = time.perf_counter() - started
+
+    writer = get_job_writer()
+    await async_engine.dispose()
+    total_requests = len(latencies["submit"]) + len(latencies["poll"])
+    return {
+        "benchmark": "db_concurrency",
+        "clients": clients,
+        "polls_per_client": polls,
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "wall_seconds": round(wall, 3),
+        "requests_per_second": round(total_requests / wall, 1) if wall else 0.0,
+        "job_writes": writer.writes,
+        "job_commits": writer.commits,
+        "errors": len(errors),
+        "submit": summarize(latencies["submit"]),
+        "poll": summarize(latencies["poll"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--polls", type=int, default=10, help="Status polls per client")
+    parser.add_argument("--detector-latency", type=float, default=0.0, help="Fake inference seconds per beat")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import time, so point the app at a scratch DB first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+        # Measure the DB path, not the per-IP rate limiter (all clients share one IP)
+        os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "1000000")
+        os.environ.setdefault("RATE_LIMIT_BURST", "1000000")
+        result = asyncio.run(run(args.clients, args.polls, args.detector_latency))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
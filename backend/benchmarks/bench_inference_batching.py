@@ -0,0 +1,92 @@
+"""
+Cross-request batching benchmark.
+
+Concurrent clients each send small requests (a few beats, like an
+interactive /analyze) to one EmotionDetector from a thread pool, as the
+endpoints do. The fake model charges a fixed cost per forward pass plus a
+cost per beat, so pooling requests trades a little queueing delay for fewer
+passes. Direct inference is compared with the batcher at several max-wait
+settings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_inference_batching --clients 32 --requests 40 --beats 3
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+def _run(
+    clients: int,
+    requests: int,
+    beats: int,
+    overhead_s: float,
+    per_beat_s: float,
+    max_wait_ms: Optional[float],
+    max_batch: int,
+) -> Dict:
+    from app.core.metrics import INFERENCE_QUEUE_SECONDS
+    from app.services.inference_batcher import InferenceBatcher
+    from benchmarks.fakes import fake_pipeline_detector
+    from benchmarks.stats import summarize
+
+    detector = fake_pipeline_detector(latency_s=per_beat_s, call_overhead_s=overhead_s)
+    model = f"bench-{max_wait_ms}"
+    if max_wait_ms is not None:
+        detector.batcher = InferenceBatcher(detector._forward, max_batch_size=max_batch, max_wait_ms=max_wait_ms, model=model)
+    waits = INFERENCE_QUEUE_SECONDS.labels(model=model)
+
+    def client(index: int) -> List[float]:
+        latencies = []
+        for n in range(requests):
+            texts = [f"Client {index} request {n} beat {b}: I can't believe you did this." for b in range(beats)]
+            started = time.perf_counter()
+            detector.analyze_batch(texts)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = [value for values in pool.map(client, range(clients)) for value in values]
+    wall = time.perf_counter() - started
+    if detector.batcher is not None:
+        detector.batcher.close()
+
+    total_beats = clients * requests * beats
+    passes = detector.pipeline.calls
+    return {
+        "mode": "direct" if max_wait_ms is None else f"batched_{max_wait_ms:g}ms",
+        "beats_per_second": round(total_beats / wall, 1),
+        "forward_passes": passes,
+        "mean_batch": round(total_beats / passes, 2) if passes else 0.0,
+        "mean_fill": round(total_beats / passes / max_batch, 3) if passes and max_wait_ms is not None else None,
+        "mean_queue_ms": round(waits._sum.get() / (clients * requests) * 1000, 3) if max_wait_ms is not None else None,
+        "request_latency": summarize(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent callers (threadpool size)")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per client")
+    parser.add_argument("--beats", type=int, default=3, help="Beats per request")
+    parser.add_argument("--overhead", type=float, default=0.004, help="Fake fixed seconds per forward pass")
+    parser.add_argument("--per-beat", type=float, default=0.0002, help="Fake seconds per beat in a pass")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--waits", default="1,2,5,10", help="Comma-separated max-wait settings (ms)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    runs = [_run(args.clients, args.requests, args.beats, args.overhead, args.per_beat, None, args.max_batch)]
+    for wait in args.waits.split(","):
+        runs.append(_run(
+            args.clients, args.requests, args.beats, args.overhead, args.per_beat, float(wait), args.max_batch
+        ))
+    print(json.dumps({"benchmark": "inference_batching", "config": vars(args), "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Sparse job result benchmark: payload size and latency per view.
+
+Fetches GET /jobs/{job_id}?view=... for one completed job (a scene of
+--beats beats from the fake analysis pipeline) over ASGI through the full
+middleware stack, as bench_compression does. "cold" bypasses the response
+cache, so the full view validates and serializes the result with Pydantic
+and the sparse views project the stored JSON; "cached" is a repeat poll.
+
+Usage (from backend/):
+    python -m benchmarks.bench_job_views --beats 150 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from benchmarks.bench_compression import _completed_job, _measure
+
+VIEWS = ("full", "summary", "timeline")
+
+
+async def run(beats: int, requests: int) -> Dict:
+    from app.core.compression import ResponseCache
+    from app.core.database import get_async_db
+    from app.main import app
+    from app.services.job_store import JobWriteBatcher, get_job_writer
+
+    job = _completed_job(beats)
+    db = MagicMock()
+    db.get = AsyncMock(return_value=job)
+    app.dependency_overrides[get_async_db] = lambda: db
+    app.dependency_overrides[get_job_writer] = lambda: AsyncMock(spec=JobWriteBatcher)
+
+    results = {}
+    for view in VIEWS:
+        path = f"/api/v1/jobs/{job.id}?view={view}"
+        identity = {"Accept-Encoding": "identity"}
+        with patch.object(ResponseCache, "get", return_value=None):
+            cold = await _measure(app, path, identity, requests)
+        cached = await _measure(app, path, identity, requests)
+        gzipped = await _measure(app, path, {"Accept-Encoding": "gzip"}, 1)
+        results[view] = {
+            "bytes": cold["bytes_on_wire"],
+            "gzip_bytes": gzipped["bytes_on_wire"],
+            "cold_p50_ms": cold["p50_ms"],
+            "cold_cpu_ms": cold["cpu_ms"],
+            "cached_p50_ms": cached["p50_ms"],
+        }
+    app.dependency_overrides.clear()
+    return {"benchmark": "job_views", "beats": beats, "result_bytes": job.result_bytes, "views": results}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--beats", type=int, default=150, help="Beats in the job's result")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per case")
+    args = parser.parse_args(argv)
+
+    # Keep the limiter in the path but never rejecting
+    os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "1000000000")
+    os.environ.setdefault("RATE_LIMIT_BURST", "1000000000")
+    logging.disable(logging.WARNING)
+    print(json.dumps(asyncio.run(run(args.beats, args.requests)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
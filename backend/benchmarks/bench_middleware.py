@@ -0,0 +1,106 @@
+"""
+Middleware overhead benchmark.
+
+Times `/health` on the real application and a streamed PDF download
+through the application's middleware stack, driven directly over ASGI.
+The PDF is rendered once up front (template AI text) and streamed in 64 KiB
+chunks, so the numbers reflect middleware and response plumbing rather
+than ReportLab. Output uses the bench_pipeline JSON format, so runs from
+two commits can be diffed with `benchmarks.compare`.
+
+Usage (from backend/):
+    python -m benchmarks.bench_middleware --requests 3000 --out after.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+from typing import Dict, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _render_pdf(scenes: int) -> bytes:
+    from unittest.mock import patch
+    from app.services.analysis_service import AnalysisService
+    from app.services.pdf_export import PDFExporter
+    from benchmarks.corpus import CorpusSpec, generate_script
+    from benchmarks.fakes import FakeAITextService, FakeEmotionDetector
+
+    results = AnalysisService(emotion_detector=FakeEmotionDetector()).analyze_script(
+        generate_script(CorpusSpec(scenes=scenes, beats_per_scene=8, seed=5)), "bench"
+    )
+    data = {"status": "completed", "analysis_result": {"scenes": [r.model_dump(mode="json") for r in results]}}
+    with patch("app.services.pdf_export.get_ai_text_service", return_value=FakeAITextService()):
+        return PDFExporter().generate_pdf(data, "Benchmark").getvalue()
+
+
+async def run(requests: int, scenes: int) -> Dict:
+    from fastapi.responses import StreamingResponse
+    from app.main import app
+    from benchmarks.asgi import call, time_requests
+    from benchmarks.stats import summarize
+
+    pdf = _render_pdf(scenes)
+
+    @app.get("/__bench/pdf", include_in_schema=False)
+    async def bench_pdf():
+        def chunks():
+            for offset in range(0, len(pdf), CHUNK_SIZE):
+                yield pdf[offset:offset + CHUNK_SIZE]
+        return StreamingResponse(chunks(), media_type="application/pdf")
+
+    status, _, received = await call(app, "/__bench/pdf")
+    if status != 200 or received != len(pdf):
+        raise RuntimeError(f"PDF stream check failed: status {status}, {received}/{len(pdf)} bytes")
+
+    results = {}
+    for case, path, count in (
+        ("health", "/health", requests),
+        ("pdf_stream", "/__bench/pdf", max(1, requests // 10)),
+    ):
+        stats = summarize(await time_requests(app, path, count))
+        stats.update({"unit": "request", "units": 1})
+        results[case] = stats
+
+    return {
+        "suite": "middleware",
+        "commit": _git_commit(),
+        "pdf_bytes": len(pdf),
+        "middleware": [m.cls.__name__ for m in app.user_middleware],
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="/health requests (PDF streams: a tenth)")
+    parser.add_argument("--scenes", type=int, default=20, help="Scenes in the streamed PDF")
+    parser.add_argument("--out", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Keep the limiter in the path but never rejecting
+    os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "1000000000")
+    os.environ.setdefault("RATE_LIMIT_BURST", "1000000000")
+    logging.disable(logging.WARNING)
+    payload = json.dumps(asyncio.run(run(args.requests, args.scenes)), indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
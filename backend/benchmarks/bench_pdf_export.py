@@ -0,0 +1,122 @@
+"""
+PDF report benchmark: seconds per report for a long script.
+
+Analyzes a synthetic script with the fake emotion model, then renders its
+report with scene sections built serially and on the section process pool
+(PDF_SECTION_WORKERS). AI text comes from a fake summarization model that
+charges a fixed cost per model call (--ai-overhead) plus a cost per prompt
+(--ai-latency); the report records how many calls and prompts it made.
+--ai-cache puts the AI text cache in front of the model, so the timed
+reports measure re-exports; --ai-budget caps the AI text time per report
+and the sections that fell back to templates are counted. Besides whole
+reports, story_beats_per_second times building the scene flowables alone.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_export --scenes 50 --repeat 3
+    python -m benchmarks.bench_pdf_export --scenes 60 --workers 1 --ai-overhead 0.05
+    python -m benchmarks.bench_pdf_export --scenes 60 --workers 1 --ai-cache
+    python -m benchmarks.bench_pdf_export --scenes 60 --workers 1 --ai-overhead 0.5 --ai-budget 1
+"""
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeAITextService, FakeSummarizationPipeline
+
+
+def analysis_data(scenes: int, beats_per_scene: int) -> Dict:
+    from app.services.analysis_service import AnalysisService
+    from benchmarks.corpus import CorpusSpec, generate_script
+    from benchmarks.fakes import fake_pipeline_detector
+
+    text = generate_script(CorpusSpec(scenes=scenes, beats_per_scene=beats_per_scene, seed=50))
+    results = AnalysisService(emotion_detector=fake_pipeline_detector()).analyze_script(text, "bench")
+    return {
+        "status": "completed",
+        "analysis_result": {"scenes": [scene.model_dump(mode="json") for scene in results]},
+    }
+
+
+def _run(
+    data: Dict, workers: int, repeat: int, ai_overhead: float, ai_latency: float, ai_cache: bool,
+    ai_budget: Optional[float] = None,
+) -> Dict:
+    from app.core.config import settings
+    from app.services.ai_text_cache import AITextCache
+    from app.services.ai_text_service import TextBudget
+    from app.services.pdf_export import PDFExporter
+    from app.services.render_pool import shutdown_render_pools
+
+    exporter = PDFExporter()
+    beats = sum(len(scene["beats"]) for scene in data["analysis_result"]["scenes"])
+    model = FakeSummarizationPipeline(latency_s=ai_latency, call_overhead_s=ai_overhead)
+    # Memory-only cache: the warm-up report fills it, so timed reports are re-exports
+    ai_text = FakeAITextService(model, cache=AITextCache(path="") if ai_cache else None)
+    samples: List[float] = []
+    degraded: List[int] = []
+    with patch.object(settings, "PDF_SECTION_WORKERS", workers), \
+            patch.object(settings, "PDF_PARALLEL_MIN_SCENES", 1), \
+            patch("app.services.pdf_export.get_ai_text_service", return_value=ai_text):
+        size = len(exporter.generate_pdf(data, "Benchmark").getvalue())  # warm-up (starts the pool)
+        for _ in range(repeat):
+            budget = TextBudget(ai_budget)
+            started = time.perf_counter()
+            exporter.generate_pdf(data, "Benchmark", budget=budget)
+            samples.append(time.perf_counter() - started)
+            degraded.append(len(budget.degraded_sections))
+        shutdown_render_pools()
+    return {
+        "section_workers": workers,
+        "seconds_per_report": round(min(samples), 3),
+        "beats_per_second": round(beats / min(samples), 1),
+        "mean_seconds": round(sum(samples) / len(samples), 3),
+        "ai_calls_per_report": model.calls // (repeat + 1),
+        "ai_prompts_per_report": model.prompts // (repeat + 1),
+        "degraded_sections": max(degraded),
+        "pdf_bytes": size,
+    }
+
+
+def story_throughput(data: Dict, repeat: int) -> Dict:
+    """Beats/s turning scene data into flowables, without layout (the per-beat table work)."""
+    from app.services.pdf_export import PDFExporter
+
+    exporter = PDFExporter()
+    scenes = data["analysis_result"]["scenes"]
+    texts = [("", [])] * len(scenes)
+    beats = sum(len(scene["beats"]) for scene in scenes)
+    samples: List[float] = []
+    for _ in range(repeat + 1):
+        started = time.perf_counter()
+        for _ in exporter._scenes_story(1, scenes, texts):
+            pass
+        samples.append(time.perf_counter() - started)
+    return {"beats": beats, "story_beats_per_second": round(beats / min(samples[1:] or samples), 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, default=50)
+    parser.add_argument("--beats", type=int, default=8, help="Beats per scene")
+    parser.add_argument("--workers", default="1,4", help="Comma-separated PDF_SECTION_WORKERS values (1 = serial)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed reports per setting (after one warm-up)")
+    parser.add_argument("--ai-overhead", type=float, default=0.02, help="Fake fixed seconds per AI text model call")
+    parser.add_argument("--ai-latency", type=float, default=0.005, help="Fake seconds per AI text prompt")
+    parser.add_argument("--ai-cache", action="store_true", help="Serve repeated prompts from the AI text cache")
+    parser.add_argument("--ai-budget", type=float, help="AI text seconds per report (default: AI_TEXT_REPORT_BUDGET_SECONDS)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    data = analysis_data(args.scenes, args.beats)
+    runs = [_run(data, int(n), args.repeat, args.ai_overhead, args.ai_latency, args.ai_cache, args.ai_budget)
+            for n in args.workers.split(",")]
+    print(json.dumps({
+        "benchmark": "pdf_export", "config": vars(args), "story": story_throughput(data, args.repeat), "runs": runs,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
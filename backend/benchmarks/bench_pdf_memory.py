@@ -0,0 +1,96 @@
+"""
+PDF report memory benchmark: peak RSS versus number of beats.
+
+Each (beats, mode) pair renders one report in a fresh process, so peak RSS
+(ru_maxrss) belongs to that report alone. The analysis result is built
+before the render starts; the figure reported is how far the render pushed
+the peak above that point.
+
+Modes:
+    buffered   PDF_STREAMING off: the whole story list, rendered into a BytesIO
+    streaming  PDF_STREAMING on: flowables built as pages are laid out,
+               rendered into a temporary file (what export_pdf does)
+
+Sections render serially and AI text uses the template fallback, so only
+the layout and output path is measured.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf_memory --beats 400,1200,3600
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+from unittest.mock import patch
+
+BEATS_PER_SCENE = 8
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker(beats: int, mode: str) -> Dict:
+    import logging
+    logging.disable(logging.WARNING)
+    from app.core.config import settings
+    from app.services.pdf_export import PDFExporter
+    from benchmarks.bench_pdf_export import analysis_data
+    from benchmarks.fakes import FakeAITextService
+
+    data = analysis_data(scenes=max(1, beats // BEATS_PER_SCENE), beats_per_scene=BEATS_PER_SCENE)
+    exporter = PDFExporter()
+    before = _peak_rss_mb()
+    started = time.perf_counter()
+    with patch.object(settings, "PDF_STREAMING", mode == "streaming"), \
+            patch.object(settings, "PDF_SECTION_WORKERS", 1), \
+            patch("app.services.pdf_export.get_ai_text_service", return_value=FakeAITextService()):
+        if mode == "streaming":
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as out:
+                exporter.write_pdf(data, "Memory", out.name)
+                size = os.path.getsize(out.name)
+        else:
+            size = len(exporter.generate_pdf(data, "Memory").getvalue())
+    seconds = time.perf_counter() - started
+    peak = _peak_rss_mb()
+    return {
+        "beats": beats,
+        "mode": mode,
+        "peak_rss_mb": round(peak, 1),
+        "render_peak_delta_mb": round(peak - before, 1),
+        "seconds": round(seconds, 2),
+        "pdf_mb": round(size / 2**20, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--beats", default="400,1200", help="Comma-separated beat counts (8 beats per scene)")
+    parser.add_argument("--modes", default="buffered,streaming")
+    parser.add_argument("--worker", nargs=2, metavar=("BEATS", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(int(args.worker[0]), args.worker[1])))
+        return
+
+    runs = []
+    for beats in (int(n) for n in args.beats.split(",")):
+        for mode in args.modes.split(","):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_pdf_memory", "--worker", str(beats), mode],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            runs.append(json.loads(out))
+            print(json.dumps(runs[-1]), file=sys.stderr)
+    print(json.dumps({"benchmark": "pdf_memory", "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
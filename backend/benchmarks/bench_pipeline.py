@@ -0,0 +1,134 @@
+"""
+Pipeline microbenchmarks over the synthetic corpus.
+
+Times each stage in isolation (FountainParser, EmotionDetector with a fake
+deterministic model, VisualMapper, PDFExporter with template AI text) and the
+end-to-end AnalysisService, for every script in the standard corpus.
+Results are JSON so runs from different commits can be compared with
+`benchmarks.compare`.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pipeline --repeat 5 --out before.json
+    python -m benchmarks.bench_pipeline --repeat 5 --out after.json
+    python -m benchmarks.compare before.json after.json --threshold 0.10
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from benchmarks.corpus import CorpusSpec, generate_script, standard_corpus
+from benchmarks.stats import summarize
+
+# PDF rendering is much slower than the other stages; keep its corpus small
+PDF_CORPUS = ("short_scene", "feature_50", "adversarial_long_lines")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _measure(fn: Callable[[], object], repeat: int, units: int, unit: str) -> Dict:
+    """Run `fn` once to warm up, then `repeat` timed times."""
+    fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    stats = summarize(samples)
+    stats.update({
+        "unit": unit,
+        "units": units,
+        "units_per_second": round(units / (stats["p50_ms"] / 1000), 1) if stats["p50_ms"] else 0.0,
+    })
+    return stats
+
+
+def run(repeat: int, only: Optional[str] = None) -> Dict:
+    from app.parsers.fountain_parser import FountainParser
+    from app.services.analysis_service import AnalysisService
+    from app.services.pdf_export import PDFExporter
+    from app.services.visual_mapper import VisualMapper
+    from benchmarks.fakes import FakeAITextService, fake_pipeline_detector
+
+    detector = fake_pipeline_detector()
+    service = AnalysisService(emotion_detector=detector)
+    mapper = VisualMapper()
+    exporter = PDFExporter()
+    ai_text = FakeAITextService()
+
+    results: Dict[str, Dict] = {}
+    corpus: Dict[str, CorpusSpec] = standard_corpus()
+    for name, spec in corpus.items():
+        text = generate_script(spec)
+        scenes = FountainParser().parse_string(text)
+        plans = [plan for scene in scenes for plan in service._plan_beats(scene)]
+        beat_texts = [plan.text for plan in plans]
+        arcs = detector.analyze_batch(beat_texts)
+        scene_results = service.analyze_script(text, "bench")
+        analysis_data = {
+            "status": "completed",
+            "analysis_result": {"scenes": [scene.model_dump(mode="json") for scene in scene_results]},
+        }
+
+        cases = {
+            f"parser/{name}": (lambda: FountainParser().parse_string(text), len(scenes), "scene"),
+            f"emotion_detector/{name}": (lambda: detector.analyze_batch(beat_texts), len(beat_texts), "beat"),
+            f"visual_mapper/{name}": (lambda: [mapper.map_to_visuals(arc) for arc in arcs], len(arcs), "beat"),
+            f"end_to_end/{name}": (lambda: service.analyze_script(text, "bench"), len(beat_texts), "beat"),
+        }
+        if name in PDF_CORPUS:
+            cases[f"pdf_export/{name}"] = (
+                lambda: exporter.generate_pdf(analysis_data, "Benchmark"),
+                sum(len(scene.beats) for scene in scene_results),
+                "beat",
+            )
+
+        for case, (fn, units, unit) in cases.items():
+            if only and only not in case:
+                continue
+            with patch("app.services.pdf_export.get_ai_text_service", return_value=ai_text):
+                results[case] = _measure(fn, repeat, units, unit)
+            print(f"{case:<45} p50 {results[case]['p50_ms']:>10.3f} ms", file=sys.stderr)
+
+    return {
+        "suite": "pipeline",
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "corpus": {name: spec.to_dict() for name, spec in corpus.items()},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (after one warm-up)")
+    parser.add_argument("--only", help="Only run cases whose name contains this string")
+    parser.add_argument("--out", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    result = run(args.repeat, args.only)
+    payload = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
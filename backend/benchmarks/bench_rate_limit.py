@@ -0,0 +1,93 @@
+"""
+Rate limiter overhead benchmark.
+
+1. Backend cost: time per token-bucket check for the memory and SQLite
+   backends, for one hot client and for many distinct clients.
+2. Middleware cost: per-request latency of a trivial route with and
+   without RateLimitMiddleware, driven directly over ASGI.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rate_limit --checks 100000 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict
+
+
+def _bench_backend(limiter, checks: int, clients: int) -> Dict[str, float]:
+    keys = [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(clients)]
+    now = time.time()
+    started = time.perf_counter()
+    for i in range(checks):
+        limiter.check(keys[i % clients], now=now + i * 1e-6)
+    elapsed = time.perf_counter() - started
+    return {"checks": checks, "clients": clients, "ns_per_check": round(elapsed / checks * 1e9, 1)}
+
+
+async def _bench_middleware(requests: int) -> Dict[str, Dict]:
+    from fastapi import FastAPI
+    from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter
+    from app.main import RateLimitMiddleware
+    from benchmarks.asgi import time_requests
+    from benchmarks.stats import summarize
+
+    def make_app(limited: bool) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        if limited:
+            limiter = RateLimiter(per_minute=10**9, burst=10**9, backend=MemoryRateLimitBackend())
+            app.add_middleware(RateLimitMiddleware, limiter=limiter)
+        return app
+
+    results = {}
+    for name, limited in (("no_middleware", False), ("rate_limited", True)):
+        results[name] = summarize(await time_requests(make_app(limited), "/ping", requests))
+    results["overhead_p50_us"] = round(
+        (results["rate_limited"]["p50_ms"] - results["no_middleware"]["p50_ms"]) * 1000, 1
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=100_000, help="Checks per backend scenario")
+    parser.add_argument("--clients", type=int, default=50_000, help="Distinct clients in the churn scenario")
+    parser.add_argument("--requests", type=int, default=5_000, help="Requests per middleware scenario")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = os.path.join(tmp, "limits.db")
+        backends = {
+            "memory": lambda: MemoryRateLimitBackend(),
+            "sqlite": lambda: SQLiteRateLimitBackend(sqlite_path),
+        }
+        backend_results = {}
+        for name, factory in backends.items():
+            sqlite_checks = min(args.checks, 20_000) if name == "sqlite" else args.checks
+            backend_results[name] = {
+                "hot_client": _bench_backend(RateLimiter(60, 10, factory()), sqlite_checks, 1),
+                "many_clients": _bench_backend(RateLimiter(60, 10, factory()), sqlite_checks, args.clients),
+            }
+
+    result = {
+        "benchmark": "rate_limit",
+        "backends": backend_results,
+        "middleware": asyncio.run(_bench_middleware(args.requests)),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Torch CPU settings matrix for the emotion classifier.
+
+Each combination of TORCH_* settings runs in fresh processes (thread pools
+can only be sized once per process), with `--processes` copies running at
+the same time to reproduce several workers sharing one host. Every process
+loads the real EmotionDetector, warms it up, then classifies the beats of a
+synthetic script with analyze_batch. Reported: aggregate beats/s across the
+processes, per-process load time and the effective torch configuration.
+
+Needs torch and the EMOTION_MODEL_PRIMARY weights (downloaded on first run).
+
+Usage (from backend/):
+    python -m benchmarks.bench_torch_settings --intra 0,1,2,4 --processes 1,4
+    python -m benchmarks.bench_torch_settings --intra 2 --inference-mode on,off --compile off,on --bf16 off,on
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+AXES = {
+    "intra": "TORCH_INTRA_OP_THREADS",
+    "inter": "TORCH_INTER_OP_THREADS",
+    "inference_mode": "TORCH_INFERENCE_MODE",
+    "compile": "TORCH_COMPILE_CLASSIFIER",
+    "bf16": "TORCH_BF16",
+}
+SWITCH = {"on": "True", "off": "False"}
+
+
+def _worker(repeat: int, scenes: int) -> Dict:
+    """Runs inside one benchmark process; settings arrive through the environment."""
+    import logging
+    logging.disable(logging.WARNING)
+    from app.core.ml import torch_config
+    from app.parsers.fountain_parser import FountainParser
+    from app.services.analysis_service import AnalysisService
+    from app.services.emotion_detector import EmotionDetector
+    from benchmarks.corpus import CorpusSpec, generate_script
+
+    started = time.perf_counter()
+    detector = EmotionDetector()
+    load_seconds = time.perf_counter() - started
+    if detector.pipeline is None:
+        raise RuntimeError("Emotion model failed to load")
+
+    service = AnalysisService(emotion_detector=detector)
+    scenes_parsed = FountainParser().parse_string(generate_script(CorpusSpec(scenes=scenes, beats_per_scene=8, seed=11)))
+    texts = [plan.text for scene in scenes_parsed for plan in service._plan_beats(scene)]
+    # Warm-up: first calls pay one-off costs (allocator, oneDNN primitives, compilation)
+    detector.analyze_batch(texts[:16])
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        detector.analyze_batch(texts)
+    elapsed = time.perf_counter() - started
+    return {
+        "beats": len(texts) * repeat,
+        "seconds": round(elapsed, 3),
+        "load_seconds": round(load_seconds, 3),
+        "backend": detector.backend,
+        "torch": torch_config(),
+    }
+
+
+def _run_combo(combo: Dict[str, str], processes: int, repeat: int, scenes: int) -> Dict:
+    env = dict(os.environ)
+    for axis, value in combo.items():
+        env[AXES[axis]] = SWITCH.get(value, value)
+    command = [sys.executable, "-m", "benchmarks.bench_torch_settings", "--worker",
+               "--repeat", str(repeat), "--scenes", str(scenes)]
+    started = time.perf_counter()
+    procs = [subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+             for _ in range(processes)]
+    outputs = [proc.communicate() for proc in procs]
+    wall = time.perf_counter() - started
+
+    result: Dict = {**combo, "processes": processes}
+    failed = [err.strip().splitlines()[-1:] for proc, (_, err) in zip(procs, outputs) if proc.returncode != 0]
+    if failed:
+        result["error"] = failed[0][0] if failed[0] else "worker failed"
+        return result
+    runs = [json.loads(out) for out, _ in outputs]
+    beats = sum(run["beats"] for run in runs)
+    slowest = max(run["seconds"] for run in runs)
+    result.update({
+        "beats_per_second": round(beats / slowest, 1),
+        "beats_per_second_per_process": round(beats / slowest / processes, 1),
+        "load_seconds": max(run["load_seconds"] for run in runs),
+        "wall_seconds": round(wall, 2),
+        "backend": runs[0]["backend"],
+        "torch": runs[0]["torch"],
+    })
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--intra", default="0", help="Intra-op thread counts (0 = torch default)")
+    parser.add_argument("--inter", default="0", help="Inter-op thread counts (0 = torch default)")
+    parser.add_argument("--inference-mode", default="on", help="on,off")
+    parser.add_argument("--compile", default="off", help="on,off")
+    parser.add_argument("--bf16", default="off", help="on,off")
+    parser.add_argument("--processes", default="1", help="Concurrent processes per combination")
+    parser.add_argument("--repeat", type=int, default=3, help="analyze_batch passes per process")
+    parser.add_argument("--scenes", type=int, default=10, help="Scenes in the synthetic script (8 beats each)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(args.repeat, args.scenes)))
+        return
+
+    axes = {
+        "intra": args.intra.split(","),
+        "inter": args.inter.split(","),
+        "inference_mode": args.inference_mode.split(","),
+        "compile": args.compile.split(","),
+        "bf16": args.bf16.split(","),
+    }
+    runs: List[Dict] = []
+    for processes in (int(n) for n in args.processes.split(",")):
+        for values in itertools.product(*axes.values()):
+            combo = dict(zip(axes, values))
+            runs.append(_run_combo(combo, processes, args.repeat, args.scenes))
+            print(json.dumps(runs[-1]), file=sys.stderr)
+    print(json.dumps({"benchmark": "torch_settings", "cpu_count": os.cpu_count(), "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
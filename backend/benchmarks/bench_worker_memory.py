@@ -0,0 +1,120 @@
+"""
+Worker memory benchmark: total memory versus worker count.
+
+Two layouts are compared for each worker count:
+    per_worker  every worker loads its own models (what `uvicorn --workers N` does)
+    prefork     models load once in the parent, workers fork afterwards (app.server)
+
+Each worker touches its model weights read-only (as inference does), then the
+parent samples memory of itself and every worker from /proc. Summed RSS counts
+shared pages once per process; summed PSS splits them between the sharers,
+so PSS is the figure that shows what the host actually pays.
+
+Loaders:
+    synthetic  a --model-mb weight buffer, standing in for tensor storage (default; offline)
+    real       app.server.preload_models() (needs torch and the model weights)
+
+Usage (from backend/):
+    python -m benchmarks.bench_worker_memory --workers 1,2,4,8 --model-mb 600
+"""
+import argparse
+import json
+import os
+import signal
+import time
+from typing import Callable, Dict, List
+
+PAGE = 4096
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    """RSS and PSS (bytes) of one process, from /proc/<pid>/smaps_rollup."""
+    values = {"rss": 0, "pss": 0}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key.lower()] = int(rest.split()[0]) * 1024
+    return values
+
+
+def _synthetic_loader(model_mb: int) -> Callable[[], object]:
+    def load():
+        weights = bytearray(model_mb * 1024 * 1024)
+        # Write every page, as deserializing real weights does
+        for offset in range(0, len(weights), PAGE):
+            weights[offset] = 1
+        return weights
+    return load
+
+
+def _real_loader() -> object:
+    from app.server import preload_models
+    preload_models()
+    return None
+
+
+def _read_weights(weights) -> None:
+    """Read every page of the weights, like a forward pass; nothing is written."""
+    if weights is not None:
+        sum(weights[offset] for offset in range(0, len(weights), PAGE))
+
+
+def _measure(layout: str, workers: int, load: Callable[[], object]) -> Dict:
+    ready_r, ready_w = os.pipe()
+    started = time.perf_counter()
+    weights = load() if layout == "prefork" else None
+    pids: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            local = weights if layout == "prefork" else load()
+            _read_weights(local)
+            os.write(ready_w, b"1")
+            signal.pause()
+            os._exit(0)
+        pids.append(pid)
+    os.close(ready_w)
+    for _ in range(workers):
+        os.read(ready_r, 1)
+    os.close(ready_r)
+    elapsed = time.perf_counter() - started
+
+    processes = [os.getpid()] + pids
+    samples = [read_memory(pid) for pid in processes]
+    for pid in pids:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    del weights
+
+    return {
+        "layout": layout,
+        "workers": workers,
+        "startup_seconds": round(elapsed, 3),
+        "total_rss_mb": round(sum(s["rss"] for s in samples) / 2**20, 1),
+        "total_pss_mb": round(sum(s["pss"] for s in samples) / 2**20, 1),
+        "worker_pss_mb": round(sum(s["pss"] for s in samples[1:]) / max(1, workers) / 2**20, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--loader", choices=("synthetic", "real"), default="synthetic")
+    parser.add_argument("--model-mb", type=int, default=600, help="Synthetic weight size (MB)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    # Import the app before measuring so its modules count as shared in both layouts
+    import app.main  # noqa: F401
+
+    load = _real_loader if args.loader == "real" else _synthetic_loader(args.model_mb)
+    counts = [int(n) for n in args.workers.split(",")]
+    runs = [_measure(layout, n, load) for n in counts for layout in ("per_worker", "prefork")]
+    print(json.dumps({"benchmark": "worker_memory", "loader": args.loader, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
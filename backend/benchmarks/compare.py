@@ -0,0 +1,66 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+A case regresses when its metric grew by more than --threshold (relative)
+and by more than --min-delta-ms (absolute, to ignore timer noise on tiny
+cases). Exits non-zero if any case regressed, so it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.compare baseline.json current.json --threshold 0.10
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def compare(
+    baseline: Dict,
+    current: Dict,
+    metric: str = "p50_ms",
+    threshold: float = 0.10,
+    min_delta_ms: float = 0.5,
+) -> Tuple[List[Dict], List[str]]:
+    """Return (rows, regressed case names) for cases present in both runs."""
+    rows: List[Dict] = []
+    regressed: List[str] = []
+    base_results = baseline.get("results", {})
+    for case, result in sorted(current.get("results", {}).items()):
+        if case not in base_results:
+            continue
+        before, after = base_results[case][metric], result[metric]
+        change = (after - before) / before if before else 0.0
+        is_regression = change > threshold and (after - before) > min_delta_ms
+        rows.append({"case": case, "before": before, "after": after, "change": change, "regressed": is_regression})
+        if is_regression:
+            regressed.append(case)
+    return rows, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="p50_ms", help="Stat to compare (p50_ms, p95_ms, mean_ms, ...)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.current) as fh:
+        current = json.load(fh)
+
+    rows, regressed = compare(baseline, current, args.metric, args.threshold, args.min_delta_ms)
+    print(f"{baseline.get('commit') or 'baseline'} -> {current.get('commit') or 'current'} ({args.metric})")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['case']:<45} {row['before']:>10.3f} {row['after']:>10.3f} {row['change']:>+8.1%}{flag}")
+
+    if regressed:
+        print(f"\n{len(regressed)} case(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
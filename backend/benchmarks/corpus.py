@@ -0,0 +1,144 @@
+"""
+Deterministic synthetic Fountain corpus.
+
+The same CorpusSpec (including seed) always yields byte-identical text, so
+benchmark results are comparable between commits and machines.
+
+Shapes:
+    normal       mixed action and dialogue following the spec
+    monologue    one character speaking every beat, long speeches
+    long_lines   single lines of several thousand characters (truncation paths)
+    tiny_scenes  many scenes with a single beat each
+    shouting     all-caps action lines that look like character cues
+    unicode      accented names, curly quotes, em dashes and emoji
+
+Usage (from backend/):
+    python -m benchmarks.corpus --scenes 50 --beats 12 --shape normal > corpus.fountain
+"""
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+SHAPES = ("normal", "monologue", "long_lines", "tiny_scenes", "shouting", "unicode")
+
+_LOCATIONS = [
+    "KITCHEN", "ROOFTOP", "POLICE STATION", "HOSPITAL CORRIDOR", "DINER", "PARKING GARAGE",
+    "APARTMENT", "CHURCH", "TRAIN PLATFORM", "FOREST CLEARING", "NEWSROOM", "MOTEL ROOM",
+]
+_TIMES = ["DAY", "NIGHT", "DAWN", "DUSK", "CONTINUOUS", "LATER"]
+_CHARACTERS = ["SARAH", "JOHN", "DETECTIVE REYES", "MARGARET", "ELI", "DR. OKAFOR", "NINA", "THE STRANGER"]
+_UNICODE_CHARACTERS = ["JOSÉ", "RENÉE", "ZOË", "BJÖRN", "ÇELIK"]
+_WORDS = (
+    "the a she he they we you it of to in on at with without never always again still "
+    "light dark door window letter gun knife phone blood rain glass shadow table floor "
+    "run stare whisper scream laugh cry wait hide turn slam grab fall breathe tremble "
+    "cold quiet broken afraid angry tired empty bright slowly suddenly finally almost "
+    "truth lie promise secret memory mother father brother home night morning years"
+).split()
+_UNICODE_WORDS = ["café", "naïve", "“wait”", "—", "señor", "déjà", "vu", "😢", "🔥", "façade", "über"]
+
+
+@dataclass
+class CorpusSpec:
+    """Parameters for one synthetic script"""
+    scenes: int = 20
+    beats_per_scene: int = 10
+    dialogue_ratio: float = 0.6
+    line_words_mean: float = 14.0
+    line_words_stddev: float = 6.0
+    line_words_min: int = 2
+    line_words_max: int = 60
+    shape: str = "normal"
+    seed: int = 1234
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _line(rng: random.Random, spec: CorpusSpec, words: List[str]) -> str:
+    count = int(round(rng.gauss(spec.line_words_mean, spec.line_words_stddev)))
+    count = max(spec.line_words_min, min(spec.line_words_max, count))
+    text = " ".join(rng.choice(words) for _ in range(count))
+    return text[0].upper() + text[1:] + rng.choice([".", ".", ".", "!", "?", "..."])
+
+
+def generate_script(spec: CorpusSpec) -> str:
+    """Render a Fountain script for `spec`."""
+    if spec.shape not in SHAPES:
+        raise ValueError(f"Unknown corpus shape '{spec.shape}' (expected one of {', '.join(SHAPES)})")
+
+    rng = random.Random(spec.seed)
+    words = _WORDS + (_UNICODE_WORDS if spec.shape == "unicode" else [])
+    characters = _CHARACTERS + (_UNICODE_CHARACTERS if spec.shape == "unicode" else [])
+    scenes = spec.scenes
+    beats_per_scene = spec.beats_per_scene
+    if spec.shape == "tiny_scenes":
+        scenes, beats_per_scene = scenes * beats_per_scene, 1
+
+    lines: List[str] = ["Title: Synthetic Benchmark Script", "Author: benchmarks.corpus", ""]
+    for _ in range(scenes):
+        prefix = rng.choice(["INT.", "EXT.", "INT.", "EXT.", "INT./EXT."])
+        lines += [f"{prefix} {rng.choice(_LOCATIONS)} - {rng.choice(_TIMES)}", ""]
+        speaker = rng.choice(characters)
+
+        for _ in range(beats_per_scene):
+            if spec.shape == "long_lines":
+                text = " ".join(rng.choice(words) for _ in range(rng.randint(400, 900))) + "."
+            else:
+                text = _line(rng, spec, words)
+
+            if spec.shape == "monologue":
+                lines += [speaker, " ".join(_line(rng, spec, words) for _ in range(rng.randint(3, 8))), ""]
+            elif rng.random() < spec.dialogue_ratio:
+                speaker = rng.choice(characters)
+                lines.append(speaker)
+                if rng.random() < 0.15:
+                    lines.append(f"({rng.choice(['quietly', 'beat', 'under breath', 'shouting', 'off'])})")
+                lines += [text, ""]
+            else:
+                if spec.shape == "shouting":
+                    text = text.upper()
+                lines += [text, ""]
+    return "\n".join(lines) + "\n"
+
+
+def standard_corpus() -> Dict[str, CorpusSpec]:
+    """Fixed set of scripts the benchmark suite runs against."""
+    return {
+        "short_scene": CorpusSpec(scenes=1, beats_per_scene=8, seed=1),
+        "feature_50": CorpusSpec(scenes=50, beats_per_scene=12, seed=2),
+        "dialogue_heavy": CorpusSpec(scenes=20, beats_per_scene=15, dialogue_ratio=0.9, seed=3),
+        "action_heavy": CorpusSpec(scenes=20, beats_per_scene=15, dialogue_ratio=0.1, line_words_mean=28, seed=4),
+        **{
+            f"adversarial_{shape}": CorpusSpec(scenes=10, beats_per_scene=8, shape=shape, seed=10 + idx)
+            for idx, shape in enumerate(SHAPES)
+            if shape != "normal"
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, default=20)
+    parser.add_argument("--beats", type=int, default=10, help="Beats per scene")
+    parser.add_argument("--dialogue-ratio", type=float, default=0.6)
+    parser.add_argument("--line-words", type=float, default=14.0, help="Mean words per line")
+    parser.add_argument("--line-words-stddev", type=float, default=6.0)
+    parser.add_argument("--shape", choices=SHAPES, default="normal")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    print(generate_script(CorpusSpec(
+        scenes=args.scenes,
+        beats_per_scene=args.beats,
+        dialogue_ratio=args.dialogue_ratio,
+        line_words_mean=args.line_words,
+        line_words_stddev=args.line_words_stddev,
+        shape=args.shape,
+        seed=args.seed,
+    )), end="")
+
+
+if __name__ == "__main__":
+    main()
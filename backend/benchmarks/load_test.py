@@ -0,0 +1,272 @@
+"""
+HTTP load test for the FastAPI service.
+
+Replays a mixed workload (analyze, upload, job polls, PDF export) against the
+app at a target request rate, open-loop: requests are issued on schedule
+whether or not earlier ones have finished, so queueing shows up as latency
+instead of being hidden by slow clients. The emotion detector is replaced via
+dependency override with a fake of configurable latency and PDF text uses
+templates, so no model is downloaded.
+
+Modes:
+    inprocess  requests go straight to the ASGI app (httpx.ASGITransport)
+    uvicorn    the app is served by uvicorn on a local port (real sockets, HTTP parsing)
+
+Either way the server shares this process's event loop, so the reported loop
+lag is the lag the service itself would see.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --rps 50 --duration 30 --detector-latency 0.005
+    python -m benchmarks.load_test --mode uvicorn --rps 100 --mix analyze=2,upload=1,poll=6,pdf=1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+OPERATIONS = ("analyze", "upload", "poll", "pdf")
+DEFAULT_MIX = "analyze=3,upload=1,poll=5,pdf=1"
+# Completed jobs created before the run so polls and exports have targets
+SEED_JOBS = 5
+LAG_INTERVAL_S = 0.01
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse 'analyze=3,poll=5' into normalized weights."""
+    weights: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (expected one of {', '.join(OPERATIONS)})")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires; lateness is time the loop spent blocked."""
+
+    def __init__(self, interval_s: float = LAG_INTERVAL_S):
+        self.interval_s = interval_s
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class Workload:
+    """Issues one request of a given kind and records its outcome."""
+
+    def __init__(self, client, seed: int):
+        from benchmarks.corpus import CorpusSpec, generate_script
+
+        self.client = client
+        self.rng = random.Random(seed)
+        self._spec = CorpusSpec
+        self._generate = generate_script
+        self._script_seed = seed * 1_000_000
+        self.job_ids: List[str] = []
+        self.latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        self.statuses: Dict[str, Counter] = {name: Counter() for name in OPERATIONS}
+
+    def _script(self) -> str:
+        # Unique text per submission so content-hash dedup doesn't turn work into cache hits
+        self._script_seed += 1
+        return self._generate(self._spec(scenes=1, beats_per_scene=self.rng.randint(4, 12), seed=self._script_seed))
+
+    async def seed_jobs(self, count: int) -> None:
+        for _ in range(count):
+            await self.request("analyze", record=False)
+        if not self.job_ids:
+            raise RuntimeError("Could not create any jobs to poll; is the app healthy?")
+
+    async def request(self, kind: str, record: bool = True) -> None:
+        started = time.perf_counter()
+        try:
+            if kind == "analyze":
+                resp = await self.client.post("/api/v1/analyze", json={"script_text": self._script(), "title": "Load"})
+            elif kind == "upload":
+                files = {"file": ("load.fountain", self._script().encode("utf-8"), "text/plain")}
+                resp = await self.client.post("/api/v1/upload", files=files)
+            elif kind == "poll":
+                resp = await self.client.get(f"/api/v1/jobs/{self.rng.choice(self.job_ids)}")
+            else:
+                resp = await self.client.get(f"/api/v1/export/{self.rng.choice(self.job_ids)}/pdf")
+                await resp.aread()
+            status = str(resp.status_code)
+            if kind in ("analyze", "upload") and resp.status_code == 200:
+                body = resp.json()
+                if body.get("status") == "completed":
+                    self.job_ids.append(body["job_id"])
+        except Exception as exc:
+            status = type(exc).__name__
+        if record:
+            self.latencies[kind].append(time.perf_counter() - started)
+            self.statuses[kind][status] += 1
+
+
+async def _drive(workload: Workload, mix: Dict[str, float], rps: float, duration: float) -> Tuple[float, List[float]]:
+    """Open-loop arrivals (Poisson) for `duration` seconds; returns (wall seconds, schedule lateness)."""
+    rng = random.Random(7)
+    kinds, weights = list(mix), list(mix.values())
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    next_at = start
+    lateness: List[float] = []
+    tasks = []
+    while next_at - start < duration:
+        delay = next_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lateness.append(max(0.0, loop.time() - next_at))
+        tasks.append(asyncio.create_task(workload.request(rng.choices(kinds, weights)[0])))
+        next_at += rng.expovariate(rps)
+    await asyncio.gather(*tasks)
+    return loop.time() - start, lateness
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(
+    mode: str,
+    rps: float,
+    duration: float,
+    mix: Dict[str, float],
+    detector_latency: float,
+    timeout: float,
+) -> Dict:
+    import httpx
+    from app.main import app
+    from app.core.database import async_engine, sync_schema
+    from app.api.endpoints.analysis import get_analysis_service
+    from app.services.analysis_service import AnalysisService
+    from benchmarks.fakes import FakeAITextService, FakeEmotionDetector
+    from benchmarks.stats import summarize
+
+    sync_schema()
+    service = AnalysisService(emotion_detector=FakeEmotionDetector(latency_s=detector_latency))
+    app.dependency_overrides[get_analysis_service] = lambda: service
+
+    server = server_task = None
+    if mode == "uvicorn":
+        import uvicorn
+
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+        )
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=timeout)
+
+    monitor = LoopLagMonitor()
+    try:
+        with patch("app.services.pdf_export.get_ai_text_service", return_value=FakeAITextService()):
+            async with client:
+                workload = Workload(client, seed=1)
+                await workload.seed_jobs(SEED_JOBS)
+                monitor.start()
+                wall, lateness = await _drive(workload, mix, rps, duration)
+                await monitor.stop()
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await server_task
+        app.dependency_overrides.clear()
+        await async_engine.dispose()
+
+    statuses = sum(workload.statuses.values(), Counter())
+    total = sum(statuses.values())
+    rate_limited = statuses.get("429", 0)
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2") and status != "429")
+    all_latencies = [value for values in workload.latencies.values() for value in values]
+    return {
+        "benchmark": "load_test",
+        "mode": mode,
+        "target_rps": rps,
+        "duration_seconds": duration,
+        "detector_latency_seconds": detector_latency,
+        "mix": {name: round(weight, 3) for name, weight in mix.items()},
+        "requests": total,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(total / wall, 1) if wall else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "rate_limited_rate": round(rate_limited / total, 4) if total else 0.0,
+        "status_codes": dict(statuses),
+        "latency": summarize(all_latencies),
+        "operations": {
+            name: {**summarize(workload.latencies[name]), "status_codes": dict(workload.statuses[name])}
+            for name in OPERATIONS
+            if workload.latencies[name]
+        },
+        "event_loop_lag": summarize(monitor.samples),
+        # How late the load generator issued requests; large values mean the target RPS wasn't offered
+        "schedule_lateness": summarize(lateness),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--rps", type=float, default=50.0, help="Target request rate")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--detector-latency", type=float, default=0.002, help="Fake inference seconds per beat")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (seconds)")
+    parser.add_argument(
+        "--keep-rate-limit", action="store_true",
+        help="Keep the configured per-IP rate limit (all load comes from one IP, so expect 429s)"
+    )
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import time, so configure the app before importing it
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        os.environ.pop("ASYNC_DATABASE_URL", None)
+        os.environ["PDF_CACHE_DIR"] = os.path.join(tmp, "pdf_cache")
+        os.environ["JOB_RETENTION_ENABLED"] = "False"
+        if not args.keep_rate_limit:
+            os.environ["RATE_LIMIT_PER_MINUTE"] = "1000000000"
+            os.environ["RATE_LIMIT_BURST"] = "1000000000"
+        import logging
+        logging.disable(logging.WARNING)
+        result = asyncio.run(run(args.mode, args.rps, args.duration, mix, args.detector_latency, args.timeout))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
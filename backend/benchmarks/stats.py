@@ -0,0 +1,28 @@
+"""
+Latency statistics helpers shared by the benchmarks
+"""
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100); 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies_s: List[float]) -> Dict[str, float]:
+    """Summarize a latency sample (seconds) as milliseconds."""
+    if not latencies_s:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(latencies_s),
+        "mean_ms": round(sum(latencies_s) / len(latencies_s) * 1000, 3),
+        "p50_ms": round(percentile(latencies_s, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies_s, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies_s, 99) * 1000, 3),
+        "max_ms": round(max(latencies_s) * 1000, 3),
+    }
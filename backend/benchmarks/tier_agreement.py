@@ -0,0 +1,122 @@
+"""
+Fast/full detector tier agreement harness.
+
+Runs both emotion tiers over a labelled sample (JSON lines of
+{"text": ..., "label": <EmotionType value>}) and reports, per tier,
+accuracy against the labels and latency per beat, plus how often the tiers
+agree with each other. The fast model only knows six emotions, so every
+figure is also given at the family level (FAMILIES) where both tiers can
+be right.
+
+Usage (from backend/):
+    python -m benchmarks.tier_agreement                      # real models (torch + weights)
+    python -m benchmarks.tier_agreement --fake               # offline smoke run
+    python -m benchmarks.tier_agreement --sample my_labels.jsonl --out agreement.json
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from app.schemas.sis_schema import EmotionType
+
+DEFAULT_SAMPLE = os.path.join(os.path.dirname(__file__), "data", "emotion_sample.jsonl")
+
+# Coarse families, one per label of the fast tier's six-emotion model
+FAMILIES: Dict[EmotionType, str] = {
+    EmotionType.JOY: "joy", EmotionType.EUPHORIA: "joy", EmotionType.TRIUMPH: "joy",
+    EmotionType.HOPE: "joy", EmotionType.SERENITY: "joy",
+    EmotionType.PASSION: "love",
+    EmotionType.SADNESS: "sadness", EmotionType.MELANCHOLY: "sadness", EmotionType.DESPAIR: "sadness",
+    EmotionType.LONELINESS: "sadness", EmotionType.NOSTALGIA: "sadness",
+    EmotionType.ANGER: "anger", EmotionType.DISGUST: "anger", EmotionType.BETRAYAL: "anger",
+    EmotionType.FEAR: "fear", EmotionType.ANXIETY: "fear", EmotionType.DREAD: "fear", EmotionType.TENSION: "fear",
+    EmotionType.SURPRISE: "surprise", EmotionType.CONFUSION: "surprise",
+}
+
+
+def load_sample(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as fh:
+        rows = [json.loads(line) for line in fh if line.strip()]
+    for row in rows:
+        row["label"] = EmotionType(row["label"])
+    return rows
+
+
+def _rate(hits: int, total: int) -> float:
+    return round(hits / total, 3) if total else 0.0
+
+
+def compare_tiers(rows: List[Dict], predictions: Dict[str, List[EmotionType]]) -> Dict:
+    """Accuracy per tier and fast/full agreement, exact and per family."""
+    labels = [row["label"] for row in rows]
+    total = len(rows)
+    report: Dict = {"samples": total, "tiers": {}}
+    for tier, predicted in predictions.items():
+        report["tiers"][tier] = {
+            "accuracy": _rate(sum(p == l for p, l in zip(predicted, labels)), total),
+            "family_accuracy": _rate(sum(FAMILIES[p] == FAMILIES[l] for p, l in zip(predicted, labels)), total),
+        }
+    fast, full = predictions["fast"], predictions["full"]
+    report["agreement"] = _rate(sum(a == b for a, b in zip(fast, full)), total)
+    report["family_agreement"] = _rate(sum(FAMILIES[a] == FAMILIES[b] for a, b in zip(fast, full)), total)
+    disagreements = Counter(
+        (FAMILIES[a], FAMILIES[b]) for a, b in zip(fast, full) if FAMILIES[a] != FAMILIES[b]
+    )
+    report["top_family_disagreements"] = [
+        {"fast": a, "full": b, "count": count} for (a, b), count in disagreements.most_common(5)
+    ]
+    return report
+
+
+def run(sample_path: str, fake: bool, repeat: int) -> Dict:
+    from app.services.emotion_detector import EmotionDetector
+    from benchmarks.fakes import fake_pipeline_detector
+
+    rows = load_sample(sample_path)
+    texts = [row["text"] for row in rows]
+    predictions: Dict[str, List[EmotionType]] = {}
+    latency: Dict[str, float] = {}
+    models: Dict[str, Optional[str]] = {}
+    for tier in ("fast", "full"):
+        detector = fake_pipeline_detector(tier=tier) if fake else EmotionDetector.for_tier(tier)
+        if not detector.available:
+            raise RuntimeError(f"{tier} emotion model ({detector.model_name}) failed to load")
+        detector.analyze_batch(texts[:4])  # warm-up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            arcs = detector.analyze_batch(texts)
+        latency[tier] = (time.perf_counter() - started) / (repeat * len(texts))
+        predictions[tier] = [arc.primary_emotion.emotion for arc in arcs]
+        models[tier] = detector.model_name
+
+    report = compare_tiers(rows, predictions)
+    for tier in predictions:
+        report["tiers"][tier]["model"] = models[tier]
+        report["tiers"][tier]["ms_per_beat"] = round(latency[tier] * 1000, 3)
+    report.update({"benchmark": "tier_agreement", "sample": os.path.basename(sample_path), "fake_models": fake})
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", default=DEFAULT_SAMPLE, help="Labelled JSONL sample")
+    parser.add_argument("--fake", action="store_true", help="Use deterministic fake models (offline)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the sample per tier")
+    parser.add_argument("--out", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    payload = json.dumps(run(args.sample, args.fake, args.repeat), indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
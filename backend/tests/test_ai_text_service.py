@@ -0,0 +1,150 @@
+"""
+Tests for batched AI text generation
+"""
+import time
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.services.ai_text_cache import AITextCache, prompt_key
+from app.services.ai_text_service import TextBudget
+from benchmarks.fakes import FakeAITextService, FakeSummarizationPipeline
+
+
+def test_summarize_many_batches_prompts_by_length():
+    model = FakeSummarizationPipeline()
+    service = FakeAITextService(model)
+    short = [f"Short scene {n} at the docks." for n in range(5)]
+    long = [" ".join(["Long"] * 60) + f" scene {n}." for n in range(3)]
+
+    summaries = service.summarize_many(short + long + [""], max_len=110, min_len=30)
+
+    # One call per length group, not one per text
+    assert model.calls == 2
+    assert model.prompts == 8
+    assert summaries[-1] == ""
+    assert summaries[:8] == [service._safe_summarize(text, 110, 30) for text in short + long]
+
+
+def test_batches_respect_batch_size():
+    model = FakeSummarizationPipeline()
+    service = FakeAITextService(model)
+
+    with patch.object(settings, "AI_TEXT_BATCH_SIZE", 4):
+        service.generate_bullets_many([f"Scene {n}: tense close-ups" for n in range(10)])
+
+    assert model.calls == 3
+
+
+def test_failed_batch_falls_back_per_prompt():
+    class BrokenModel:
+        def __call__(self, inputs, **kwargs):
+            raise RuntimeError("out of memory")
+
+    service = FakeAITextService(BrokenModel())
+
+    summaries = service.summarize_many(["x" * 300, "A short line."], max_len=40, min_len=10)
+    bullets = service.generate_bullets_many(["Night exterior chase"], count=3)
+
+    assert summaries[0].endswith("…") and len(summaries[0]) <= 41
+    assert summaries[1] == "A short line."
+    assert bullets == [[f"Shot suggestion {n}: Night exterior chase…" for n in (1, 2, 3)]]
+
+
+def test_scene_text_uses_one_pass_over_all_scenes():
+    model = FakeSummarizationPipeline()
+    service = FakeAITextService(model)
+    scenes = [{"scene_location": f"LOC {n}", "beats": []} for n in range(12)]
+
+    overviews = service.generate_scene_overviews(scenes)
+    shot_lists = service.generate_shot_lists(scenes, count=5)
+
+    assert len(overviews) == len(shot_lists) == 12
+    assert model.calls == 2
+    assert overviews[0] == service.generate_scene_overview(scenes[0], 1)
+
+
+def test_cached_prompts_skip_the_model(tmp_path):
+    model = FakeSummarizationPipeline()
+    cache = AITextCache(str(tmp_path / "ai_text.db"), memory_entries=64)
+    service = FakeAITextService(model, cache=cache)
+    texts = ["Night at the docks, rain on steel."] * 3 + ["Dawn on the roof."]
+
+    first = service.summarize_many(texts)
+    again = service.summarize_many(texts)
+
+    # Identical prompts within a batch and across exports are generated once
+    assert model.prompts == 2
+    assert first[0] == first[1] == first[2]
+    assert again == first
+
+
+def test_persistent_tier_outlives_the_process_cache(tmp_path):
+    path = str(tmp_path / "ai_text.db")
+    texts = [f"Scene {n} at the harbour comprises {n} beats." for n in range(6)]
+    warm = FakeAITextService(FakeSummarizationPipeline(), cache=AITextCache(path, memory_entries=2))
+    expected = warm.summarize_many(texts)
+    assert len(warm.cache) == 2
+
+    model = FakeSummarizationPipeline()
+    cold = FakeAITextService(model, cache=AITextCache(path, memory_entries=2))
+    hits = REGISTRY.get_sample_value("msi_vpe_cache_requests_total", {"cache": "ai_text_sqlite", "result": "hit"}) or 0
+
+    assert cold.summarize_many(texts) == expected
+    assert model.calls == 0
+    assert REGISTRY.get_sample_value(
+        "msi_vpe_cache_requests_total", {"cache": "ai_text_sqlite", "result": "hit"}
+    ) == hits + 6
+
+
+def test_generation_params_are_part_of_the_key():
+    assert prompt_key("p", "t5-small", {"max_length": 40}) != prompt_key("p", "t5-small", {"max_length": 48})
+    assert prompt_key("p", "t5-small", {"max_length": 40}) != prompt_key("p", "t5-base", {"max_length": 40})
+
+
+def test_slow_call_falls_back_and_is_recorded():
+    service = FakeAITextService(FakeSummarizationPipeline(call_overhead_s=0.3))
+    budget = TextBudget(seconds=0)
+
+    with patch.object(settings, "AI_TEXT_CALL_TIMEOUT_SECONDS", 0.05):
+        started = time.monotonic()
+        summary = service.summarize_many(["Dawn on the roof."], budget=budget, sections=["scene 1 overview"])[0]
+
+    assert time.monotonic() - started < 0.25
+    assert summary == "Dawn on the roof."
+    assert budget.degraded == [("scene 1 overview", "timeout")]
+
+
+def test_spent_report_budget_skips_remaining_scenes():
+    model = FakeSummarizationPipeline()
+    service = FakeAITextService(model)
+    budget = TextBudget(seconds=60)
+    scenes = [{"scene_location": f"LOC {n}", "beats": []} for n in range(3)]
+
+    service.generate_scene_overviews(scenes, budget=budget)
+    budget.deadline = time.monotonic() - 1
+    shot_lists = service.generate_shot_lists(scenes, count=2, budget=budget)
+
+    assert model.calls == 1
+    assert budget.degraded_sections == [f"scene {n} shot list" for n in (1, 2, 3)]
+    assert shot_lists[0][0].startswith("Shot suggestion 1:")
+
+
+def test_saturated_queue_falls_back_immediately():
+    service = FakeAITextService(FakeSummarizationPipeline())
+    budget = TextBudget()
+    service._queued = settings.AI_TEXT_MAX_QUEUE
+
+    service.summarize_many(["A long night at the docks."], budget=budget, sections=["executive summary"])
+
+    assert budget.degraded == [("executive summary", "queue_saturated")]
+
+
+def test_missing_model_is_not_a_degraded_section():
+    budget = TextBudget()
+
+    FakeAITextService().generate_shot_lists([{"beats": []}], budget=budget)
+
+    assert budget.degraded == [("scene 1 shot list", "unavailable")]
+    assert budget.degraded_sections == []
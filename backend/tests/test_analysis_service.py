@@ -30,6 +30,7 @@ class TestAnalysisService(unittest.TestCase):
             overall_intensity=80
         )
         self.service.emotion_detector.analyze_text.return_value = self.mock_arc
+        self.service.emotion_detector.analyze_batch.side_effect = lambda texts: [self.mock_arc for _ in texts]
 
     def tearDown(self):
         self.mock_emotion_patcher.stop()
@@ -76,6 +77,74 @@ Hello world.
         # VisualMapper logic: Joy -> High Key, Warm
         self.assertEqual(sis.beats[0].visual_signals.lighting.technique, "high_key")
 
+    def test_scene_records_timings_and_versions(self):
+        """Every scene carries its processing time, stage breakdown and model versions"""
+        script_text = "INT. CAFE - DAY\n\nRain hits the window.\n\nJOHN\nHello world.\n"
+
+        sis = self.service.analyze_script(script_text, "job_t")[0]
+
+        timings = sis.timings
+        self.assertIsNotNone(timings)
+        self.assertEqual(sis.processing_time_seconds, timings.total_seconds)
+        self.assertEqual([b.beat_id for b in timings.beats], [b.beat_id for b in sis.beats])
+        self.assertGreater(timings.mapping_seconds, 0)
+        self.assertGreater(timings.schema_seconds, 0)
+        self.assertAlmostEqual(
+            timings.total_seconds,
+            timings.parse_seconds + timings.inference_seconds + timings.mapping_seconds + timings.schema_seconds,
+            places=5
+        )
+        self.assertIn("emotion_model", sis.model_versions)
+        self.assertIn("knowledge_base", sis.model_versions)
+
+    def test_slow_scene_is_logged(self):
+        script_text = "INT. CAFE - DAY\n\nJOHN\nHello world.\n"
+        with patch('app.services.analysis_service.settings.SLOW_SCENE_THRESHOLD_SECONDS', 0.0):
+            with self.assertLogs('app.services.analysis_service', level='WARNING') as logs:
+                self.service.analyze_script(script_text, "job_slow")
+        self.assertTrue(any("Slow scene" in line for line in logs.output))
+
+    def test_analyze_scripts_shares_one_inference_pass(self):
+        """Beats from every script go to the detector in a single batch"""
+        script_a = "INT. CAFE - DAY\n\nJOHN\nHello world.\n"
+        script_b = "EXT. PARK - NIGHT\n\nRain falls on the empty benches.\n\nMARY\nWhere is everyone?\n"
+
+        results = self.service.analyze_scripts([(script_a, "job_a"), (script_b, "job_b")])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0].analysis_id, "job_a")
+        self.assertEqual(results[1][0].analysis_id, "job_b")
+        self.service.emotion_detector.analyze_batch.assert_called_once()
+        texts = self.service.emotion_detector.analyze_batch.call_args[0][0]
+        self.assertEqual(len(texts), 3)
+        self.service.emotion_detector.analyze_text.assert_not_called()
+
+    def test_fast_tier_uses_fast_detector(self):
+        """Fast-tier scripts go to the small model and record it in model_versions"""
+        from app.core.config import settings
+        fast = MagicMock()
+        fast.available = True
+        fast.analyze_batch.side_effect = lambda texts: [self.mock_arc for _ in texts]
+        self.service._fast_detector = fast
+        script_a = "INT. CAFE - DAY\n\nJOHN\nHello world.\n"
+        script_b = "EXT. PARK - NIGHT\n\nMARY\nWhere is everyone?\n"
+
+        results = self.service.analyze_scripts([(script_a, "job_a"), (script_b, "job_b")], tiers=["fast", "full"])
+
+        fast.analyze_batch.assert_called_once_with(["Hello world."])
+        self.service.emotion_detector.analyze_batch.assert_called_once_with(["Where is everyone?"])
+        self.assertEqual(results[0][0].model_versions["emotion_model"], settings.EMOTION_MODEL_TERTIARY)
+        self.assertEqual(results[1][0].model_versions["emotion_model"], settings.EMOTION_MODEL_PRIMARY)
+
+    def test_fast_tier_falls_back_when_model_unavailable(self):
+        from app.core.config import settings
+        self.service._fast_detector = MagicMock(available=False)
+
+        results = self.service.analyze_script("INT. CAFE - DAY\n\nJOHN\nHello world.\n", "job_fast", tier="fast")
+
+        self.service._fast_detector.analyze_batch.assert_not_called()
+        self.assertEqual(results[0].model_versions["emotion_model"], settings.EMOTION_MODEL_PRIMARY)
+
     def test_pacing_calculation(self):
         text = "This is a sentence. And another one. Running fast."
         pacing = self.service._calculate_pacing(text, duration=2.0)
@@ -1,6 +1,13 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.main import app
 from app.services.analysis_service import AnalysisService
 from app.schemas.sis_schema import (
@@ -12,6 +19,7 @@ from app.schemas.sis_schema import (
 )
 
 from app.models.job import JobStatus, AnalysisJob
+from app.services.job_store import JobWriteBatcher
 
 class TestAPIIntegration(unittest.TestCase):
     def setUp(self):
@@ -19,15 +27,26 @@ class TestAPIIntegration(unittest.TestCase):
         self.mock_service = MagicMock(spec=AnalysisService)
         self.client = TestClient(app)
         
-        # Mock DB Session
-        self.mock_db = MagicMock()
+        # Mock DB Session and job writer
+        self.mock_db = MagicMock(spec=AsyncSession)
+        self.mock_db.scalar.return_value = None  # no earlier identical submission
+        self.mock_writer = AsyncMock(spec=JobWriteBatcher)
         
         # Override dependency
         from app.api.endpoints.analysis import get_analysis_service
-        from app.core.database import get_db
+        from app.core.database import get_async_db
+        from app.services.job_store import get_job_writer
         
         app.dependency_overrides[get_analysis_service] = lambda: self.mock_service
-        app.dependency_overrides[get_db] = lambda: self.mock_db
+        app.dependency_overrides[get_async_db] = lambda: self.mock_db
+        app.dependency_overrides[get_job_writer] = lambda: self.mock_writer
+        # Response bodies cached per test, not across tests that reuse job ids
+        from app.core.compression import ResponseCache, get_response_cache
+        self.response_cache = ResponseCache()
+        app.dependency_overrides[get_response_cache] = lambda: self.response_cache
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
 
     def test_analyze_endpoint_success(self):
         # Setup Mock Return with VALID data
@@ -142,6 +161,11 @@ class TestAPIIntegration(unittest.TestCase):
         data = response.json()
         self.assertEqual(data["status"], "completed")
         self.assertEqual(data["result"]["script_metadata"]["location"], "CAFE")
+        # Creation plus the final status/result update
+        self.assertEqual(self.mock_writer.write.await_count, 2)
+        final_call = self.mock_writer.write.await_args_list[-1]
+        self.assertEqual(final_call.kwargs["status"], JobStatus.COMPLETED)
+        self.assertIn("result_json", final_call.kwargs)
 
     def test_analyze_endpoint_failure(self):
         self.mock_service.analyze_script.side_effect = Exception("Parsing error")
@@ -157,6 +181,102 @@ class TestAPIIntegration(unittest.TestCase):
         self.assertIn("Parsing error", data["error"])
 
 
+    def test_analyze_reuses_completed_identical_submission(self):
+        """A completed job with the same content hash is returned without re-running"""
+        existing = AnalysisJob(
+            id="job_done",
+            status=JobStatus.COMPLETED,
+            error_message=None
+        )
+        self.mock_db.scalar.return_value = existing
+
+        payload = {"script_text": "INT. CAFE - DAY\n\nJOHN\nHello world."}
+        response = self.client.post("/api/v1/analyze", json=payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["job_id"], "job_done")
+        self.assertEqual(response.json()["status"], "completed")
+        self.mock_service.analyze_script.assert_not_called()
+        self.mock_writer.write.assert_not_awaited()
+
+    def test_tier_is_passed_to_the_pipeline_and_hashed(self):
+        """A fast-tier preview runs on the fast tier and never reuses a full-tier result"""
+        from app.services.job_dedup import submission_hash
+        self.mock_service.analyze_script.return_value = []
+        script = "INT. CAFE - DAY\n\nJOHN\nHello world."
+
+        self.client.post("/api/v1/analyze", json={"script_text": script, "tier": "fast"})
+
+        args = self.mock_service.analyze_script.call_args[0]
+        self.assertEqual(args[2], "fast")
+        hashes = {call.kwargs.get("content_hash") for call in self.mock_writer.write.await_args_list} - {None}
+        full_options = {"analyze_full_script": False, "style_profile": None}
+        self.assertEqual(hashes, {submission_hash(script, {**full_options, "tier": "fast"})})
+        self.assertNotIn(submission_hash(script, full_options), hashes)
+
+    def test_upload_and_analyze_hash_identical_text_alike(self):
+        """The same script sent to /analyze and /upload gets the same content hash"""
+        self.mock_service.analyze_script.return_value = []
+        script = "INT. CAFE - DAY\n\nJOHN\nHello world."
+
+        self.client.post("/api/v1/analyze", json={"script_text": script})
+        self.client.post("/api/v1/upload", files={"file": ("cafe.fountain", script.encode("utf-8"))})
+
+        hashes = [call.kwargs["content_hash"] for call in self.mock_writer.write.await_args_list if call.kwargs.get("create")]
+        self.assertEqual(len(hashes), 2)
+        self.assertEqual(hashes[0], hashes[1])
+
+    def test_idempotency_key_conflict(self):
+        """Reusing an Idempotency-Key for different content is rejected"""
+        self.mock_db.scalar.return_value = AnalysisJob(
+            id="job_other",
+            status=JobStatus.COMPLETED,
+            content_hash="not-the-same-hash"
+        )
+
+        response = self.client.post(
+            "/api/v1/analyze",
+            json={"script_text": "INT. CAFE - DAY\n\nJOHN\nHello world."},
+            headers={"Idempotency-Key": "abc-123"}
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.mock_service.analyze_script.assert_not_called()
+
+    def test_batch_submission_creates_parent_and_children(self):
+        """Batch jobs are created in one go and processed in the background"""
+        done = MagicMock()
+        done.model_dump_json.return_value = '{"analysis_id": "child"}'
+        self.mock_service.analyze_scripts.return_value = [[done], []]
+
+        payload = {
+            "title": "Season 1",
+            "scripts": [
+                {"script_text": "INT. CAFE - DAY\n\nJOHN\nHello world."},
+                {"script_text": "NOT A SCREENPLAY AT ALL"}
+            ]
+        }
+        response = self.client.post("/api/v1/analyze/batch", json=payload)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["status"], "processing")
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(len(data["jobs"]), 2)
+
+        # Both scripts went through one shared analysis pass
+        self.mock_service.analyze_scripts.assert_called_once()
+        self.assertEqual(len(self.mock_service.analyze_scripts.call_args[0][0]), 2)
+
+        final_status = {
+            call.args[0]: call.kwargs["status"]
+            for call in self.mock_writer.write.await_args_list
+            if "status" in call.kwargs
+        }
+        self.assertEqual(final_status[data["jobs"][0]["job_id"]], JobStatus.COMPLETED)
+        self.assertEqual(final_status[data["jobs"][1]["job_id"]], JobStatus.FAILED)
+        self.assertEqual(final_status[data["batch_id"]], JobStatus.COMPLETED)
+
     def test_get_job_status(self):
         """Test retrieving a job from DB"""
         # Mock DB Query
@@ -165,12 +285,290 @@ class TestAPIIntegration(unittest.TestCase):
             status=JobStatus.PROCESSING,
             error_message=None
         )
-        # SQLAlchemy mocking is verbose, usually better to mock the query chain: db.query().filter().first()
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_job
+        self.mock_db.get.return_value = mock_job
         
         response = self.client.get("/api/v1/jobs/job_123")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["status"], "processing")
 
+    def test_timings_are_opt_in(self):
+        """Stored per-stage timings are only returned when requested"""
+        detector = MagicMock()
+        detector.analyze_batch.side_effect = lambda texts: [EmotionalArc(
+            primary_emotion=EmotionDetection(
+                emotion=EmotionType.JOY, category=EmotionCategory.PRIMARY, intensity=80, confidence=0.9
+            ),
+            secondary_emotions=[],
+            overall_intensity=80
+        ) for _ in texts]
+        result = AnalysisService(emotion_detector=detector).analyze_script(
+            "INT. CAFE - DAY\n\nJOHN\nHello world.\n", "job_t"
+        )[0]
+        self.mock_db.get.return_value = AnalysisJob(
+            id="job_t", status=JobStatus.COMPLETED, result_json=result.model_dump_json()
+        )
+
+        default = self.client.get("/api/v1/jobs/job_t").json()
+        opted_in = self.client.get("/api/v1/jobs/job_t?include_timings=true").json()
+
+        self.assertIsNone(default["result"]["timings"])
+        self.assertEqual(default["result"]["processing_time_seconds"], result.processing_time_seconds)
+        self.assertEqual(len(opted_in["result"]["timings"]["beats"]), 1)
+
+    def _pdf_client(self, cache_dir):
+        """Completed job plus a PDF cache in `cache_dir`; returns the mocked exporter."""
+        from app.services.pdf_cache import PDFCache, get_pdf_cache
+
+        app.dependency_overrides[get_pdf_cache] = lambda: PDFCache(cache_dir, max_bytes=1024 * 1024)
+        self.mock_db.get.return_value = AnalysisJob(
+            id="job_pdf", status=JobStatus.COMPLETED, script_title="Night Shift", result_json="{}"
+        )
+        exporter = MagicMock()
+        exporter.body = b"%PDF-1.4 " + bytes(range(256))
+
+        def write_pdf(analysis_data, title, out, budget=None):
+            with open(out, "wb") as fh:
+                fh.write(exporter.body)
+
+        exporter.write_pdf.side_effect = write_pdf
+        return exporter
+
+    def test_export_pdf_is_cached_with_etag(self):
+        """A report renders once; If-None-Match gets a 304"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            exporter = self._pdf_client(cache_dir)
+            with patch("app.services.pdf_export.get_pdf_exporter", return_value=exporter):
+                first = self.client.get("/api/v1/export/job_pdf/pdf")
+                second = self.client.get("/api/v1/export/job_pdf/pdf")
+                revalidated = self.client.get(
+                    "/api/v1/export/job_pdf/pdf", headers={"If-None-Match": first.headers["etag"]}
+                )
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertTrue(first.content.startswith(b"%PDF"))
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.assertEqual(first.headers["accept-ranges"], "bytes")
+        self.assertIn("Night_Shift_analysis.pdf", first.headers["content-disposition"])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(exporter.write_pdf.call_count, 1)
+
+    def test_export_pdf_range_requests(self):
+        """Single byte ranges get a 206 slice; ranges past the end get a 416"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            exporter = self._pdf_client(cache_dir)
+            body = exporter.body
+            with patch("app.services.pdf_export.get_pdf_exporter", return_value=exporter):
+                partial = self.client.get("/api/v1/export/job_pdf/pdf", headers={"Range": "bytes=4-99"})
+                suffix = self.client.get("/api/v1/export/job_pdf/pdf", headers={"Range": "bytes=-10"})
+                beyond = self.client.get("/api/v1/export/job_pdf/pdf", headers={"Range": "bytes=9999-"})
+
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, body[4:100])
+        self.assertEqual(partial.headers["content-range"], f"bytes 4-99/{len(body)}")
+        self.assertEqual(suffix.status_code, 206)
+        self.assertEqual(suffix.content, body[-10:])
+        self.assertEqual(beyond.status_code, 416)
+        self.assertEqual(beyond.headers["content-range"], f"bytes */{len(body)}")
+
+    def test_export_pdf_streams_from_temp_file_without_cache(self):
+        """With the PDF cache off, the report streams from a temp file that is removed afterwards"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            exporter = self._pdf_client(cache_dir)
+            written = []
+            render = exporter.write_pdf.side_effect
+            exporter.write_pdf.side_effect = lambda data, title, out, budget=None: (written.append(out), render(data, title, out))
+            with patch("app.services.pdf_export.get_pdf_exporter", return_value=exporter), \
+                    patch("app.core.config.settings.PDF_CACHE_ENABLED", False):
+                response = self.client.get("/api/v1/export/job_pdf/pdf")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, exporter.body)
+        self.assertEqual(response.headers["cache-control"], "no-store")
+        self.assertFalse(os.path.exists(written[0]))
+
+    def test_temp_file_removed_when_download_is_aborted(self):
+        """A client disconnecting mid-stream still gets the temp file deleted"""
+        from pathlib import Path
+        from app.api.endpoints.analysis import _iter_temp_file
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                patch("app.core.config.settings.PDF_STREAM_CHUNK_BYTES", 16):
+            path = Path(tmp_dir) / "report.pdf"
+            path.write_bytes(b"%PDF" + b"0" * 100)
+            chunks = _iter_temp_file(path, 104)
+            self.assertEqual(next(chunks), b"%PDF" + b"0" * 12)
+            chunks.close()  # what the server does when the client goes away
+
+            self.assertFalse(path.exists())
+
+    def _export_client(self, scenes=2, beats_per_scene=3):
+        """Completed job whose stored result comes from the fake analysis pipeline."""
+        from benchmarks.corpus import CorpusSpec, generate_script
+        from benchmarks.fakes import fake_pipeline_detector
+
+        text = generate_script(CorpusSpec(scenes=scenes, beats_per_scene=beats_per_scene, seed=48))
+        result = AnalysisService(emotion_detector=fake_pipeline_detector()).analyze_script(text, "export")[0]
+        self.mock_db.get.return_value = AnalysisJob(
+            id="job_export", status=JobStatus.COMPLETED, script_title="Night Shift",
+            result_json=result.model_dump_json()
+        )
+        return result
+
+    def test_export_ndjson_one_beat_per_line(self):
+        result = self._export_client()
+
+        response = self.client.get("/api/v1/export/job_export/ndjson")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        self.assertIn("Night_Shift_beats.ndjson", response.headers["content-disposition"])
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([line["beat_id"] for line in lines], [beat.beat_id for beat in result.beats])
+        self.assertEqual(lines[0]["scene_number"], result.script_metadata.scene_number)
+        self.assertEqual(lines[0]["visual_signals"]["camera"]["shot_size"], result.beats[0].visual_signals.camera.shot_size.value)
+
+    def test_export_csv_shot_list(self):
+        result = self._export_client()
+
+        response = self.client.get("/api/v1/export/job_export/csv")
+
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        self.assertEqual(len(rows), len(result.beats))
+        first = result.beats[0]
+        self.assertEqual(rows[0]["beat_id"], first.beat_id)
+        self.assertEqual(rows[0]["shot_size"], first.visual_signals.camera.shot_size.value)
+        self.assertEqual(rows[0]["focal_length_mm"], str(first.visual_signals.camera.focal_length_mm))
+        self.assertEqual(rows[0]["primary_colors"], "; ".join(first.visual_signals.colors.primary_colors))
+
+    def test_export_columnar_without_pyarrow_is_501(self):
+        from app.services.data_export import FormatUnavailable
+
+        self._export_client()
+        with patch("app.services.data_export.require_pyarrow", side_effect=FormatUnavailable("no pyarrow")):
+            response = self.client.get("/api/v1/export/job_export/parquet")
+        unimplemented = self.client.get("/api/v1/export/job_export/usd")
+
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(response.json()["detail"], "no pyarrow")
+        self.assertEqual(unimplemented.status_code, 501)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_export_parquet_and_arrow_beat_columns(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        result = self._export_client()
+        with patch("app.core.config.settings.EXPORT_BATCH_ROWS", 2):
+            parquet = self.client.get("/api/v1/export/job_export/parquet")
+            arrow = self.client.get("/api/v1/export/job_export/arrow")
+
+        self.assertEqual(parquet.status_code, 200)
+        self.assertEqual(arrow.status_code, 200)
+        parquet_file = pq.ParquetFile(io.BytesIO(parquet.content))
+        arrow_file = pa.ipc.open_file(io.BytesIO(arrow.content))
+        # Written a batch of EXPORT_BATCH_ROWS beats at a time
+        self.assertEqual(parquet_file.metadata.num_row_groups, -(-len(result.beats) // 2))
+        self.assertEqual(arrow_file.num_record_batches, -(-len(result.beats) // 2))
+
+        table = parquet_file.read()
+        self.assertTrue(table.equals(arrow_file.read_all()))
+        self.assertEqual(table.num_rows, len(result.beats))
+        self.assertEqual(table.column("beat_id").to_pylist(), [beat.beat_id for beat in result.beats])
+        self.assertEqual(
+            table.column("emotion").to_pylist(),
+            [beat.emotional_arc.primary_emotion.emotion.value for beat in result.beats]
+        )
+        self.assertEqual(table.schema.field("primary_colors").type, pa.list_(pa.string()))
+        self.assertEqual(
+            table.column("primary_colors").to_pylist()[0], result.beats[0].visual_signals.colors.primary_colors
+        )
+
+    def test_job_status_etag_and_not_modified(self):
+        """Polling with the ETag of a completed job gets 304; the gzip representation has its own ETag"""
+        self._export_client()
+
+        identity = self.client.get("/api/v1/jobs/job_export", headers={"Accept-Encoding": "identity"})
+        gzipped = self.client.get("/api/v1/jobs/job_export", headers={"Accept-Encoding": "gzip"})
+        polled = self.client.get(
+            "/api/v1/jobs/job_export", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]}
+        )
+        with_timings = self.client.get("/api/v1/jobs/job_export?include_timings=true", headers={"Accept-Encoding": "identity"})
+
+        self.assertEqual(identity.status_code, 200)
+        self.assertNotIn("content-encoding", identity.headers)
+        self.assertEqual(gzipped.headers["content-encoding"], "gzip")
+        self.assertEqual(gzipped.headers["etag"], identity.headers["etag"][:-1] + '-gzip"')
+        self.assertEqual(gzipped.json(), identity.json())
+        self.assertEqual(polled.status_code, 304)
+        self.assertEqual(polled.headers["etag"], gzipped.headers["etag"])
+        self.assertNotEqual(with_timings.headers["etag"], identity.headers["etag"])
+
+    def test_polling_in_progress_job_with_gzip_gets_matching_etag(self):
+        """A small in-progress body is sent uncompressed, so its 304 keeps the same ETag"""
+        self.mock_db.get.return_value = AnalysisJob(id="job_running", status=JobStatus.PROCESSING)
+        gzip = {"Accept-Encoding": "gzip"}
+
+        first = self.client.get("/api/v1/jobs/job_running", headers=gzip)
+        polled = self.client.get("/api/v1/jobs/job_running", headers={**gzip, "If-None-Match": first.headers["etag"]})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn("content-encoding", first.headers)
+        self.assertEqual(polled.status_code, 304)
+        self.assertEqual(polled.headers["etag"], first.headers["etag"])
+        self.assertFalse(polled.headers["etag"].endswith('-gzip"'))
+
+    def test_job_status_views_project_the_stored_result(self):
+        result = self._export_client()
+        identity = {"Accept-Encoding": "identity"}
+
+        full = self.client.get("/api/v1/jobs/job_export", headers=identity)
+        timeline = self.client.get("/api/v1/jobs/job_export?view=timeline", headers=identity)
+        summary = self.client.get("/api/v1/jobs/job_export?view=summary", headers=identity)
+        fields = self.client.get(
+            "/api/v1/jobs/job_export?fields=beats.beat_number,beats.visual_signals.camera.shot_size", headers=identity
+        )
+
+        self.assertEqual(timeline.status_code, 200)
+        beats = timeline.json()["result"]["beats"]
+        self.assertEqual([b["beat_number"] for b in beats], [b.beat_number for b in result.beats])
+        self.assertEqual(
+            set(beats[0]), {"beat_id", "beat_number", "timestamp_start", "timestamp_end", "emotional_arc"}
+        )
+        self.assertEqual(beats[0]["emotional_arc"]["primary_emotion"]["emotion"], result.beats[0].emotional_arc.primary_emotion.emotion.value)
+        self.assertEqual(timeline.json()["status"], "completed")
+        self.assertLess(len(timeline.content) * 5, len(full.content))
+        self.assertNotIn("beats", summary.json()["result"])
+        self.assertEqual(summary.json()["result"]["scene_dominant_emotion"], full.json()["result"]["scene_dominant_emotion"])
+        self.assertEqual(fields.json()["result"]["beats"][0], {
+            "beat_number": 1, "visual_signals": {"camera": {"shot_size": result.beats[0].visual_signals.camera.shot_size.value}}
+        })
+        self.assertEqual(len({full.headers["etag"], timeline.headers["etag"], summary.headers["etag"]}), 3)
+
+    def test_job_status_rejects_unknown_fields(self):
+        self._export_client()
+
+        unknown = self.client.get("/api/v1/jobs/job_export?fields=beats.mood")
+        bad_view = self.client.get("/api/v1/jobs/job_export?view=compact")
+
+        self.assertEqual(unknown.status_code, 400)
+        self.assertEqual(unknown.json()["detail"], "Unknown field: beats.mood")
+        self.assertEqual(bad_view.status_code, 422)
+
+    def test_metrics_endpoint_exposes_pipeline_metrics(self):
+        """Failed jobs show up on the Prometheus scrape endpoint"""
+        self.mock_service.analyze_script.side_effect = Exception("Parsing error")
+        self.client.post("/api/v1/analyze", json={"script_text": "INVALID SCRIPT TEXT LONG ENOUGH"})
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        body = response.text
+        self.assertIn('msi_vpe_jobs_total{status="failed"}', body)
+        self.assertIn('msi_vpe_cache_requests_total{cache="job_result",result="miss"}', body)
+        self.assertIn("msi_vpe_db_write_seconds_bucket", body)
+
 if __name__ == "__main__":
     unittest.main()
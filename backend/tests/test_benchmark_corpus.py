@@ -0,0 +1,54 @@
+"""
+Tests for the benchmark corpus generator and result comparison
+"""
+import pytest
+
+from app.parsers.fountain_parser import FountainParser
+from benchmarks.compare import compare
+from benchmarks.corpus import SHAPES, CorpusSpec, generate_script
+
+
+def test_generator_is_deterministic():
+    spec = CorpusSpec(scenes=5, beats_per_scene=6, seed=42)
+    assert generate_script(spec) == generate_script(spec)
+    assert generate_script(spec) != generate_script(CorpusSpec(scenes=5, beats_per_scene=6, seed=43))
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_every_shape_parses(shape):
+    spec = CorpusSpec(scenes=3, beats_per_scene=4, shape=shape)
+    scenes = FountainParser().parse_string(generate_script(spec))
+    expected = 12 if shape == "tiny_scenes" else 3
+    assert len(scenes) == expected
+
+
+def test_unknown_shape_rejected():
+    with pytest.raises(ValueError):
+        generate_script(CorpusSpec(shape="sideways"))
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = {"results": {"parser/a": {"p50_ms": 10.0}, "parser/b": {"p50_ms": 0.1}}}
+    current = {"results": {"parser/a": {"p50_ms": 12.0}, "parser/b": {"p50_ms": 0.2}}}
+
+    rows, regressed = compare(baseline, current, threshold=0.10, min_delta_ms=0.5)
+
+    # b doubled but by less than the noise floor
+    assert regressed == ["parser/a"]
+    assert len(rows) == 2
+
+
+def test_tier_agreement_families_and_sample():
+    from app.schemas.sis_schema import EmotionType
+    from app.services.emotion_detector import EmotionDetector
+    from benchmarks.tier_agreement import DEFAULT_SAMPLE, FAMILIES, compare_tiers, load_sample
+
+    assert set(FAMILIES) == set(EmotionType)
+    # Each fast-tier label is its own family
+    assert {FAMILIES[e] for e in EmotionDetector.EMOTION6_MAP.values()} == set(EmotionDetector.EMOTION6_MAP)
+
+    rows = load_sample(DEFAULT_SAMPLE)[:2]
+    labels = [row["label"] for row in rows]
+    report = compare_tiers(rows, {"full": labels, "fast": [EmotionType.SURPRISE, labels[1]]})
+    assert report["tiers"]["full"]["accuracy"] == 1.0
+    assert report["agreement"] == 0.5
@@ -0,0 +1,125 @@
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import ResponseCache, CompressionMiddleware, negotiate_encoding
+
+PAYLOAD = {"beats": [{"shot_size": "medium_close_up", "colors": ["#1A2B3C", "#FFD700"]}] * 200}
+
+
+def _app(cache: ResponseCache) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, cache=cache, minimum_size=1024)
+
+    @app.get("/big")
+    async def big():
+        return JSONResponse(PAYLOAD, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"status": "pending"}
+
+    @app.get("/pdf")
+    async def pdf():
+        return Response(b"%PDF" + b"0" * 4096, media_type="application/pdf")
+
+    @app.get("/stream")
+    async def stream():
+        def lines():
+            for n in range(300):
+                yield json.dumps({"beat": n, "emotion": "anticipation"}).encode() + b"\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/if-none-match")
+    async def if_none_match(request: Request):
+        return request.headers.get("if-none-match")
+
+    @app.get("/not-modified")
+    async def not_modified():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    return app
+
+
+class TestNegotiation(unittest.TestCase):
+    def test_preference_and_q_values(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate, br", ("br", "gzip")), "br")
+        self.assertEqual(negotiate_encoding("gzip, deflate, br", ("gzip",)), "gzip")
+        self.assertEqual(negotiate_encoding("br;q=0, gzip;q=0.5", ("br", "gzip")), "gzip")
+        self.assertEqual(negotiate_encoding("*", ("gzip",)), "gzip")
+        self.assertIsNone(negotiate_encoding("identity", ("br", "gzip")))
+        self.assertIsNone(negotiate_encoding(None, ("gzip",)))
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(max_bytes=1024 * 1024)
+        self.client = TestClient(_app(self.cache))
+        self.gzip = {"Accept-Encoding": "gzip"}
+
+    def test_large_json_is_gzipped_with_its_own_etag(self):
+        response = self.client.get("/big", headers=self.gzip)
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["etag"], '"v1-gzip"')
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        self.assertEqual(response.json(), PAYLOAD)
+        self.assertLess(int(response.headers["content-length"]), len(json.dumps(PAYLOAD)) // 5)
+
+    def test_compressed_body_is_cached_by_strong_etag(self):
+        first = self.client.get("/big", headers=self.gzip)
+        with patch.object(compression, "compress", side_effect=AssertionError("compressed again")):
+            second = self.client.get("/big", headers=self.gzip)
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(second.content, first.content)
+
+    def test_small_binary_and_unaccepted_responses_pass_through(self):
+        small = self.client.get("/small", headers=self.gzip)
+        pdf = self.client.get("/pdf", headers=self.gzip)
+        identity = self.client.get("/big", headers={"Accept-Encoding": "identity"})
+
+        for response in (small, pdf, identity):
+            self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(identity.headers["etag"], '"v1"')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_streamed_json_is_compressed_chunk_by_chunk(self):
+        response = self.client.get("/stream", headers=self.gzip)
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("content-length", response.headers)
+        self.assertEqual(len(response.text.splitlines()), 300)
+
+    def test_if_none_match_sees_the_unencoded_etag(self):
+        echoed = self.client.get("/if-none-match", headers={**self.gzip, "If-None-Match": '"v1-gzip", "v0"'})
+        not_modified = self.client.get("/not-modified", headers={**self.gzip, "If-None-Match": '"v1-gzip"'})
+
+        self.assertEqual(echoed.json(), '"v1", "v0"')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["etag"], '"v1-gzip"')
+
+    def test_not_modified_for_an_uncompressed_body_keeps_its_etag(self):
+        # The 200 for this resource was sent as-is, so the client's validator is the plain ETag
+        not_modified = self.client.get("/not-modified", headers={**self.gzip, "If-None-Match": '"v1"'})
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["etag"], '"v1"')
+        self.assertNotIn("vary", not_modified.headers)
+
+    def test_gzip_output_is_deterministic(self):
+        body = json.dumps(PAYLOAD).encode()
+        self.assertEqual(compression.compress(body, "gzip"), compression.compress(body, "gzip"))
+        self.assertEqual(gzip.decompress(compression.compress(body, "gzip")), body)
+
+    @unittest.skipUnless(compression.brotli is not None, "brotli not installed")
+    def test_brotli_preferred_when_installed(self):
+        response = self.client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(response.headers["content-encoding"], "br")
+        self.assertEqual(response.headers["etag"], '"v1-br"')
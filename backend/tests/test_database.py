@@ -1,8 +1,15 @@
+import asyncio
+import os
+import tempfile
 import unittest
-from sqlalchemy import create_engine
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, apply_sqlite_pragmas, sync_schema, sync_schema_once
 from app.models.job import AnalysisJob, JobStatus
+from app.services.job_store import JobWriteBatcher
 
 class TestDatabaseIntegration(unittest.TestCase):
     def setUp(self):
@@ -56,5 +63,160 @@ class TestDatabaseIntegration(unittest.TestCase):
         self.assertEqual(updated_job.status, JobStatus.COMPLETED)
         self.assertEqual(updated_job.result_json, '{"test": "data"}')
 
+
+class TestSQLiteTuning(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "jobs.db")
+        self.engine = create_engine(f"sqlite:///{self.db_path}", connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(self.engine)
+        Base.metadata.create_all(bind=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_pragmas_applied_on_connect(self):
+        """Every pooled connection runs in WAL mode with NORMAL sync"""
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            # NORMAL == 1
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)
+            self.assertGreater(conn.execute(text("PRAGMA busy_timeout")).scalar(), 0)
+
+    def test_sync_schema_adds_new_columns(self):
+        """Tables created by an older release gain new columns and indexes"""
+        legacy = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'legacy.db')}")
+        with legacy.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE analysis_jobs (id VARCHAR PRIMARY KEY, script_title VARCHAR, "
+                "status VARCHAR(10) NOT NULL, result_json TEXT, error_message TEXT, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            ))
+        sync_schema(legacy)
+        with legacy.connect() as conn:
+            columns = {row[1] for row in conn.execute(text("PRAGMA table_info(analysis_jobs)"))}
+            indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(analysis_jobs)"))}
+        legacy.dispose()
+        self.assertIn("last_accessed_at", columns)
+        self.assertIn("result_bytes", columns)
+        self.assertIn("ix_analysis_jobs_status", indexes)
+
+    def test_job_writer_groups_concurrent_writes(self):
+        """Concurrent job writes share a single commit"""
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+        apply_sqlite_pragmas(async_engine.sync_engine)
+        writer = JobWriteBatcher(
+            session_factory=async_sessionmaker(async_engine, expire_on_commit=False),
+            window_ms=20,
+        )
+
+        async def scenario():
+            await asyncio.gather(*[
+                writer.write(f"job_{i}", create=True, status=JobStatus.PROCESSING)
+                for i in range(10)
+            ])
+            # Updates to the same job inside one window collapse into one statement
+            await asyncio.gather(
+                writer.write("job_0", status=JobStatus.COMPLETED),
+                writer.write("job_0", result_json='{"ok": true}'),
+            )
+            await async_engine.dispose()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(writer.commits, 2)
+        session = sessionmaker(bind=self.engine)()
+        try:
+            self.assertEqual(session.query(AnalysisJob).count(), 10)
+            job = session.get(AnalysisJob, "job_0")
+            self.assertEqual(job.status, JobStatus.COMPLETED)
+            self.assertEqual(job.result_json, '{"ok": true}')
+        finally:
+            session.close()
+
+    def test_job_writer_survives_cancelled_leader(self):
+        """Cancelling the caller that started a flush doesn't strand the others"""
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+        writer = JobWriteBatcher(
+            session_factory=async_sessionmaker(async_engine, expire_on_commit=False),
+            window_ms=20,
+        )
+
+        async def scenario():
+            first = asyncio.create_task(writer.write("job_a", create=True, status=JobStatus.PROCESSING))
+            await asyncio.sleep(0)
+            others = asyncio.gather(*[
+                writer.write(f"job_{i}", create=True, status=JobStatus.PROCESSING) for i in range(3)
+            ])
+            first.cancel()
+            await asyncio.wait_for(others, timeout=5)
+            await async_engine.dispose()
+
+        asyncio.run(scenario())
+
+        session = sessionmaker(bind=self.engine)()
+        try:
+            # The cancelled caller's write still lands with the batch
+            self.assertEqual(session.query(AnalysisJob).count(), 4)
+        finally:
+            session.close()
+
+    def test_job_writer_fails_waiters_when_flush_is_interrupted(self):
+        """Writes waiting on a flush that dies are failed, not left hanging"""
+        class HangingSession:
+            async def __aenter__(self):
+                await asyncio.Event().wait()
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        writer = JobWriteBatcher(session_factory=HangingSession, window_ms=0)
+
+        async def scenario():
+            waiters = [asyncio.create_task(writer.write(f"job_{i}", create=True)) for i in range(3)]
+            await asyncio.sleep(0.01)
+            writer._flush_task.cancel()
+            return await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=5)
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_job_writer_heartbeat_refreshes_running_jobs(self):
+        """A running job's updated_at keeps moving so dedup doesn't take it for orphaned"""
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+        apply_sqlite_pragmas(async_engine.sync_engine)
+        writer = JobWriteBatcher(
+            session_factory=async_sessionmaker(async_engine, expire_on_commit=False),
+            window_ms=0,
+        )
+        stale = datetime.utcnow() - timedelta(hours=1)
+
+        async def scenario():
+            await writer.write("job_a", create=True, status=JobStatus.PROCESSING, updated_at=stale)
+            async with writer.heartbeat(["job_a"], interval=0.01):
+                await asyncio.sleep(0.1)
+            await async_engine.dispose()
+
+        asyncio.run(scenario())
+
+        session = sessionmaker(bind=self.engine)()
+        try:
+            job = session.get(AnalysisJob, "job_a")
+            self.assertGreater(job.updated_at, stale + timedelta(minutes=59))
+            self.assertEqual(job.status, JobStatus.PROCESSING)
+        finally:
+            session.close()
+
+    def test_sync_schema_once_skips_after_first_run(self):
+        """Workers forked after the parent synced the schema don't run DDL again"""
+        with patch("app.core.database._schema_synced", False), \
+                patch("app.core.database.database_lock_path", return_value=os.path.join(self.tmpdir.name, "schema.lock")), \
+                patch("app.core.database.sync_schema") as sync:
+            sync_schema_once()
+            sync_schema_once()
+        self.assertEqual(sync.call_count, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
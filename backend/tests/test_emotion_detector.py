@@ -4,6 +4,7 @@ Tests for Emotion Detection Service
 
 import pytest
 from unittest.mock import MagicMock, patch
+from app.core.metrics import INFERENCE_BATCH_SIZE
 from app.services.emotion_detector import EmotionDetector
 from app.schemas.sis_schema import EmotionType, EmotionCategory
 
@@ -87,3 +88,46 @@ def test_mapping_aggregation(detector):
     # Score should be sum of 0.4+0.5 = 0.9? Or logic might differ.
     # Current logic sums them.
     assert arc.primary_emotion.confidence >= 0.9
+
+def test_analyze_batch_single_call_preserves_order(detector):
+    """Batch inference runs once and maps results back to input order"""
+    by_text = {
+        "Short.": [{'label': 'joy', 'score': 0.9}],
+        "A much longer line that is full of dread.": [{'label': 'fear', 'score': 0.8}],
+    }
+    detector.pipeline.side_effect = lambda texts, **kwargs: [by_text[t] for t in texts]
+
+    arcs = detector.analyze_batch(["A much longer line that is full of dread.", "", "Short."])
+
+    assert detector.pipeline.call_count == 1
+    assert arcs[0].primary_emotion.emotion == EmotionType.FEAR
+    assert arcs[1].overall_intensity == 0  # blank text -> neutral arc, not sent to the model
+    assert arcs[2].primary_emotion.emotion == EmotionType.JOY
+
+
+def test_analyze_batch_records_inference_metrics(detector):
+    """Each batched call is exported with its size, labelled by model and backend"""
+    detector.pipeline.side_effect = lambda texts, **kwargs: [[{'label': 'joy', 'score': 0.9}] for _ in texts]
+    size = INFERENCE_BATCH_SIZE.labels(model=detector.model_name, backend=detector.backend)
+    beats_before = size._sum.get()
+
+    detector.analyze_batch(["one", "two", "three"])
+
+    assert size._sum.get() == beats_before + 3
+
+
+def test_fast_tier_loads_small_model_with_its_label_map(mock_pipeline):
+    """The fast tier maps the six-label model into the same SIS taxonomy"""
+    from app.core.config import settings
+    detector = EmotionDetector.for_tier("fast")
+    assert mock_pipeline.call_args.kwargs["model"] == settings.EMOTION_MODEL_TERTIARY
+    detector.pipeline.return_value = [[
+        {'label': 'love', 'score': 0.7},
+        {'label': 'fear', 'score': 0.2},
+        {'label': 'joy', 'score': 0.1},
+    ]]
+
+    arc = detector.analyze_text("I'd follow you anywhere.")
+
+    assert arc.primary_emotion.emotion == EmotionType.PASSION
+    assert set(EmotionDetector.EMOTION6_MAP.values()) <= set(EmotionType)
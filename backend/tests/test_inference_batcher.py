@@ -0,0 +1,123 @@
+"""
+Tests for cross-request inference batching
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.metrics import INFERENCE_BATCH_FILL, INFERENCE_QUEUE_SECONDS
+from app.schemas.sis_schema import EmotionType
+from app.services.emotion_detector import EmotionDetector
+from app.services.inference_batcher import InferenceBatcher
+
+
+class RecordingForward:
+    """forward() that echoes its inputs and remembers every batch it saw"""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.batches = []
+        self.delay_s = delay_s
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay_s)
+        return [f"out:{text}" for text in texts]
+
+
+def _concurrent(call_one, requests):
+    """Run call_one(request) for every request at once, one thread each; return results in order."""
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def call(i):
+        barrier.wait()
+        results[i] = call_one(requests[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_requests_share_one_forward_pass():
+    forward = RecordingForward()
+    batcher = InferenceBatcher(forward, max_batch_size=64, max_wait_ms=200, model="test")
+    requests = [[f"r{i}-a", f"r{i}-b"] for i in range(6)]
+
+    results = _concurrent(batcher.infer, requests)
+    batcher.close()
+
+    assert len(forward.batches) == 1
+    assert sorted(forward.batches[0]) == sorted(t for r in requests for t in r)
+    # Every caller gets exactly its own outputs, in its own order
+    assert results == [[f"out:{t}" for t in r] for r in requests]
+
+
+def test_full_batch_runs_without_waiting_and_overflow_opens_next_batch():
+    forward = RecordingForward()
+    batcher = InferenceBatcher(forward, max_batch_size=4, max_wait_ms=10_000, model="test")
+
+    started = time.monotonic()
+    first = batcher.submit(["a", "b", "c"])
+    second = batcher.submit(["d"])
+    third = batcher.submit(["e", "f"])
+    assert first.result(2) == ["out:a", "out:b", "out:c"]
+    assert second.result(2) == ["out:d"]
+    assert time.monotonic() - started < 2  # the full batch did not wait for max_wait
+
+    batcher.close()  # flushes the partial batch holding `third`
+    assert third.result(2) == ["out:e", "out:f"]
+    assert forward.batches == [["a", "b", "c", "d"], ["e", "f"]]
+
+
+def test_lone_request_runs_after_max_wait():
+    forward = RecordingForward()
+    batcher = InferenceBatcher(forward, max_batch_size=64, max_wait_ms=20, model="test")
+
+    assert batcher.infer(["only"]) == ["out:only"]
+    batcher.close()
+    assert forward.batches == [["only"]]
+
+
+def test_forward_failure_reaches_every_caller():
+    def broken(texts):
+        raise RuntimeError("model crashed")
+
+    batcher = InferenceBatcher(broken, max_batch_size=8, max_wait_ms=1, model="test")
+    with pytest.raises(RuntimeError, match="model crashed"):
+        batcher.infer(["x"])
+    batcher.close()
+
+
+def test_queue_delay_and_fill_metrics():
+    batcher = InferenceBatcher(RecordingForward(), max_batch_size=4, max_wait_ms=1, model="metrics-test")
+    fill = INFERENCE_BATCH_FILL.labels(model="metrics-test")
+    waits = INFERENCE_QUEUE_SECONDS.labels(model="metrics-test")
+
+    batcher.infer(["a", "b"])
+    batcher.close()
+
+    assert fill._sum.get() == pytest.approx(0.5)
+    assert waits._sum.get() > 0
+
+
+def test_emotion_detector_pools_concurrent_calls():
+    """With batching enabled, concurrent analyze_text calls reach the model as one batch"""
+    with patch("app.services.emotion_detector.pipeline") as mock_pipeline, \
+            patch("app.core.config.settings.INFERENCE_BATCHING_ENABLED", True), \
+            patch("app.core.config.settings.INFERENCE_BATCH_MAX_WAIT_MS", 200.0):
+        detector = EmotionDetector()
+    detector.pipeline.side_effect = lambda texts, **kwargs: [[{"label": "joy", "score": 0.9}] for _ in texts]
+    assert detector.batcher is not None
+
+    arcs = _concurrent(detector.analyze_text, ["one", "two", "three"])
+    single = detector.analyze_batch(["four", "five"])
+    detector.batcher.close()
+
+    assert all(arc.primary_emotion.emotion == EmotionType.JOY for arc in arcs + single)
+    # Three pooled callers, then one lone call
+    assert detector.pipeline.call_count == 2
@@ -0,0 +1,87 @@
+"""
+Tests for submission hashing and in-flight coalescing
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.job import AnalysisJob, JobStatus
+from app.services.job_dedup import InFlightRegistry, normalize_script_text, reusable_job_query, submission_hash
+
+
+def test_normalization_ignores_line_endings_and_trailing_space():
+    a = "INT. CAFE - DAY\r\n\r\nJOHN   \r\nHello world.\r\n"
+    b = "\nINT. CAFE - DAY\n\nJOHN\nHello world."
+    assert normalize_script_text(a) == normalize_script_text(b)
+    assert submission_hash(a) == submission_hash(b)
+
+
+def test_hash_depends_on_options():
+    text = "INT. CAFE - DAY\n\nJOHN\nHello world."
+    assert submission_hash(text, {"style_profile": "noir"}) != submission_hash(text, {"style_profile": None})
+
+
+def test_inflight_followers_share_leader_result():
+    registry = InFlightRegistry()
+    runs = []
+
+    async def submit():
+        is_leader, future = registry.claim("hash")
+        if not is_leader:
+            return await future
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        registry.release("hash", result="job-1")
+        return "job-1"
+
+    async def scenario():
+        return await asyncio.gather(*[submit() for _ in range(5)])
+
+    assert asyncio.run(scenario()) == ["job-1"] * 5
+    assert len(runs) == 1
+    assert len(registry) == 0
+
+
+def test_inflight_followers_see_leader_failure():
+    registry = InFlightRegistry()
+
+    async def scenario():
+        _, leader_future = registry.claim("hash")
+        is_leader, follower_future = registry.claim("hash")
+        assert not is_leader
+        registry.release("hash", exc=RuntimeError("boom"))
+        with pytest.raises(RuntimeError):
+            await follower_future
+
+    asyncio.run(scenario())
+
+
+def test_reuses_completed_and_fresh_processing_jobs_but_not_stale_ones():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.JOB_DEDUP_PROCESSING_STALE_SECONDS + 60)
+
+    with Session(engine) as db:
+        db.add_all([
+            AnalysisJob(id="orphaned", content_hash="a", status=JobStatus.PROCESSING,
+                        created_at=now, updated_at=stale),
+            AnalysisJob(id="running", content_hash="b", status=JobStatus.PROCESSING,
+                        created_at=now, updated_at=now),
+            AnalysisJob(id="done", content_hash="c", status=JobStatus.COMPLETED,
+                        created_at=stale, updated_at=stale),
+            AnalysisJob(id="failed", content_hash="d", status=JobStatus.FAILED,
+                        created_at=now, updated_at=now),
+        ])
+        db.commit()
+
+        assert db.scalar(reusable_job_query("a", now)) is None
+        assert db.scalar(reusable_job_query("b", now)).id == "running"
+        assert db.scalar(reusable_job_query("c", now)).id == "done"
+        assert db.scalar(reusable_job_query("d", now)) is None
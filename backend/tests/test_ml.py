@@ -0,0 +1,46 @@
+"""
+Tests for the deferred ML loader and torch configuration
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import ml
+
+
+def test_pipeline_passes_arguments_through():
+    built = MagicMock()
+    with patch("transformers.pipeline", return_value=built) as hf_pipeline, \
+            patch("app.core.ml.configure_torch", return_value=None) as configure, \
+            patch("app.core.ml.tune_pipeline") as tune:
+        pipe = ml.pipeline("text-classification", model="some/model", top_k=None)
+
+    hf_pipeline.assert_called_once_with("text-classification", model="some/model", top_k=None)
+    configure.assert_called_once()
+    tune.assert_not_called()  # nothing to tune without torch
+    assert pipe is built
+
+
+def test_tune_pipeline_uses_inference_mode():
+    torch = pytest.importorskip("torch")
+    pipe = MagicMock(framework="pt")
+    pipe.device = torch.device("cpu")
+    pipe.model = torch.nn.Linear(2, 2)
+
+    with patch("app.core.ml.settings.TORCH_INFERENCE_MODE", True), \
+            patch("app.core.ml.settings.TORCH_BF16", False), \
+            patch("app.core.ml.settings.TORCH_COMPILE_CLASSIFIER", False):
+        ml.tune_pipeline(pipe, "text-classification")
+
+    assert pipe.get_inference_context() is torch.inference_mode
+
+
+def test_configure_torch_sets_thread_pools_once():
+    torch = pytest.importorskip("torch")
+    with patch("app.core.ml._torch_configured", False), \
+            patch("app.core.ml.settings.TORCH_INTRA_OP_THREADS", 2), \
+            patch.object(torch, "set_num_threads") as set_threads:
+        ml.configure_torch()
+        ml.configure_torch()
+
+    set_threads.assert_called_once_with(2)
@@ -0,0 +1,154 @@
+"""
+Tests for PDF report generation
+"""
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PyPDF2 import PdfReader
+
+from app.core.config import settings
+from app.services.ai_text_service import TextBudget
+from app.services.pdf_cache import PDFCache
+from app.services.pdf_export import PDFExporter
+from app.services import report_rows
+from benchmarks.bench_pdf_export import analysis_data
+from benchmarks.fakes import FakeAITextService, FakeSummarizationPipeline
+
+
+@pytest.fixture(scope="module")
+def report_data():
+    return analysis_data(scenes=6, beats_per_scene=3)
+
+
+def _pages(buffer: BytesIO) -> list:
+    return [page.extract_text() for page in PdfReader(buffer).pages]
+
+
+def test_ai_text_generated_in_one_pass_before_layout(report_data):
+    ai_text = MagicMock(wraps=FakeAITextService())
+
+    with patch("app.services.pdf_export.get_ai_text_service", return_value=ai_text):
+        pages = _pages(PDFExporter().generate_pdf(report_data, "Batch"))
+
+    ai_text.generate_scene_overviews.assert_called_once()
+    ai_text.generate_shot_lists.assert_called_once()
+    ai_text.generate_scene_overview.assert_not_called()
+    assert "Scene Overview" in "".join(pages)
+
+
+def test_parallel_sections_match_serial_report(report_data):
+    """Scene sections rendered on the section pool concatenate to the same pages"""
+    with patch("app.services.pdf_export.get_ai_text_service", return_value=FakeAITextService()):
+        serial = _pages(PDFExporter().generate_pdf(report_data, "Parallel"))
+        with ThreadPoolExecutor(max_workers=3) as pool, \
+                patch("app.services.render_pool.get_section_pool", return_value=pool), \
+                patch.object(settings, "PDF_SECTION_WORKERS", 3), \
+                patch.object(settings, "PDF_PARALLEL_MIN_SCENES", 2):
+            parallel = _pages(PDFExporter().generate_pdf(report_data, "Parallel"))
+
+    assert len(parallel) == len(serial)
+    # Only the "Generated" timestamp on the title page may differ
+    assert parallel[1:] == serial[1:]
+    headers = [line for page in parallel for line in page.splitlines() if line.startswith("SCENE ")]
+    assert headers == [f"SCENE {n}" for n in range(1, 7)]
+
+
+def test_beat_rows_from_legacy_and_current_shapes():
+    camera = {"shot_size": ["close_up", "wide"], "movement": None, "focal_length_mm": 35, "depth_of_field": ""}
+    lighting = {"quality": 30, "temperature_kelvin": 5600, "technique": "rembrandt"}
+
+    assert report_rows.camera_rows(camera) == [
+        ["Shot Size", "Close Up, Wide"],
+        ["Camera Movement", "N/A"],
+        ["Vertical Angle", "N/A"],
+        ["Horizontal Angle", "N/A"],
+        ["Focal Length", "35mm"],
+    ]
+    assert report_rows.lighting_rows(lighting)[0] == ["Setup", "70% Soft"]
+    assert report_rows.lighting_rows(lighting)[-1] == ["Technique", "Rembrandt"]
+    assert report_rows.emotion_rows({"emotion": "joy", "intensity": "x"})[1] == ["<b>Intensity</b>", "0.00"]
+    assert report_rows.beat_header(2, {"characters": ["ANNA"], "emotional_arc": {"primary_emotion": "quiet_despair"}}) \
+        == "Beat 2 - ANNA (Quiet Despair)"
+    assert report_rows.color_lines({"saturation": 40}) == []
+
+
+def test_repeated_headings_are_parsed_once(report_data):
+    exporter = PDFExporter()
+    scene = report_data["analysis_result"]["scenes"][0]
+    headings = [flowable for beat in exporter._scene_story(1, scene, "", [])
+                for flowable in getattr(beat, "_content", [])
+                if "CINEMATOGRAPHY" in getattr(flowable, "text", "")]
+
+    assert len(headings) == len(scene["beats"])
+    assert list(exporter._heading_frags) == [("<b>CINEMATOGRAPHY RECOMMENDATIONS</b>", "Heading4")]
+    # Each paragraph lays out its own copy of the fragments
+    assert headings[0].frags[0] is not headings[1].frags[0]
+
+
+def test_degraded_sections_are_noted_in_the_report(report_data):
+    ai_text = FakeAITextService(FakeSummarizationPipeline())
+    budget = TextBudget(seconds=60)
+    budget.deadline = 0  # already spent
+
+    with patch("app.services.pdf_export.get_ai_text_service", return_value=ai_text):
+        pages = _pages(PDFExporter().generate_pdf(report_data, "Late", budget=budget))
+
+    assert len(budget.degraded_sections) == 1 + 2 * 6
+    assert "template text is shown for: executive summary" in pages[0].replace("\n", " ")
+
+
+def test_degraded_report_is_not_cached(tmp_path):
+    cache = PDFCache(str(tmp_path))
+
+    def render(content: bytes, cacheable: bool):
+        def write(path: str) -> bool:
+            with open(path, "wb") as fh:
+                fh.write(content)
+            return cacheable
+        return write
+
+    path, cached = cache.get_or_render("k", render(b"%PDF degraded", False))
+    again, cached_again = cache.get_or_render("k", render(b"%PDF full", True))
+
+    assert not cached and path.read_bytes() == b"%PDF degraded"
+    assert cached_again and again.read_bytes() == b"%PDF full"
+    assert again != path
+
+
+def test_open_report_survives_eviction(tmp_path):
+    cache = PDFCache(str(tmp_path), max_bytes=1024)
+    renders = []
+
+    def render(path: str) -> bool:
+        renders.append(path)
+        with open(path, "wb") as fh:
+            fh.write(b"%PDF" + b"0" * 600)
+        return True
+
+    report, cached = cache.open_or_render("a", render)
+    # A second report pushes the first over budget; the open file still reads whole
+    cache.open_or_render("b", render)[0].close()
+    assert not cache.path("a").exists()
+    with report:
+        assert cached and len(report.read()) == 604
+
+    # Evicted between lookup and open: rendered again rather than failing
+    original = cache.get_or_render
+
+    def evicting_get_or_render(key, render):
+        path, cached = original(key, render)
+        if len(renders) == 3:
+            path.unlink()
+        return path, cached
+
+    cache.get_or_render = evicting_get_or_render
+    report, _ = cache.open_or_render("c", render)
+    report.close()
+    assert len(renders) == 4
+
+
+def test_pdf_cache_rejects_non_positive_budget(tmp_path):
+    with pytest.raises(ValueError):
+        PDFCache(str(tmp_path), max_bytes=0)
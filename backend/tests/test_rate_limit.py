@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+from app.main import RateLimitMiddleware
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill(self):
+        limiter = RateLimiter(per_minute=60, burst=3, backend=MemoryRateLimitBackend())
+
+        decisions = [limiter.check("1.2.3.4", now=100.0) for _ in range(4)]
+
+        self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+        self.assertEqual(decisions[2].remaining, 0)
+        self.assertAlmostEqual(decisions[3].retry_after, 1.0)
+        # One token per second at 60/min
+        self.assertTrue(limiter.check("1.2.3.4", now=101.0).allowed)
+        self.assertFalse(limiter.check("1.2.3.4", now=101.5).allowed)
+
+    def test_clients_are_independent(self):
+        limiter = RateLimiter(per_minute=60, burst=1, backend=MemoryRateLimitBackend())
+        self.assertTrue(limiter.check("a", now=0.0).allowed)
+        self.assertFalse(limiter.check("a", now=0.0).allowed)
+        self.assertTrue(limiter.check("b", now=0.0).allowed)
+
+    def test_memory_backend_is_bounded(self):
+        backend = MemoryRateLimitBackend(max_clients=100)
+        limiter = RateLimiter(per_minute=60, burst=10, backend=backend)
+
+        for i in range(1000):
+            limiter.check(f"10.0.{i // 256}.{i % 256}", now=0.0)
+        self.assertEqual(len(backend), 100)
+
+        # Buckets that have fully refilled are dropped as time moves on
+        limiter.check("late", now=60.0)
+        self.assertEqual(len(backend), 1)
+
+    def test_sqlite_backend_shared_between_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "limits.db")
+            worker_a = RateLimiter(per_minute=60, burst=2, backend=SQLiteRateLimitBackend(path))
+            worker_b = RateLimiter(per_minute=60, burst=2, backend=SQLiteRateLimitBackend(path))
+
+            self.assertTrue(worker_a.check("1.2.3.4", now=10.0).allowed)
+            self.assertTrue(worker_b.check("1.2.3.4", now=10.0).allowed)
+            self.assertFalse(worker_a.check("1.2.3.4", now=10.0).allowed)
+            self.assertTrue(worker_b.check("1.2.3.4", now=11.0).allowed)
+
+    def test_sqlite_backend_fails_open_when_locked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "limits.db")
+            limiter = RateLimiter(per_minute=60, burst=1, backend=SQLiteRateLimitBackend(path, busy_timeout_ms=20))
+            self.assertTrue(limiter.blocking)
+            limiter.check("1.2.3.4", now=10.0)
+
+            holder = sqlite3.connect(path, isolation_level=None)
+            holder.execute("BEGIN IMMEDIATE")
+            try:
+                started = time.perf_counter()
+                decision = limiter.check("1.2.3.4", now=10.0)
+            finally:
+                holder.execute("ROLLBACK")
+                holder.close()
+
+            self.assertTrue(decision.allowed)
+            self.assertLess(time.perf_counter() - started, 1.0)
+            # Once the lock is released the bucket is enforced again
+            self.assertFalse(limiter.check("1.2.3.4", now=10.0).allowed)
+
+
+class TestRateLimitMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        @app.get("/stream")
+        async def stream():
+            return StreamingResponse((bytes([i]) * 1024 for i in range(8)), media_type="application/pdf")
+
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=RateLimiter(per_minute=60, burst=3, backend=MemoryRateLimitBackend())
+        )
+        self.client = TestClient(app)
+
+    def test_headers_and_rejection(self):
+        first = self.client.get("/ping")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["X-RateLimit-Limit"], "3")
+        self.assertEqual(first.headers["X-RateLimit-Remaining"], "2")
+
+        self.client.get("/ping")
+        self.client.get("/ping")
+        rejected = self.client.get("/ping")
+        self.assertEqual(rejected.status_code, 429)
+        self.assertEqual(rejected.headers["X-RateLimit-Remaining"], "0")
+        self.assertIn("Retry-After", rejected.headers)
+
+    def test_streamed_body_passes_through(self):
+        response = self.client.get("/stream")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"".join(bytes([i]) * 1024 for i in range(8)))
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import pytest
+
+from app.services.result_projection import UnknownField, parse_fields, project
+
+RESULT = {
+    "analysis_id": "a1",
+    "script_metadata": {"scene_number": "1", "location": "DINER"},
+    "beats": [
+        {"beat_number": 1, "emotional_arc": {"primary_emotion": {"emotion": "fear", "intensity": 70}, "overall_intensity": 65},
+         "visual_signals": {"reasoning": "Long paragraph", "alternative_options": {"lens": "85mm"}}},
+        {"beat_number": 2, "emotional_arc": {"primary_emotion": {"emotion": "joy", "intensity": 40}, "overall_intensity": 35},
+         "visual_signals": {"reasoning": "Another paragraph", "alternative_options": None}},
+    ],
+}
+
+
+def test_paths_descend_through_lists():
+    projected = project(RESULT, parse_fields("beats.beat_number,beats.emotional_arc.primary_emotion.emotion"))
+
+    assert projected == {"beats": [
+        {"beat_number": 1, "emotional_arc": {"primary_emotion": {"emotion": "fear"}}},
+        {"beat_number": 2, "emotional_arc": {"primary_emotion": {"emotion": "joy"}}},
+    ]}
+
+
+def test_a_parent_path_keeps_the_whole_object():
+    paths = parse_fields("script_metadata.location,script_metadata")
+
+    assert project(RESULT, paths) == {"script_metadata": RESULT["script_metadata"]}
+
+
+def test_views_and_fields_combine():
+    projected = project(RESULT, parse_fields("beats.visual_signals.alternative_options.lens", view="timeline"))
+
+    assert projected["beats"][0]["visual_signals"] == {"alternative_options": {"lens": "85mm"}}
+    assert projected["beats"][1]["visual_signals"] == {"alternative_options": None}
+    assert projected["beats"][0]["emotional_arc"]["overall_intensity"] == 65
+    assert "reasoning" not in projected["beats"][0]["visual_signals"]
+    assert parse_fields(None, view="full") == []
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(UnknownField, match="beats.emotion"):
+        parse_fields("beats.emotion")
+    with pytest.raises(UnknownField):
+        parse_fields("visual_summary")
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import sync_schema
+from app.core.metrics import RETENTION_ROWS_RECLAIMED
+from app.models.job import AnalysisJob, JobStatus
+from app.services.retention import RetentionSweeper
+
+
+class TestRetentionSweeper(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        url = os.path.join(self.tmpdir.name, "jobs.db")
+        self.engine = create_engine(f"sqlite:///{url}")
+        sync_schema(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{url}")
+        self.now = datetime(2026, 3, 1, 12, 0, 0)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _add_job(self, job_id, age_hours, size=0, accessed_hours_ago=None, status=JobStatus.COMPLETED):
+        session = self.Session()
+        session.add(AnalysisJob(
+            id=job_id,
+            status=status,
+            result_json="x" * size if size else None,
+            result_bytes=size,
+            created_at=self.now - timedelta(hours=age_hours),
+            last_accessed_at=(
+                self.now - timedelta(hours=accessed_hours_ago) if accessed_hours_ago is not None else None
+            ),
+        ))
+        session.commit()
+        session.close()
+
+    def _sweep(self, **kwargs):
+        sweeper = RetentionSweeper(
+            session_factory=async_sessionmaker(self.async_engine, expire_on_commit=False),
+            **kwargs
+        )
+
+        async def scenario():
+            try:
+                return await sweeper.sweep_once(now=self.now)
+            finally:
+                await self.async_engine.dispose()
+
+        return asyncio.run(scenario())
+
+    def test_ttl_deletes_old_jobs(self):
+        self._add_job("old", age_hours=48, size=200000)
+        self._add_job("fresh", age_hours=1, size=100)
+        before = RETENTION_ROWS_RECLAIMED.labels(reason="ttl")._value.get()
+
+        result = self._sweep(ttl_seconds=24 * 3600, max_total_bytes=0)
+
+        self.assertEqual(result.rows_deleted, 1)
+        self.assertEqual(result.bytes_deleted, 200000)
+        # Freed overflow pages are handed back by the incremental vacuum
+        self.assertGreater(result.bytes_vacuumed, 0)
+        session = self.Session()
+        self.assertIsNone(session.get(AnalysisJob, "old"))
+        self.assertIsNotNone(session.get(AnalysisJob, "fresh"))
+        session.close()
+        self.assertEqual(RETENTION_ROWS_RECLAIMED.labels(reason="ttl")._value.get(), before + 1)
+
+    def test_ttl_keeps_jobs_still_running(self):
+        self._add_job("running", age_hours=48, status=JobStatus.PROCESSING)
+        self._add_job("queued", age_hours=48, status=JobStatus.PENDING)
+        self._add_job("failed", age_hours=48, status=JobStatus.FAILED)
+
+        result = self._sweep(ttl_seconds=24 * 3600, max_total_bytes=0)
+
+        self.assertEqual(result.rows_deleted, 1)
+        session = self.Session()
+        self.assertIsNotNone(session.get(AnalysisJob, "running"))
+        self.assertIsNotNone(session.get(AnalysisJob, "queued"))
+        self.assertIsNone(session.get(AnalysisJob, "failed"))
+        session.close()
+
+    def test_budget_evicts_least_recently_accessed(self):
+        self._add_job("a", age_hours=5, size=400, accessed_hours_ago=4)
+        self._add_job("b", age_hours=5, size=400, accessed_hours_ago=0)
+        self._add_job("c", age_hours=3, size=400)  # never read: falls back to created_at
+
+        result = self._sweep(ttl_seconds=30 * 24 * 3600, max_total_bytes=1000)
+
+        self.assertEqual(result.payloads_evicted, 1)
+        self.assertEqual(result.stored_bytes, 800)
+        session = self.Session()
+        evicted = session.get(AnalysisJob, "a")
+        self.assertEqual(evicted.status, JobStatus.EXPIRED)
+        self.assertIsNone(evicted.result_json)
+        self.assertEqual(evicted.result_bytes, 0)
+        self.assertEqual(session.get(AnalysisJob, "b").status, JobStatus.COMPLETED)
+        self.assertEqual(session.get(AnalysisJob, "c").status, JobStatus.COMPLETED)
+        session.close()
+
+    def test_budget_eviction_runs_in_bounded_batches(self):
+        for i in range(7):
+            self._add_job(f"job_{i}", age_hours=10, size=100, accessed_hours_ago=9 - i)
+
+        with patch("app.services.retention.EVICTION_BATCH_ROWS", 2):
+            result = self._sweep(ttl_seconds=30 * 24 * 3600, max_total_bytes=400)
+
+        # Down to 90% of the budget: the four least recently accessed go, two per batch
+        self.assertEqual(result.payloads_evicted, 4)
+        self.assertEqual(result.stored_bytes, 300)
+        session = self.Session()
+        statuses = [session.get(AnalysisJob, f"job_{i}").status for i in range(7)]
+        session.close()
+        self.assertEqual(statuses, [JobStatus.EXPIRED] * 4 + [JobStatus.COMPLETED] * 3)
+
+    def test_new_jobs_record_access_at_creation(self):
+        session = self.Session()
+        session.add(AnalysisJob(id="new", status=JobStatus.PENDING))
+        session.commit()
+        self.assertIsNotNone(session.get(AnalysisJob, "new").last_accessed_at)
+        session.close()
+
+    def test_only_the_lock_holder_sweeps(self):
+        lock_path = os.path.join(self.tmpdir.name, "retention.lock")
+        sweepers = [RetentionSweeper(interval_seconds=0.01, lock_path=lock_path) for _ in range(2)]
+        swept = []
+        for n, sweeper in enumerate(sweepers):
+            async def sweep_once(n=n):
+                swept.append(n)
+            sweeper.sweep_once = sweep_once
+
+        async def scenario():
+            for sweeper in sweepers:
+                sweeper.start()
+            await asyncio.sleep(0.05)
+            await sweepers[0].stop()  # the holder exits; the other takes over
+            swept.clear()
+            await asyncio.sleep(0.05)
+            await sweepers[1].stop()
+
+        asyncio.run(scenario())
+        self.assertTrue(swept)
+        self.assertEqual(set(swept), {1})
+        self.assertFalse(any(sweeper.lock.held for sweeper in sweepers))
+
+
+if __name__ == "__main__":
+    unittest.main()
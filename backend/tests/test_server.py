@@ -0,0 +1,49 @@
+import os
+import signal
+import time
+import unittest
+
+from app.server import PreforkSupervisor
+
+
+def _sleep_forever():
+    while True:
+        time.sleep(1)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "prefork needs os.fork")
+class TestPreforkSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = PreforkSupervisor(_sleep_forever, workers=2)
+
+    def tearDown(self):
+        if self.supervisor.children:
+            self.supervisor.stop(signal.SIGKILL, timeout=1)
+
+    def test_start_and_stop_reaps_all_workers(self):
+        self.supervisor.start()
+        pids = list(self.supervisor.children)
+        self.assertEqual(len(pids), 2)
+
+        self.supervisor.stop(timeout=5)
+
+        self.assertEqual(self.supervisor.children, {})
+        for pid in pids:
+            with self.assertRaises(ChildProcessError):
+                os.waitpid(pid, os.WNOHANG)
+
+    def test_dead_worker_is_replaced(self):
+        self.supervisor.start()
+        victim = next(iter(self.supervisor.children))
+        self.supervisor.children[victim] -= 60  # long-lived, so no restart backoff
+
+        os.kill(victim, signal.SIGKILL)
+        self.assertEqual(self.supervisor._reap(block=True), victim)
+        self.supervisor.start()
+
+        self.assertEqual(len(self.supervisor.children), 2)
+        self.assertNotIn(victim, self.supervisor.children)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.main import app
+from app.services.warmup import ModelWarmup
+
+
+class TestModelWarmup(unittest.TestCase):
+    def test_runs_steps_in_order_and_becomes_ready(self):
+        calls = []
+        warmup = ModelWarmup([("a", lambda: calls.append("a")), ("b", lambda: calls.append("b"))])
+        self.assertFalse(warmup.ready)  # disabled and nothing says the models are loaded
+
+        asyncio.run(warmup.run())
+
+        self.assertEqual(calls, ["a", "b"])
+        self.assertEqual(warmup.status, "ready")
+        self.assertEqual(set(warmup.seconds), {"a", "b"})
+
+    def test_failure_stops_and_is_reported(self):
+        def broken():
+            raise RuntimeError("no weights")
+
+        warmup = ModelWarmup([("detector", broken), ("ai_text", lambda: None)])
+        asyncio.run(warmup.run())
+
+        self.assertEqual(warmup.status, "failed")
+        self.assertFalse(warmup.ready)
+        self.assertIn("no weights", warmup.error)
+        self.assertNotIn("ai_text", warmup.seconds)
+
+    def test_unloaded_emotion_model_fails_warmup(self):
+        from app.services import warmup as warmup_module
+
+        service = MagicMock()
+        service.emotion_detector.available = False
+        with patch("app.api.endpoints.analysis.get_analysis_service", return_value=service):
+            warmup = ModelWarmup([("emotion_detector", warmup_module._warm_emotion_detector)])
+            asyncio.run(warmup.run())
+
+        self.assertEqual(warmup.status, "failed")
+        self.assertIn("did not load", warmup.error)
+
+
+class TestReadiness(unittest.TestCase):
+    def setUp(self):
+        # /ready queries the database; point it at a throwaway file, not ./msi_vpe.db
+        self.tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite+aiosqlite:///{os.path.join(self.tmpdir.name, 'ready.db')}"
+        engine_patch = patch("app.main.async_engine", create_async_engine(url, poolclass=NullPool))
+        engine_patch.start()
+        self.addCleanup(engine_patch.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+        self.client = TestClient(app)
+
+    def test_health_is_liveness_only(self):
+        with patch("app.main.warmup.status", "warming"):
+            self.assertEqual(self.client.get("/health").status_code, 200)
+
+    def test_warmup_disabled_is_ready_only_once_the_model_loaded(self):
+        with patch("app.main.warmup.status", "disabled"), \
+                patch("app.api.endpoints.analysis._service_instance", None):
+            before = self.client.get("/ready")
+        loaded = MagicMock()
+        loaded.emotion_detector.available = True
+        with patch("app.main.warmup.status", "disabled"), \
+                patch("app.api.endpoints.analysis._service_instance", loaded):
+            after = self.client.get("/ready")
+
+        self.assertEqual(before.status_code, 503)
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.json()["checks"]["database"], "ok")
+
+    def test_ready_after_warmup(self):
+        with patch("app.main.warmup.status", "ready"):
+            response = self.client.get("/ready")
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_ready_while_warming(self):
+        with patch("app.main.warmup.status", "warming"):
+            response = self.client.get("/ready")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["checks"]["models"]["status"], "warming")
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_importing_services_does_not_load_transformers(self):
+        import subprocess
+        code = (
+            "import sys; import app.main, app.services.emotion_detector, app.services.ai_text_service; "
+            "print('transformers' in sys.modules, 'reportlab' in sys.modules)"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.split(), ["False", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()